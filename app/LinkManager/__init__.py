@@ -4,4 +4,9 @@ from .link import (
     bulk_operations_menu, 
     import_export_menu, 
     backup_restore_menu
-)
\ No newline at end of file
+)
+from .sqlite_store import SQLiteLinkManager, is_sqlite_path, migrate_json_to_sqlite
+from .export import read_columnar
+from .bulk import BulkSummary
+from .linkcheck import LinkCheck, LinkChecker, CheckSummary
+from .enrich import PageMetadata, PageCache, MetadataFetcher, EnrichSummary
@@ -0,0 +1,313 @@
+import os  # Used (file operations, paths)
+import json  # Used (manifest encoding)
+import hashlib  # Used (content addressing)
+from collections import Counter  # Used (multiset diffs)
+from datetime import datetime, timedelta  # Used (timestamps, retention)
+from typing import List, Dict, Optional, Any, Tuple  # Used (type hints)
+
+BACKUP_PREFIX = "links_backup_"
+DELTA_SUFFIX = ".delta.json"
+KEYFRAME_INTERVAL = 16  # Maximum number of deltas between two full backups
+DEFAULT_BACKUP_INTERVAL = 20  # Journal appends between automatic backups in journaled mode
+
+
+def link_hash(link_data: Dict[str, Any]) -> str:
+    """Content address of a serialized link."""
+    encoded = json.dumps(link_data, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+
+class RetentionPolicy:
+    """
+    Decides which backups survive pruning.
+
+    Args:
+        keep_last (int): Number of most recent backups to keep.
+        keep_daily (int): Number of days for which the newest backup of the day is kept.
+        keep_weekly (int): Number of weeks for which the newest backup of the week is kept.
+    """
+
+    def __init__(self, keep_last: int = 10, keep_daily: int = 7, keep_weekly: int = 4):
+        self.keep_last = keep_last
+        self.keep_daily = keep_daily
+        self.keep_weekly = keep_weekly
+
+    def select(self, backups: List[Tuple[str, datetime]], now: datetime = None) -> set:
+        """Return the names to keep out of (name, created) pairs."""
+        now = now or datetime.now()
+        newest_first = sorted(backups, key=lambda item: item[1], reverse=True)
+        keep = {name for name, _ in newest_first[:self.keep_last]}
+
+        seen_days = set()
+        seen_weeks = set()
+        for name, created in newest_first:
+            day = created.date()
+            if (now.date() - day).days < self.keep_daily and day not in seen_days:
+                seen_days.add(day)
+                keep.add(name)
+            week = created.isocalendar()[:2]
+            if now - created < timedelta(weeks=self.keep_weekly) and week not in seen_weeks:
+                seen_weeks.add(week)
+                keep.add(name)
+        return keep
+
+
+class BackupStore:
+    """
+    Content-addressed, incremental backup store.
+
+    Each backup is a manifest in the backup directory that only records the links
+    that changed since its parent backup (by content hash, with their positions),
+    plus the bodies of links that the parent did not already contain. Every
+    KEYFRAME_INTERVAL backups a full manifest is written so restores stay cheap.
+    Plain copies written by older versions (links_backup_<timestamp>.json) are
+    still listed and restorable.
+    """
+
+    def __init__(self, backup_dir: str, retention: Optional[RetentionPolicy] = None):
+        self.backup_dir = backup_dir
+        self.retention = retention or RetentionPolicy()
+        # Cached state of the newest delta backup: (name, ordered hashes, state hash, depth)
+        self._head: Optional[Tuple[str, List[str], str, int]] = None
+
+    # ---- naming ----------------------------------------------------------------
+
+    @staticmethod
+    def _created(name: str) -> Optional[datetime]:
+        """Parse the creation time encoded in a backup file name."""
+        stamp = name[len(BACKUP_PREFIX):].split(".", 1)[0]
+        for fmt in ("%Y%m%d_%H%M%S_%f", "%Y%m%d_%H%M%S"):
+            try:
+                return datetime.strptime(stamp, fmt)
+            except ValueError:
+                continue
+        return None
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.backup_dir, name)
+
+    def list(self) -> List[str]:
+        """List backup names, most recent first."""
+        if not os.path.exists(self.backup_dir):
+            return []
+        backups = [
+            (name, created) for name in os.listdir(self.backup_dir)
+            if name.startswith(BACKUP_PREFIX) and name.endswith(".json")
+            and (created := self._created(name)) is not None
+        ]
+        return [name for name, _ in sorted(backups, key=lambda item: item[1], reverse=True)]
+
+    def _new_name(self) -> str:
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        name = f"{BACKUP_PREFIX}{stamp}{DELTA_SUFFIX}"
+        counter = 1
+        while os.path.exists(self._path(name)):
+            name = f"{BACKUP_PREFIX}{stamp}.{counter}{DELTA_SUFFIX}"
+            counter += 1
+        return name
+
+    # ---- reading ---------------------------------------------------------------
+
+    def _read(self, name: str) -> Dict[str, Any]:
+        with open(self._path(name), "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _chain(self, name: str) -> List[Tuple[str, Dict[str, Any]]]:
+        """Manifests from the nearest full backup up to name, oldest first."""
+        chain = []
+        while name:
+            manifest = self._read(name)
+            chain.append((name, manifest))
+            name = manifest.get("parent")
+        chain.reverse()
+        return chain
+
+    @staticmethod
+    def _apply(order: List[str], manifest: Dict[str, Any]) -> List[str]:
+        """Apply a delta manifest to an ordered list of link hashes."""
+        removed = Counter(manifest.get("removed", []))
+        quota = Counter(order)
+        quota.subtract(removed)
+        new_order = []
+        for link_id in order:
+            if quota[link_id] > 0:
+                quota[link_id] -= 1
+                new_order.append(link_id)
+        for position, link_id in manifest.get("added", []):
+            new_order.insert(position, link_id)
+        return new_order
+
+    def _materialize(self, name: str) -> Tuple[List[str], Dict[str, Dict[str, Any]], Dict[str, Any]]:
+        """Rebuild (ordered hashes, bodies, last manifest) for a delta backup."""
+        order: List[str] = []
+        bodies: Dict[str, Dict[str, Any]] = {}
+        manifest: Dict[str, Any] = {}
+        for _, manifest in self._chain(name):
+            order = self._apply(order if manifest.get("parent") else [], manifest)
+            bodies.update(manifest.get("objects", {}))
+        return order, bodies, manifest
+
+    def load(self, name: str) -> Dict[str, Any]:
+        """Return the database content ({"links", "categories", "tags"}) stored in a backup."""
+        if not name.endswith(DELTA_SUFFIX):
+            # Plain copy written by older versions
+            return self._read(name)
+
+        order, bodies, manifest = self._materialize(name)
+        return {
+            "links": [bodies[link_id] for link_id in order],
+            "categories": manifest.get("categories", []),
+            "tags": manifest.get("tags", []),
+        }
+
+    def _load_head(self) -> Optional[Tuple[str, List[str], str, int]]:
+        """Return the cached head state, reading it from disk if needed."""
+        deltas = [name for name in self.list() if name.endswith(DELTA_SUFFIX)]
+        if not deltas:
+            self._head = None
+            return None
+        if self._head is None or self._head[0] != deltas[0]:
+            chain = self._chain(deltas[0])
+            order: List[str] = []
+            for _, manifest in chain:
+                order = self._apply(order if manifest.get("parent") else [], manifest)
+            self._head = (deltas[0], order, chain[-1][1].get("state", ""), len(chain) - 1)
+        return self._head
+
+    # ---- writing ---------------------------------------------------------------
+
+    @staticmethod
+    def _state_hash(order: List[str], categories: List[str], tags: List[str]) -> str:
+        digest = hashlib.blake2b(digest_size=16)
+        for link_id in order:
+            digest.update(link_id.encode("ascii"))
+        digest.update(json.dumps([sorted(categories), sorted(tags)]).encode("utf-8"))
+        return digest.hexdigest()
+
+    @classmethod
+    def _diff(cls, old: List[str], new: List[str]) -> Optional[Tuple[List[str], List[List[Any]]]]:
+        """
+        Compute (removed, added) turning old into new, or None if the surviving links
+        were reordered and a full backup is needed instead.
+        """
+        remaining = Counter(new)
+        kept, removed = [], []
+        for link_id in old:
+            if remaining[link_id] > 0:
+                remaining[link_id] -= 1
+                kept.append(link_id)
+            else:
+                removed.append(link_id)
+
+        added = []
+        k = 0
+        for position, link_id in enumerate(new):
+            if k < len(kept) and kept[k] == link_id:
+                k += 1
+            else:
+                added.append([position, link_id])
+
+        if k != len(kept):
+            return None
+        return removed, added
+
+    def _write(self, name: str, manifest: Dict[str, Any]) -> None:
+        temp_file = f"{self._path(name)}.tmp"
+        with open(temp_file, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, separators=(",", ":"))
+        os.replace(temp_file, self._path(name))
+
+    def _build_manifest(self, parent: Optional[str], parent_order: List[str], depth: int,
+                        order: List[str], bodies: Dict[str, Dict[str, Any]],
+                        categories: List[str], tags: List[str], state: str) -> Tuple[Dict[str, Any], int]:
+        """Build a delta manifest against parent, falling back to a full one."""
+        diff = self._diff(parent_order, order) if parent else None
+        if diff is None or depth + 1 >= KEYFRAME_INTERVAL or len(diff[1]) > len(order) // 2 + 1:
+            parent, parent_order, depth = None, [], -1
+            removed, added = [], [[position, link_id] for position, link_id in enumerate(order)]
+        else:
+            removed, added = diff
+
+        known = set(parent_order)
+        manifest = {
+            "parent": parent,
+            "created": datetime.now().isoformat(),
+            "count": len(order),
+            "state": state,
+            "removed": removed,
+            "added": added,
+            "objects": {link_id: bodies[link_id] for _, link_id in added if link_id not in known},
+            "categories": categories,
+            "tags": tags,
+        }
+        return manifest, depth + 1
+
+    def create(self, data: Dict[str, Any]) -> Optional[str]:
+        """
+        Back up database content ({"links", "categories", "tags"}).
+        Returns the new backup name, or None if nothing changed since the last backup.
+        """
+        os.makedirs(self.backup_dir, exist_ok=True)
+        bodies = {}
+        order = []
+        for link_data in data.get("links", []):
+            link_id = link_hash(link_data)
+            bodies[link_id] = link_data
+            order.append(link_id)
+        categories = list(data.get("categories", []))
+        tags = list(data.get("tags", []))
+        state = self._state_hash(order, categories, tags)
+
+        head = self._load_head()
+        if head and head[2] == state:
+            return None
+
+        parent, parent_order, depth = (head[0], head[1], head[3]) if head else (None, [], -1)
+        manifest, depth = self._build_manifest(parent, parent_order, depth, order, bodies,
+                                               categories, tags, state)
+        name = self._new_name()
+        self._write(name, manifest)
+        self._head = (name, order, state, depth)
+        return name
+
+    def prune(self) -> List[str]:
+        """
+        Delete backups not selected by the retention policy.
+        Surviving deltas whose parent is deleted are rebased onto the previous survivor.
+        """
+        names = self.list()
+        keep = self.retention.select([(name, self._created(name)) for name in names])
+        doomed = [name for name in names if name not in keep]
+        if not doomed:
+            return []
+
+        # Replay the delta history oldest first, rewriting survivors as needed
+        deltas = [name for name in reversed(names) if name.endswith(DELTA_SUFFIX)]
+        order: List[str] = []
+        bodies: Dict[str, Dict[str, Any]] = {}
+        survivor: Optional[Tuple[str, List[str], int]] = None
+        for name in deltas:
+            manifest = self._read(name)
+            order = self._apply(order if manifest.get("parent") else [], manifest)
+            bodies.update(manifest.get("objects", {}))
+            if name not in keep:
+                continue
+
+            parent_name = survivor[0] if survivor else None
+            if manifest.get("parent") != parent_name:
+                parent_order, depth = (survivor[1], survivor[2]) if survivor else ([], -1)
+                manifest, depth = self._build_manifest(
+                    parent_name, parent_order, depth, order, bodies,
+                    manifest.get("categories", []), manifest.get("tags", []), manifest.get("state", ""))
+                self._write(name, manifest)
+            else:
+                depth = survivor[2] + 1 if survivor else 0
+            survivor = (name, list(order), depth)
+            # Bodies no longer referenced are not needed for later rebases
+            live = set(order)
+            bodies = {link_id: body for link_id, body in bodies.items() if link_id in live}
+
+        for name in doomed:
+            os.remove(self._path(name))
+        self._head = None
+        return doomed
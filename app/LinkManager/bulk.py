@@ -0,0 +1,103 @@
+import time  # Used (elapsed time)
+from collections import Counter  # Used (per-name change counts)
+from typing import List, Dict, Tuple, Iterable, Optional  # Used (type hints)
+from .vocabulary import VOCABULARY  # Used (interned categories and tags)
+
+
+def clean_names(names: Iterable[str]) -> List[str]:
+    """Stripped, non-empty names without duplicates, in order."""
+    return list(dict.fromkeys(name.strip() for name in names if name and name.strip()))
+
+
+class BulkChange:
+    """
+    Category and tag changes applied by LinkManager.bulk_update, as vocabulary ids.
+
+    The names are interned once, so applying the change to a link is a few tuple and set
+    operations on ids instead of string comparisons. A name that is both added and removed
+    is added.
+    """
+
+    def __init__(self, add_categories: Iterable[str] = (), remove_categories: Iterable[str] = (),
+                 add_tags: Iterable[str] = (), remove_tags: Iterable[str] = ()):
+        self.add_categories = clean_names(add_categories)
+        self.add_tags = clean_names(add_tags)
+        self.remove_categories = [name for name in clean_names(remove_categories) if name not in self.add_categories]
+        self.remove_tags = [name for name in clean_names(remove_tags) if name not in self.add_tags]
+        self._add_category_ids = VOCABULARY.intern_all(self.add_categories)
+        self._add_tag_ids = VOCABULARY.intern_all(self.add_tags)
+        # Interned rather than looked up: lazily loaded links intern their names only when built
+        self._remove_category_ids = frozenset(VOCABULARY.intern_all(self.remove_categories))
+        self._remove_tag_ids = frozenset(VOCABULARY.intern_all(self.remove_tags))
+
+    def __bool__(self) -> bool:
+        return bool(self.add_categories or self.add_tags or self.remove_categories or self.remove_tags)
+
+    @staticmethod
+    def _apply(ids: Tuple[int, ...], add_ids: Tuple[int, ...], remove_ids: frozenset,
+               added: Counter, removed: Counter) -> Tuple[int, ...]:
+        if remove_ids and not remove_ids.isdisjoint(ids):
+            gone = remove_ids.intersection(ids)
+            removed.update(gone)
+            ids = tuple(name_id for name_id in ids if name_id not in gone)
+        if add_ids:
+            missing = tuple(name_id for name_id in add_ids if name_id not in ids)
+            if missing:
+                added.update(missing)
+                ids += missing
+        return ids
+
+    def apply(self, category_ids: Tuple[int, ...], tag_ids: Tuple[int, ...],
+              counts: "BulkCounts") -> Tuple[Tuple[int, ...], Tuple[int, ...]]:
+        """New (category ids, tag ids) of a link; the ids added and removed are counted in counts."""
+        return (self._apply(category_ids, self._add_category_ids, self._remove_category_ids,
+                            counts.categories_added, counts.categories_removed),
+                self._apply(tag_ids, self._add_tag_ids, self._remove_tag_ids,
+                            counts.tags_added, counts.tags_removed))
+
+
+class BulkCounts:
+    """Number of links each category and tag id was added to or removed from."""
+
+    def __init__(self):
+        self.categories_added: Counter = Counter()
+        self.categories_removed: Counter = Counter()
+        self.tags_added: Counter = Counter()
+        self.tags_removed: Counter = Counter()
+
+
+class BulkSummary:
+    """Outcome of a bulk update, rename or merge."""
+
+    def __init__(self):
+        self.matched = 0  # Links selected
+        self.changed = 0  # Links that were actually modified
+        # Name -> number of links it was added to or removed from
+        self.categories_added: Dict[str, int] = {}
+        self.categories_removed: Dict[str, int] = {}
+        self.tags_added: Dict[str, int] = {}
+        self.tags_removed: Dict[str, int] = {}
+        self.started = time.perf_counter()
+        self.finished: Optional[float] = None
+
+    @property
+    def elapsed(self) -> float:
+        return (self.finished or time.perf_counter()) - self.started
+
+    def finish(self, counts: Optional[BulkCounts] = None) -> "BulkSummary":
+        """Record the per-name counts (by vocabulary id) and stop the clock."""
+        if counts is not None:
+            for attribute in ("categories_added", "categories_removed", "tags_added", "tags_removed"):
+                setattr(self, attribute, {VOCABULARY.name(name_id): count
+                                          for name_id, count in getattr(counts, attribute).items()})
+        self.finished = time.perf_counter()
+        return self
+
+    def __str__(self) -> str:
+        parts = [f"{self.changed} of {self.matched} matching links changed"]
+        for label, counts in (("categories added", self.categories_added),
+                              ("categories removed", self.categories_removed),
+                              ("tags added", self.tags_added), ("tags removed", self.tags_removed)):
+            if counts:
+                parts.append(f"{label}: " + ", ".join(f"{name} ({count})" for name, count in counts.items()))
+        return "; ".join(parts) + f" ({self.elapsed:.2f}s)"
@@ -0,0 +1,155 @@
+from collections import OrderedDict  # Used (LRU order)
+from typing import List, Dict, Set, Tuple, Optional, Any  # Used (type hints)
+
+DEFAULT_CACHE_SIZE = 128
+# Batches of mutations larger than this clear the cache instead of updating every entry
+MAX_INCREMENTAL_BATCH = 1000
+
+# A term of a cached query: (field position, lowercased term, names it was resolved to
+# if it matched no category/tag and similar names were used instead, else None)
+Term = Tuple[int, str, Optional[Tuple[str, ...]]]
+
+
+class _Entry:
+    """Cached result of one query: the keys of the matching links and how to re-test a link."""
+
+    __slots__ = ("keys", "groups", "exact_counts", "fuzzy_fields")
+
+    def __init__(self, keys: Set[int], groups: List[List[Term]], exact_counts: Dict[Tuple[int, str], int]):
+        self.keys = keys
+        self.groups = groups  # A link matches if every group has a matching term
+        self.exact_counts = exact_counts  # Links containing each category/tag term
+        # Fields with terms that were resolved to similar names
+        self.fuzzy_fields = {field_idx for group in groups for field_idx, _, names in group if names is not None}
+
+    @staticmethod
+    def _term_matches(term: Term, values: Tuple[Tuple[str, ...], ...]) -> bool:
+        field_idx, text, names = term
+        field_values = values[field_idx]
+        if names is not None:
+            return any(value in names for value in field_values)
+        if not text:
+            return bool(field_values)
+        return any(text in value for value in field_values)
+
+    def matches(self, values: Optional[Tuple[Tuple[str, ...], ...]]) -> bool:
+        return values is not None and all(
+            any(self._term_matches(term, values) for term in group) for group in self.groups
+        )
+
+    def apply(self, key: int, old: Optional[Tuple[Tuple[str, ...], ...]],
+              new: Optional[Tuple[Tuple[str, ...], ...]]) -> bool:
+        """
+        Update the entry for one link whose (lowercased) field values changed from old to
+        new (None: not in the collection). Returns False if the entry can no longer be
+        updated incrementally and has to be dropped.
+        """
+        for field_idx in self.fuzzy_fields:
+            # Similar names depend on the whole vocabulary of the field
+            if (old[field_idx] if old else ()) != (new[field_idx] if new else ()):
+                return False
+        for count_key, count in self.exact_counts.items():
+            term = (*count_key, None)
+            count += (self._term_matches(term, new) if new else 0) - (self._term_matches(term, old) if old else 0)
+            if count <= 0:
+                return False  # The term would now fall back to similar names
+            self.exact_counts[count_key] = count
+
+        if self.matches(new):
+            self.keys.add(key)
+        else:
+            self.keys.discard(key)
+        return True
+
+
+class QueryCache:
+    """
+    Bounded LRU cache of search results, from normalized search parameters to the search
+    index keys of the matching links.
+
+    Entries are kept up to date by the mutation hooks of LinkManager: update re-tests the
+    changed link against every cached query, so a mutation costs O(cached queries) and
+    results never have to be recomputed. Entries whose category or tag terms depend on
+    typo fallback are dropped when that field changes, and a batch of more than
+    MAX_INCREMENTAL_BATCH mutations clears the cache.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Any, _Entry]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def match_key(search_params: Dict[str, str], search_mode: str) -> Any:
+        """Normalized cache key of a query (see LinkManager._match_keys)."""
+        return ("match", search_mode, tuple(sorted((field, term.lower()) for field, term in search_params.items())))
+
+    @staticmethod
+    def advanced_key(term_lists: List[List[str]]) -> Any:
+        """Normalized cache key of an advanced search (see LinkManager._advanced_keys)."""
+        return ("advanced", tuple(tuple(sorted({term.lower() for term in terms})) for terms in term_lists))
+
+    def get(self, cache_key: Any) -> Optional[Set[int]]:
+        """Return the cached keys of a query, or None."""
+        entry = self._entries.get(cache_key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(cache_key)
+        self.hits += 1
+        return entry.keys
+
+    def groups(self, cache_key: Any) -> List[List[Term]]:
+        """The terms of a cached query as passed to put (empty if it is not cached)."""
+        entry = self._entries.get(cache_key)
+        return [] if entry is None else entry.groups
+
+    def put(self, cache_key: Any, keys: Set[int], groups: List[List[Term]],
+            exact_counts: Dict[Tuple[int, str], int]) -> None:
+        """
+        Cache the result of a query. groups lists the query's terms as OR-groups that all
+        have to match; exact_counts holds, for its category/tag terms, the number of links
+        containing them.
+        """
+        if self.maxsize <= 0:
+            return
+        self._entries[cache_key] = _Entry(set(keys), groups, dict(exact_counts))
+        self._entries.move_to_end(cache_key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def update(self, changes: List[Tuple[int, Optional[tuple], Optional[tuple]]]) -> None:
+        """Apply (key, old values, new values) changes of links to every cached result."""
+        if not self._entries or not changes:
+            return
+        if len(changes) > MAX_INCREMENTAL_BATCH:
+            self.clear()
+            return
+        for cache_key, entry in list(self._entries.items()):
+            for key, old, new in changes:
+                if not entry.apply(key, old, new):
+                    del self._entries[cache_key]
+                    self.invalidations += 1
+                    break
+
+    def clear(self) -> None:
+        """Drop every entry (e.g. when the search index is rebuilt)."""
+        self.invalidations += len(self._entries)
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and size of the cache."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "invalidations": self.invalidations,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+        }
@@ -0,0 +1,150 @@
+import csv  # Used (CSV parsing)
+import time  # Used (throughput measurement)
+from collections import deque  # Used (bounded in-flight batches)
+from concurrent.futures import ProcessPoolExecutor  # Used (parallel parsing)
+from datetime import datetime  # Used (batch timestamps)
+from itertools import islice  # Used (chunking)
+from typing import List, Dict, Optional, Any, Callable, Iterator, Tuple  # Used (type hints)
+
+DEFAULT_BATCH_SIZE = 10000
+MAX_REPORTED_ERRORS = 10
+
+OPTIONAL_FIELDS = ("description", "categories", "tags")
+
+
+def _split(value: str) -> List[str]:
+    return [item.strip() for item in value.split(",")] if value else []
+
+
+def parse_rows(rows: List[List[str]], columns: Dict[str, int]) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """
+    Validate a chunk of CSV rows and turn them into link records.
+    Returns (records, error messages); rows without a URL (including blank lines and rows
+    too short to reach the url column) are skipped silently.
+    Module-level so it can run in a worker process.
+    """
+    now = datetime.now().isoformat()
+    url_col = columns["url"]
+    optional = [(field, columns[field]) for field in OPTIONAL_FIELDS if field in columns]
+    records, errors = [], []
+
+    for row in rows:
+        if len(row) <= url_col:
+            continue
+        try:
+            url = row[url_col].strip()
+            if not url:
+                continue
+
+            values = {field: (row[col] if col < len(row) else "") for field, col in optional}
+            records.append({
+                "url": url,
+                "description": values.get("description", "").strip(),
+                "categories": _split(values.get("categories", "")),
+                "tags": _split(values.get("tags", "")),
+                "created_at": now,
+                "last_updated": now,
+            })
+        except Exception as e:
+            errors.append(f"Error processing row: {e}")
+
+    return records, errors
+
+
+class ImportStats:
+    """Running totals of a CSV import."""
+
+    def __init__(self):
+        self.rows = 0
+        self.added = 0
+        self.duplicates = 0
+        self.errors = 0
+        self.skipped = 0  # Entries that are not links (e.g. bookmarklets)
+        self.files = 0
+        self.batches = 0
+        self.started = time.perf_counter()
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    @property
+    def throughput(self) -> float:
+        """Rows processed per second."""
+        return self.rows / self.elapsed if self.elapsed > 0 else 0.0
+
+    def __str__(self) -> str:
+        return (f"{self.rows} rows, {self.added} links added, {self.duplicates} duplicates, {self.errors} errors "
+                f"({self.throughput:.0f} rows/s)")
+
+
+class CSVImportPipeline:
+    """
+    Streaming CSV import that parses rows in batches and merges each batch into a
+    LinkManager at once.
+
+    Args:
+        manager (LinkManager): Collection the links are added to.
+        batch_size (int, optional): Rows per batch. Defaults to 10000.
+        workers (int, optional): Worker processes used for parsing; 0 parses in-process. Defaults to 0.
+        progress (callable, optional): Called with the ImportStats after every batch.
+    """
+
+    def __init__(self, manager: Any, batch_size: int = DEFAULT_BATCH_SIZE, workers: int = 0,
+                 progress: Optional[Callable[[ImportStats], None]] = None):
+        self.manager = manager
+        self.batch_size = max(1, batch_size)
+        self.workers = workers
+        self.progress = progress
+
+    def _chunks(self, reader: Iterator[List[str]]) -> Iterator[List[List[str]]]:
+        while chunk := list(islice(reader, self.batch_size)):
+            yield chunk
+
+    def _parsed(self, reader: Iterator[List[str]], columns: Dict[str, int]) -> Iterator[Tuple[int, Tuple]]:
+        """Yield (row count, parse result) per batch, in file order."""
+        if self.workers <= 1:
+            for chunk in self._chunks(reader):
+                yield len(chunk), parse_rows(chunk, columns)
+            return
+
+        # Keep a bounded number of batches in flight so the file is never read ahead entirely
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            pending = deque()
+            for chunk in self._chunks(reader):
+                pending.append((len(chunk), executor.submit(parse_rows, chunk, columns)))
+                if len(pending) >= self.workers * 2:
+                    count, future = pending.popleft()
+                    yield count, future.result()
+            while pending:
+                count, future = pending.popleft()
+                yield count, future.result()
+
+    def run(self, file_path: str) -> ImportStats:
+        """
+        Import every row of a CSV file.
+        Raises ValueError if the header is missing or has no 'url' column.
+        """
+        stats = ImportStats()
+        with open(file_path, 'r', newline='', encoding='utf-8') as csvfile:
+            reader = csv.reader(csvfile)
+            header = next(reader, None)
+            if not header:
+                raise ValueError("CSV file appears to be empty or invalid")
+
+            columns = {name.strip(): position for position, name in enumerate(header)}
+            if "url" not in columns:
+                raise ValueError("CSV file missing required field 'url'")
+
+            for count, (records, errors) in self._parsed(reader, columns):
+                stats.rows += count
+                stats.batches += 1
+                added, duplicates = self.manager._add_records(records)
+                stats.added += added
+                stats.duplicates += duplicates
+                for message in errors[:max(0, MAX_REPORTED_ERRORS - stats.errors)]:
+                    print(message)
+                stats.errors += len(errors)
+                if self.progress:
+                    self.progress(stats)
+        return stats
@@ -0,0 +1,285 @@
+import io  # Used (capturing manager output)
+import os  # Used (socket file handling)
+import json  # Used (request encoding)
+import socket  # Used (client connections)
+import signal  # Used (shutdown on SIGINT/SIGTERM)
+import asyncio  # Used (request serving and group commit)
+import contextlib  # Used (output redirection)
+from typing import List, Dict, Optional, Any, Callable  # Used (type hints)
+from .link import LinkManager  # Used (served collection)
+from .index import DEFAULT_TOP_K  # Used (ranked query default)
+
+DEFAULT_COMMIT_DELAY = 0.05  # Seconds a write waits for others to share its commit
+MAX_COMMIT_BATCH = 1000  # Waiting writes that trigger a commit right away
+DEFAULT_TIMEOUT = 60.0  # Seconds the client waits for a response
+REQUEST_LIMIT = 16 * 1024 * 1024  # Longest accepted request line
+
+WRITE_OPS = {"add", "edit", "remove"}
+
+
+def socket_path(db_path: str) -> str:
+    """Path of the socket a daemon serving db_path listens on."""
+    return f"{db_path}.sock"
+
+
+class LinkDaemon:
+    """
+    Keeps a LinkManager loaded, with its search index and URL index built, and serves
+    requests on a Unix domain socket so that command line invocations do not have to
+    load the database themselves.
+
+    Requests and responses are single JSON lines:
+        {"op": "add", "url": "https://example.com", "tags": ["python"]}
+        {"ok": true, "result": {...}, "output": "Link added successfully!"}
+    Supported operations are ping, add, query, edit, remove, export, backup, stats and
+    shutdown. "output" holds what the manager printed while handling the request.
+
+    Requests are handled one at a time on the event loop, so the manager is never used
+    concurrently. Writes are applied in memory right away, but only answered once they are
+    on disk: they are saved together by one save_to_db (group commit) after waiting up to
+    commit_delay seconds for more writes, or as soon as max_batch writes are waiting.
+    Changes saved by other processes are picked up before each request (see
+    LinkManager.refresh).
+    """
+
+    def __init__(self, manager: LinkManager, path: str, commit_delay: float = DEFAULT_COMMIT_DELAY,
+                 max_batch: int = MAX_COMMIT_BATCH):
+        self.manager = manager
+        self.path = path
+        self.commit_delay = commit_delay
+        self.max_batch = max_batch
+        self.requests = 0
+        self.commits = 0
+        self._waiters: List[asyncio.Future] = []  # Writes waiting for the next commit
+        self._clients: Dict[asyncio.StreamWriter, asyncio.Task] = {}  # Open connections
+        self._wake: Optional[asyncio.Event] = None
+        self._full: Optional[asyncio.Event] = None
+        self._stop: Optional[asyncio.Event] = None
+        self._handlers: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+            "ping": lambda request: "pong",
+            "add": self._add,
+            "query": self._query,
+            "edit": self._edit,
+            "remove": self._remove,
+            "export": self._export,
+            "backup": lambda request: self.manager._create_backup(),
+            "stats": self._stats,
+            "shutdown": self._shutdown,
+        }
+
+    # ---- request handlers ----------------------------------------------------------
+
+    def _add(self, request: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        link = self.manager.add_link(interactive=False, url=request.get("url"),
+                                     description=request.get("description", ""),
+                                     categories=request.get("categories"), tags=request.get("tags"))
+        return None if link is None else link.to_dict()
+
+    def _query(self, request: Dict[str, Any]) -> List[Any]:
+        if request.get("rank"):
+            results = self.manager.ranked_search(interactive=False, query=request.get("query"),
+                                                 k=request.get("k", DEFAULT_TOP_K))
+            return [[score, link.to_dict()] for score, link in results]
+        search_params = {field: term for field, term in (request.get("params") or {}).items() if term}
+        if not search_params:
+            return []
+        return [link.to_dict() for link in self.manager._match_links(search_params, request.get("mode", "AND"))]
+
+    def _edit(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        manager, link_id = self.manager, request.get("id")
+        if manager.get_link(link_id) is None:
+            raise KeyError(f"No link with id {link_id}")
+        if "url" in request:
+            manager.update_link_url_by_id(link_id, request["url"])
+        if "description" in request:
+            manager.update_link_description_by_id(link_id, request["description"])
+        for category in request.get("add_categories", []):
+            manager.add_link_category_by_id(link_id, category)
+        for category in request.get("remove_categories", []):
+            manager.remove_link_category_by_id(link_id, category)
+        for tag in request.get("add_tags", []):
+            manager.add_link_tag_by_id(link_id, tag)
+        for tag in request.get("remove_tags", []):
+            manager.remove_link_tag_by_id(link_id, tag)
+        return manager.get_link(link_id).to_dict()
+
+    def _remove(self, request: Dict[str, Any]) -> bool:
+        return self.manager.remove_link_by_id(request.get("id"))
+
+    def _export(self, request: Dict[str, Any]) -> str:
+        # The path is resolved by the client; relative paths would follow the daemon's directory
+        return self.manager.export_links(request["path"], request.get("format"),
+                                         search_params=request.get("params"),
+                                         search_mode=request.get("mode", "AND"))
+
+    def _stats(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "links": len(self.manager.links),
+            "requests": self.requests,
+            "commits": self.commits,
+            "cache": self.manager.query_cache.stats(),
+        }
+
+    def _shutdown(self, request: Dict[str, Any]) -> str:
+        self._stop.set()
+        return "Daemon stopping."
+
+    # ---- serving -------------------------------------------------------------------
+
+    async def _dispatch(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Handle one request; writes are answered once they are committed."""
+        op = request.get("op")
+        handler = self._handlers.get(op)
+        if handler is None:
+            return {"ok": False, "error": f"Unknown operation: {op}"}
+
+        self.requests += 1
+        output = io.StringIO()
+        try:
+            with contextlib.redirect_stdout(output):
+                self.manager.refresh()
+                result = handler(request)
+        except Exception as e:
+            return {"ok": False, "error": str(e), "output": output.getvalue().strip()}
+
+        if op in WRITE_OPS and not await self._commit():
+            return {"ok": False, "error": "Could not save the database.", "output": output.getvalue().strip()}
+        response = {"ok": True, "result": result, "output": output.getvalue().strip()}
+        if op == "query" and not request.get("rank"):
+            # Category/tag typos the search resolved, for the client to report
+            response["substitutions"] = self.manager.typo_substitutions
+        return response
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve the requests of one connection, one per line, until it is closed."""
+        self._clients[writer] = asyncio.current_task()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    response = await self._dispatch(request) if isinstance(request, dict) else \
+                        {"ok": False, "error": "Requests must be JSON objects."}
+                except ValueError as e:
+                    response = {"ok": False, "error": f"Invalid request: {e}"}
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.LimitOverrunError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._clients.pop(writer, None)
+            writer.close()
+
+    async def _commit(self) -> bool:
+        """Wait until the writes made so far are saved; returns False if saving failed."""
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._wake.set()
+        if len(self._waiters) >= self.max_batch:
+            self._full.set()
+        return await waiter
+
+    async def _committer(self) -> None:
+        """Save the waiting writes in groups."""
+        while True:
+            await self._wake.wait()
+            if len(self._waiters) < self.max_batch:
+                # Let the writes arriving meanwhile share this commit
+                try:
+                    await asyncio.wait_for(self._full.wait(), self.commit_delay)
+                except asyncio.TimeoutError:
+                    pass
+            self._wake.clear()
+            self._full.clear()
+            self._flush()
+
+    def _flush(self) -> None:
+        """Save the collection and answer every waiting write."""
+        waiters, self._waiters = self._waiters, []
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            self.manager.save_to_db()
+        saved = not self.manager.has_unsaved_changes
+        if not saved:
+            print(output.getvalue().strip())
+        self.commits += 1
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(saved)
+
+    def _claim_socket(self) -> None:
+        """Remove a socket left behind by a daemon that died; refuse to start next to a live one."""
+        if not os.path.exists(self.path):
+            return
+        if DaemonClient(self.path, timeout=5).request("ping") is not None:
+            raise RuntimeError(f"A daemon is already running on {self.path}")
+        os.remove(self.path)
+
+    async def serve(self) -> None:
+        """Serve requests until shutdown is requested or SIGINT/SIGTERM is received."""
+        self._wake, self._full, self._stop = asyncio.Event(), asyncio.Event(), asyncio.Event()
+        self._claim_socket()
+        server = await asyncio.start_unix_server(self._handle, path=self.path, limit=REQUEST_LIMIT)
+        os.chmod(self.path, 0o600)
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, self._stop.set)
+        committer = asyncio.create_task(self._committer())
+        print(f"Serving {len(self.manager.links)} links on {self.path}")
+        try:
+            await self._stop.wait()
+        finally:
+            server.close()
+            committer.cancel()
+            self._flush()
+            # Closed connections end their handlers, which are waited for
+            handlers = list(self._clients.values())
+            for writer in list(self._clients):
+                writer.close()
+            await asyncio.gather(*handlers, return_exceptions=True)
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(self.path)
+            print("Daemon stopped.")
+
+
+def serve(manager: LinkManager, path: str, commit_delay: float = DEFAULT_COMMIT_DELAY) -> None:
+    """Load the collection, build its indexes and serve it on path until stopped."""
+    daemon = LinkDaemon(manager, path, commit_delay)
+    daemon._claim_socket()  # Before spending time on loading
+    manager.load_from_db()
+    # Build the indexes now rather than on the first request
+    manager._get_index()
+    manager._get_urls()
+    asyncio.run(daemon.serve())
+
+
+class DaemonClient:
+    """Blocking client for a LinkDaemon, as used by the command line."""
+
+    def __init__(self, path: str, timeout: float = DEFAULT_TIMEOUT):
+        self.path = path
+        self.timeout = timeout
+
+    def request(self, op: str, **fields: Any) -> Optional[Dict[str, Any]]:
+        """
+        Send one request and return the response, or None if no daemon is running or it does
+        not answer within timeout (a stale socket or a hung daemon), so the caller can handle
+        the request itself.
+        """
+        if not hasattr(socket, "AF_UNIX") or not os.path.exists(self.path):
+            return None
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.settimeout(self.timeout)
+                sock.connect(self.path)
+                sock.sendall(json.dumps({"op": op, **fields}).encode() + b"\n")
+                with sock.makefile("rb") as f:
+                    line = f.readline()
+        except OSError:  # Including socket.timeout
+            return None
+        try:
+            return json.loads(line) if line else None
+        except ValueError:
+            return None
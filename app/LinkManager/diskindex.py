@@ -0,0 +1,617 @@
+import json  # Used (manifest and record encoding)
+import mmap  # Used (zero-copy index reads)
+import os  # Used (file operations, fingerprints)
+import struct  # Used (binary layout)
+import sys  # Used (byte order)
+from array import array  # Used (binary arrays)
+from itertools import accumulate  # Used (offset tables)
+from typing import List, Dict, Set, Optional, Any, Iterable, Tuple  # Used (type hints)
+from collections import Counter  # Used (term frequencies)
+from .index import (  # Used (same search and ranking semantics as SearchIndex)
+    FIELDS, NAME_FIELDS, NGRAM_SIZE, FIELD_WEIGHTS, DEFAULT_TOP_K, parse_query, value_tokens, phrase_count,
+    add_clause_scores, top_k
+)
+from .fuzzy import VocabularyIndex  # Used (typo-tolerant category/tag search)
+
+MAGIC = b"LMIDX\x00\x00\x01"
+TRAILER_MAGIC = b"LMIDXEND"
+TRAILER = struct.Struct("<QQ8s")  # manifest offset, manifest length, magic
+FORMAT_VERSION = 3
+MAX_FREQUENCY = 255  # Term frequencies are stored in one byte
+
+# An index is rewritten from scratch after this many incremental updates,
+# or once superseded documents outnumber half of the live ones
+MAX_APPENDS = 32
+MAX_DEAD_RATIO = 0.5
+
+_U64 = struct.Struct("=Q")
+_U32 = struct.Struct("=I")
+
+
+def index_path(db_path: str) -> str:
+    """Path of the search index file belonging to a database."""
+    return f"{db_path}.idx"
+
+
+def database_fingerprint(db_path: str) -> List[int]:
+    """Size and modification time of the database file and its journal."""
+    fingerprint = []
+    for path in (db_path, f"{db_path}.journal"):
+        try:
+            stat = os.stat(path)
+            fingerprint += [stat.st_size, stat.st_mtime_ns]
+        except OSError:
+            fingerprint += [0, 0]
+    return fingerprint
+
+
+def _field_values(record: Dict[str, Any]) -> Tuple[Tuple[str, ...], ...]:
+    """Lowercased values of every indexed field, like SearchIndex._extract."""
+    return (
+        ((record.get("url") or "").lower(),),
+        ((record.get("description") or "").lower(),),
+        tuple(category.lower() for category in record.get("categories") or ()),
+        tuple(tag.lower() for tag in record.get("tags") or ()),
+    )
+
+
+def _terms(values: Tuple[str, ...]) -> Set[str]:
+    """
+    Index terms of one field: its n-grams and short values, plus "" if the field has
+    any value (what SearchIndex matches for an empty search term).
+    """
+    terms = {""} if values else set()
+    for value in values:
+        if len(value) < NGRAM_SIZE:
+            terms.add(value)
+        else:
+            terms.update(value[i:i + NGRAM_SIZE] for i in range(len(value) - NGRAM_SIZE + 1))
+    return terms
+
+
+def _offsets(lengths: Iterable[int]) -> bytes:
+    return array("Q", accumulate(lengths, initial=0)).tobytes()
+
+
+def _token_counts(values: Tuple[Tuple[str, ...], ...]) -> List[Counter]:
+    """Token frequencies of every field."""
+    return [Counter(token for tokens in value_tokens(field_values) for token in tokens) for field_values in values]
+
+
+def _table(field: str, table: str, postings: Dict[str, List[int]]) -> Dict[str, bytes]:
+    """Sections of a sorted term table with its posting lists."""
+    entries = sorted((term.encode("utf-8"), docnos) for term, docnos in postings.items())
+    flat = array("I")
+    for _, docnos in entries:
+        flat.extend(docnos)
+    return {
+        f"{field}.{table}_offsets": _offsets(len(term) for term, _ in entries),
+        f"{field}.{table}s": b"".join(term for term, _ in entries),
+        f"{field}.{table}_posting_offsets": _offsets(len(docnos) for _, docnos in entries),
+        f"{field}.{table}_postings": flat.tobytes(),
+    }
+
+
+def _encode_segment(docs: List[Tuple[int, Dict[str, Any]]]) -> Dict[str, bytes]:
+    """Encode (seq, record) pairs into the sections of one segment."""
+    records = [json.dumps(record, separators=(",", ":"), ensure_ascii=False).encode("utf-8") for _, record in docs]
+    ids = [str(record.get("id", "")).encode("utf-8") for _, record in docs]
+    sections = {
+        "seqs": array("Q", (seq for seq, _ in docs)).tobytes(),
+        "record_offsets": _offsets(map(len, records)),
+        "records": b"".join(records),
+        "id_offsets": _offsets(map(len, ids)),
+        "ids": b"".join(ids),
+        "id_order": array("I", sorted(range(len(ids)), key=ids.__getitem__)).tobytes(),
+    }
+
+    values = [_field_values(record) for _, record in docs]
+    counts = [_token_counts(doc_values) for doc_values in values]
+    # Field lengths in tokens, one row of len(FIELDS) per document
+    sections["lengths"] = array("I", (sum(field.values()) for doc in counts for field in doc)).tobytes()
+
+    for field_idx, field in enumerate(FIELDS):
+        terms: Dict[str, List[int]] = {}
+        for docno, doc_values in enumerate(values):
+            for term in _terms(doc_values[field_idx]):
+                terms.setdefault(term, []).append(docno)
+        sections.update(_table(field, "term", terms))
+
+        # Whole-word postings with term frequencies, for ranking
+        tokens: Dict[str, List[int]] = {}
+        frequencies: Dict[str, List[int]] = {}
+        for docno, doc_counts in enumerate(counts):
+            for token, count in doc_counts[field_idx].items():
+                tokens.setdefault(token, []).append(docno)
+                frequencies.setdefault(token, []).append(min(count, MAX_FREQUENCY))
+        sections.update(_table(field, "token", tokens))
+        sections[f"{field}.token_frequencies"] = bytes(
+            count for _, token in sorted((token.encode("utf-8"), token) for token in tokens)
+            for count in frequencies[token]
+        )
+    return sections
+
+
+def _lengths(record: Dict[str, Any]) -> List[int]:
+    """Field lengths in tokens of a record."""
+    return [sum(counts.values()) for counts in _token_counts(_field_values(record))]
+
+
+def _count_names(names: Dict[str, Dict[str, int]], record: Dict[str, Any], change: int) -> None:
+    """Add change to the counts of the (lowercased) category and tag names of a record."""
+    values = _field_values(record)
+    for field in NAME_FIELDS:
+        counts = names[field]
+        for name in set(values[FIELDS.index(field)]):
+            counts[name] = counts.get(name, 0) + change
+            if counts[name] <= 0:
+                del counts[name]
+
+
+def _write_sections(f, offset: int, sections: Dict[str, bytes]) -> Tuple[Dict[str, List[int]], int]:
+    """Write sections 8-byte aligned at offset; returns their (offset, length) layout and the new offset."""
+    layout = {}
+    for name, data in sections.items():
+        padding = -offset % 8
+        if padding:
+            f.write(b"\0" * padding)
+            offset += padding
+        f.write(data)
+        layout[name] = [offset, len(data)]
+        offset += len(data)
+    return layout, offset
+
+
+def _write_manifest(f, offset: int, manifest: Dict[str, Any]) -> None:
+    data = json.dumps(manifest, separators=(",", ":")).encode("utf-8")
+    f.write(data)
+    f.write(TRAILER.pack(offset, len(data), TRAILER_MAGIC))
+    f.flush()
+    os.fsync(f.fileno())
+
+
+class _Segment:
+    """Read access to one segment of a mapped index file."""
+
+    def __init__(self, mm: mmap.mmap, number: int, info: Dict[str, Any]):
+        self.mm = mm
+        self.number = number
+        self.docs = info["docs"]
+        self.sections = info["sections"]
+        self._term_lists: Dict[str, List[str]] = {}
+
+    def _u64(self, section: str, i: int) -> int:
+        return _U64.unpack_from(self.mm, self.sections[section][0] + 8 * i)[0]
+
+    def _u32(self, section: str, i: int) -> int:
+        return _U32.unpack_from(self.mm, self.sections[section][0] + 4 * i)[0]
+
+    def _item(self, offsets: str, blob: str, i: int) -> bytes:
+        start = self.sections[blob][0]
+        return self.mm[start + self._u64(offsets, i):start + self._u64(offsets, i + 1)]
+
+    def seq(self, docno: int) -> int:
+        return self._u64("seqs", docno)
+
+    def record(self, docno: int) -> Dict[str, Any]:
+        return json.loads(self._item("record_offsets", "records", docno))
+
+    def locate(self, link_id: bytes) -> Optional[int]:
+        """Document number of a link id in this segment, or None."""
+        lo, hi = 0, self.docs
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._item("id_offsets", "ids", self._u32("id_order", mid)) < link_id:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.docs:
+            docno = self._u32("id_order", lo)
+            if self._item("id_offsets", "ids", docno) == link_id:
+                return docno
+        return None
+
+    def length(self, docno: int, field_idx: int) -> int:
+        """Length in tokens of a document's field."""
+        return self._u32("lengths", docno * len(FIELDS) + field_idx)
+
+    def _count(self, field: str, table: str) -> int:
+        return self.sections[f"{field}.{table}_offsets"][1] // 8 - 1
+
+    def _entry(self, field: str, table: str, i: int) -> bytes:
+        return self._item(f"{field}.{table}_offsets", f"{field}.{table}s", i)
+
+    def _find(self, field: str, table: str, key: bytes) -> int:
+        """Position of the first entry of a table that is not less than key."""
+        lo, hi = 0, self._count(field, table)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._entry(field, table, mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _span(self, field: str, table: str, i: int) -> Tuple[int, int]:
+        offsets = f"{field}.{table}_posting_offsets"
+        return self._u64(offsets, i), self._u64(offsets, i + 1)
+
+    def _postings(self, field: str, table: str, i: int) -> array:
+        start = self.sections[f"{field}.{table}_postings"][0]
+        first, last = self._span(field, table, i)
+        docnos = array("I")
+        docnos.frombytes(self.mm[start + 4 * first:start + 4 * last])
+        return docnos
+
+    def postings(self, field: str, term: str, table: str = "term") -> Optional[array]:
+        """Documents containing an index term (or, with table="token", a word), by binary search."""
+        key = term.encode("utf-8")
+        i = self._find(field, table, key)
+        if i < self._count(field, table) and self._entry(field, table, i) == key:
+            return self._postings(field, table, i)
+        return None
+
+    def frequencies(self, field: str, token: str) -> Dict[int, int]:
+        """Term frequency of a word per document containing it."""
+        key = token.encode("utf-8")
+        i = self._find(field, "token", key)
+        if i >= self._count(field, "token") or self._entry(field, "token", i) != key:
+            return {}
+        start = self.sections[f"{field}.token_frequencies"][0]
+        first, last = self._span(field, "token", i)
+        return dict(zip(self._postings(field, "token", i), self.mm[start + first:start + last]))
+
+    def tokens_with_prefix(self, field: str, prefix: str) -> List[str]:
+        """Words of a field starting with prefix, from the sorted word table."""
+        key = prefix.encode("utf-8")
+        tokens = []
+        for i in range(self._find(field, "token", key), self._count(field, "token")):
+            token = self._entry(field, "token", i)
+            if not token.startswith(key):
+                break
+            tokens.append(token.decode("utf-8"))
+        return tokens
+
+    def search(self, field: str, term: str) -> Set[int]:
+        """Document numbers whose field contains term (already lowercased)."""
+        if not term:
+            return set(self.postings(field, "") or ())
+
+        if len(term) >= NGRAM_SIZE:
+            postings = []
+            for gram in {term[i:i + NGRAM_SIZE] for i in range(len(term) - NGRAM_SIZE + 1)}:
+                docnos = self.postings(field, gram)
+                if not docnos:
+                    return set()
+                postings.append(docnos)
+            postings.sort(key=len)
+            candidates = set(postings[0]).intersection(*postings[1:])
+            if len(term) == NGRAM_SIZE:
+                return candidates
+            # Only the candidates' records are decoded to confirm the match
+            field_idx = FIELDS.index(field)
+            return {docno for docno in candidates
+                    if any(term in value for value in _field_values(self.record(docno))[field_idx])}
+
+        # Short terms lie inside some n-gram or short value, so scan the (small) term table
+        if field not in self._term_lists:
+            self._term_lists[field] = [
+                self._entry(field, "term", i).decode("utf-8") for i in range(self._count(field, "term"))
+            ]
+        result: Set[int] = set()
+        for i, indexed in enumerate(self._term_lists[field]):
+            if term in indexed:
+                result.update(self._postings(field, "term", i))
+        return result
+
+
+class _Lengths:
+    """Mapping from index keys to the length of one field, read from the segments."""
+
+    def __init__(self, segments: List[_Segment], field_idx: int):
+        self._segments = segments
+        self._field_idx = field_idx
+
+    def __getitem__(self, key: int) -> int:
+        return self._segments[key >> 32].length(key & 0xFFFFFFFF, self._field_idx)
+
+
+class DiskIndex:
+    """
+    Persistent search index file stored next to a JSON database (links.json.idx).
+
+    The file holds segments of documents (the link records in compact JSON) with n-gram
+    and short-value postings per searchable field, word postings with term frequencies
+    and field lengths, followed by a manifest and a fixed-size trailer pointing at it.
+    Readers memory-map the file, binary-search the sorted term tables and decode only
+    the records of matching links, so a search needs neither the database nor Link
+    objects for the rest of the collection. search and rank have the same semantics as
+    in SearchIndex.
+
+    Saves append a segment with the added or changed links and mark the documents they
+    supersede as dead, instead of rewriting the file. The manifest records the database
+    generation (journal sequence number) and the size and modification time of the
+    database and journal it matches; an index that does not match is ignored. It also
+    holds the category and tag names in use, against which similar_names resolves typos.
+    """
+
+    def __init__(self, f, mm: mmap.mmap, manifest: Dict[str, Any], span: List[int]):
+        self._file = f
+        self._mm = mm
+        self.manifest = manifest
+        self.span = span  # Offset and length of the manifest
+        self.segments = [_Segment(mm, number, info) for number, info in enumerate(manifest["segments"])]
+        self._vocabularies: Dict[str, VocabularyIndex] = {}
+        self._dead: Dict[int, Set[int]] = {}
+        previous: Optional[List[int]] = span
+        while previous is not None:
+            offset, length = previous
+            entry = json.loads(mm[offset:offset + length])
+            if entry.get("dead"):
+                start, size = entry["dead"]
+                pairs = array("I")
+                pairs.frombytes(mm[start:start + size])
+                for i in range(0, len(pairs), 2):
+                    self._dead.setdefault(pairs[i], set()).add(pairs[i + 1])
+            previous = entry.get("previous")
+
+    @classmethod
+    def open(cls, path: str, fingerprint: List[int] = None) -> Optional["DiskIndex"]:
+        """Map an index file; returns None if it is missing, damaged or (with fingerprint) stale."""
+        try:
+            f = open(path, "rb")
+        except OSError:
+            return None
+        try:
+            size = os.fstat(f.fileno()).st_size
+            if size >= len(MAGIC) + TRAILER.size:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                offset, length, magic = TRAILER.unpack_from(mm, size - TRAILER.size)
+                if (mm[:len(MAGIC)] == MAGIC and magic == TRAILER_MAGIC
+                        and offset + length + TRAILER.size == size):
+                    manifest = json.loads(mm[offset:offset + length])
+                    if (manifest.get("version") == FORMAT_VERSION and manifest.get("byteorder") == sys.byteorder
+                            and (fingerprint is None or manifest.get("fingerprint") == fingerprint)):
+                        return cls(f, mm, manifest, [offset, length])
+                mm.close()
+        except (OSError, ValueError, KeyError, struct.error):
+            pass
+        f.close()
+        return None
+
+    def close(self) -> None:
+        self._mm.close()
+        self._file.close()
+
+    def __enter__(self) -> "DiskIndex":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.manifest["live"]
+
+    def search(self, field: str, term: str) -> Set[int]:
+        """Return the keys of all live documents whose field contains term (case-insensitive)."""
+        if field not in FIELDS:
+            return set()
+        term = term.lower()
+        result: Set[int] = set()
+        for segment in self.segments:
+            dead = self._dead.get(segment.number, ())
+            base = segment.number << 32
+            result.update(base | docno for docno in segment.search(field, term) if docno not in dead)
+        return result
+
+    def similar_names(self, field: str, term: str, max_edits: Optional[int] = None) -> List[str]:
+        """Like SearchIndex.similar_names, against the names recorded in the manifest."""
+        if field not in NAME_FIELDS:
+            return []
+        if field not in self._vocabularies:
+            self._vocabularies[field] = VocabularyIndex(self.manifest["names"][field])
+        return [name for name, _ in self._vocabularies[field].similar(term.lower(), max_edits)]
+
+    def name_keys(self, field: str, names: Iterable[str]) -> Set[int]:
+        """Return the keys of all live documents with any of the given (lowercased) category or tag names."""
+        field_idx = FIELDS.index(field)
+        result: Set[int] = set()
+        for name in set(names):
+            for key in self.search(field, name) - result:
+                if name in _field_values(self.segments[key >> 32].record(key & 0xFFFFFFFF))[field_idx]:
+                    result.add(key)
+        return result
+
+    def _seq(self, key: int) -> int:
+        return self.segments[key >> 32].seq(key & 0xFFFFFFFF)
+
+    def _word_frequencies(self, field: str, token: str) -> Dict[int, int]:
+        """Term frequency of a word per live document containing it."""
+        frequencies = {}
+        for segment in self.segments:
+            dead = self._dead.get(segment.number, ())
+            base = segment.number << 32
+            frequencies.update((base | docno, tf) for docno, tf in segment.frequencies(field, token).items()
+                               if docno not in dead)
+        return frequencies
+
+    def rank(self, query: str, k: int = DEFAULT_TOP_K) -> List[Tuple[float, Dict[str, Any]]]:
+        """Return the records of the k links most relevant to query as (score, record), best first."""
+        clauses = parse_query(query)
+        count = len(self)
+        if not clauses or not count or k <= 0:
+            return []
+        scores: Dict[int, float] = {}
+
+        for field_idx, field in enumerate(FIELDS):
+            lengths = _Lengths(self.segments, field_idx)
+            average = self.manifest["token_totals"][field_idx] / count or 1.0
+            for kind, words in clauses:
+                matches: List[Tuple[int, Dict[int, int]]] = []
+                if kind == "phrase":
+                    candidates = set.intersection(*(set(self._word_frequencies(field, word)) for word in words))
+                    frequencies = {}
+                    for key in candidates:
+                        record = self.segments[key >> 32].record(key & 0xFFFFFFFF)
+                        tf = phrase_count(value_tokens(_field_values(record)[field_idx]), words)
+                        if tf:
+                            frequencies[key] = tf
+                    matches.append((len(frequencies), frequencies))
+                else:
+                    word = words[0]
+                    if kind == "prefix":
+                        expansions = sorted({token for segment in self.segments
+                                             for token in segment.tokens_with_prefix(field, word)})
+                    else:
+                        expansions = [word]
+                    for token in expansions:
+                        frequencies = self._word_frequencies(field, token)
+                        if frequencies:
+                            matches.append((len(frequencies), frequencies))
+                add_clause_scores(scores, FIELD_WEIGHTS[field], matches, lengths, average, count)
+
+        return [(score, self.segments[key >> 32].record(key & 0xFFFFFFFF))
+                for key, score in top_k(scores, k, self._seq)]
+
+    def resolve(self, keys: Iterable[int]) -> List[Dict[str, Any]]:
+        """Decode the records of result keys, in collection order."""
+        located = [(self.segments[key >> 32], key & 0xFFFFFFFF) for key in keys]
+        located.sort(key=lambda item: item[0].seq(item[1]))
+        return [segment.record(docno) for segment, docno in located]
+
+    def locate(self, link_id: str) -> Optional[Tuple[int, int]]:
+        """(segment, document number) of the live document of a link, or None."""
+        key = link_id.encode("utf-8")
+        for segment in reversed(self.segments):
+            docno = segment.locate(key)
+            if docno is not None and docno not in self._dead.get(segment.number, ()):
+                return segment.number, docno
+        return None
+
+
+def write_index(path: str, records: Iterable[Dict[str, Any]], generation: int, fingerprint: List[int]) -> None:
+    """Write a complete index for the records (in collection order), replacing any existing file."""
+    docs = list(enumerate(records))
+    token_totals = [0] * len(FIELDS)
+    names: Dict[str, Dict[str, int]] = {field: {} for field in NAME_FIELDS}
+    for _, record in docs:
+        token_totals = [total + length for total, length in zip(token_totals, _lengths(record))]
+        _count_names(names, record, 1)
+    temp_file = f"{path}.tmp"
+    try:
+        with open(temp_file, "wb") as f:
+            f.write(MAGIC)
+            offset = len(MAGIC)
+            segments = []
+            if docs:
+                layout, offset = _write_sections(f, offset, _encode_segment(docs))
+                segments.append({"docs": len(docs), "sections": layout})
+            _write_manifest(f, offset, {
+                "version": FORMAT_VERSION,
+                "byteorder": sys.byteorder,
+                "generation": generation,
+                "fingerprint": fingerprint,
+                "next_seq": len(docs),
+                "live": len(docs),
+                "dead_count": 0,
+                "token_totals": token_totals,
+                "names": names,
+                "appends": 0,
+                "segments": segments,
+                "dead": None,
+                "previous": None,
+            })
+        os.replace(temp_file, path)
+    finally:
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
+
+
+def update_index(path: str, entries: List[Dict[str, Any]], generation: int,
+                 fingerprint_before: List[int], fingerprint: List[int]) -> bool:
+    """
+    Append the changes described by journal entries to an index that matches
+    fingerprint_before. Returns False, without touching the file, if the index does not
+    match or should be rewritten from scratch (see MAX_APPENDS and MAX_DEAD_RATIO).
+    """
+    index = DiskIndex.open(path, fingerprint_before)
+    if index is None:
+        return False
+
+    with index:
+        manifest = index.manifest
+        if not entries and fingerprint == fingerprint_before:
+            return True
+        if manifest["appends"] >= MAX_APPENDS:
+            return False
+
+        # Net change per link id, in the order the links were first touched; like
+        # Journal.apply, updates of links that do not exist (any more) are ignored
+        changes: Dict[str, Optional[Dict[str, Any]]] = {}
+        added: Set[str] = set()
+        for entry in entries:
+            op = entry.get("op")
+            if op == "add":
+                changes[entry["link"]["id"]] = entry["link"]
+                added.add(entry["link"]["id"])
+            elif op == "update":
+                if changes.get(entry["id"], True) is not None:
+                    changes[entry["id"]] = entry["link"]
+            elif op == "remove":
+                changes[entry["id"]] = None
+
+        next_seq = manifest["next_seq"]
+        token_totals = list(manifest["token_totals"])
+        names = {field: dict(counts) for field, counts in manifest["names"].items()}
+        dead: List[int] = []
+        docs = []
+        for link_id, record in changes.items():
+            location = index.locate(link_id)
+            if location is not None:
+                dead.extend(location)
+                segment = index.segments[location[0]]
+                for field_idx in range(len(FIELDS)):
+                    token_totals[field_idx] -= segment.length(location[1], field_idx)
+                _count_names(names, segment.record(location[1]), -1)
+                seq = segment.seq(location[1])  # Keep the link's position
+            elif link_id in added:
+                seq = next_seq
+                next_seq += 1
+            else:
+                continue
+            if record is not None:
+                docs.append((seq, record))
+                token_totals = [total + length for total, length in zip(token_totals, _lengths(record))]
+                _count_names(names, record, 1)
+
+        live = manifest["live"] - len(dead) // 2 + len(docs)
+        dead_count = manifest["dead_count"] + len(dead) // 2
+        if dead_count > live * MAX_DEAD_RATIO:
+            return False
+        span = index.span
+        segments = list(manifest["segments"])
+
+    with open(path, "r+b") as f:
+        offset = f.seek(0, os.SEEK_END)
+        if docs:
+            layout, offset = _write_sections(f, offset, _encode_segment(docs))
+            segments.append({"docs": len(docs), "sections": layout})
+        dead_layout = None
+        if dead:
+            layout, offset = _write_sections(f, offset, {"dead": array("I", dead).tobytes()})
+            dead_layout = layout["dead"]
+        _write_manifest(f, offset, {
+            **manifest,
+            "generation": generation,
+            "fingerprint": fingerprint,
+            "next_seq": next_seq,
+            "live": live,
+            "dead_count": dead_count,
+            "token_totals": token_totals,
+            "names": names,
+            "appends": manifest["appends"] + 1,
+            "segments": segments,
+            "dead": dead_layout,
+            "previous": span,
+        })
+    return True
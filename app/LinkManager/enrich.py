@@ -0,0 +1,292 @@
+import re  # Used (whitespace in titles and descriptions)
+import time  # Used (cache expiry, elapsed time)
+import codecs  # Used (incremental decoding of streamed pages)
+import asyncio  # Used (concurrent fetches)
+import sqlite3  # Used (response cache)
+from collections import deque  # Used (batch queue)
+from html.parser import HTMLParser  # Used (page heads)
+from operator import itemgetter  # Used (target URLs)
+from typing import List, Dict, Tuple, Optional, Callable, Iterable  # Used (type hints)
+from .httpclient import HTTPClient, HTTPError, Response, host_batches, DEFAULT_PER_HOST, DEFAULT_TIMEOUT  # Used (HTTP requests)
+from .linkcheck import DEFAULT_CONCURRENCY, DEFAULT_RATE  # Used (shared request limits)
+
+DEFAULT_TTL = 30 * 24 * 3600  # Seconds a cached page stays valid
+MAX_HEAD_BYTES = 256 * 1024  # Bytes of a page read while looking for the end of its <head>
+MAX_DESCRIPTION = 300  # Characters of a description built from a page
+CHECKPOINT = 100  # Results written to the cache at a time
+HTML_TYPES = ("text/html", "application/xhtml+xml")
+DESCRIPTION_NAMES = ("description", "og:description", "twitter:description")
+TITLE_NAMES = ("og:title", "twitter:title")
+
+_SPACE_RE = re.compile(r"\s+")
+
+# (link id, URL) of a link to fetch metadata for
+FetchTarget = Tuple[str, str]
+
+
+def _clean(text: str) -> str:
+    return _SPACE_RE.sub(" ", text).strip()
+
+
+class PageMetadata:
+    """
+    Title and meta description of a page, as found in its <head>; status is the HTTP status
+    (0 if the page could not be fetched, with the reason in error).
+    """
+
+    __slots__ = ("url", "status", "title", "description", "fetched_at", "error")
+
+    def __init__(self, url: str, status: int, title: str = "", description: str = "",
+                 fetched_at: float = 0.0, error: Optional[str] = None):
+        self.url = url
+        self.status = status
+        self.title = title
+        self.description = description
+        self.fetched_at = fetched_at or time.time()
+        self.error = error
+
+    def summary(self) -> str:
+        """Description for the link: the title and the meta description, or whichever exists."""
+        if self.title and self.description and not self.description.startswith(self.title):
+            text = f"{self.title} - {self.description}"
+        else:
+            text = self.description or self.title
+        if len(text) > MAX_DESCRIPTION:
+            text = text[:MAX_DESCRIPTION - 3].rstrip() + "..."
+        return text
+
+
+class HeadParser(HTMLParser):
+    """
+    Collects the title and the meta description of a page fed in chunks; done is set at the
+    end of the <head> (or the start of the <body>), after which the rest need not be read.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.done = False
+        self._title: List[str] = []
+        self._in_title = False
+        self._meta: Dict[str, str] = {}
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        if tag == "title":
+            self._in_title = True
+        elif tag == "meta":
+            values = dict(attrs)
+            name = (values.get("name") or values.get("property") or "").lower()
+            if values.get("content") and name not in self._meta:
+                self._meta[name] = values["content"]
+        elif tag == "body":
+            self.done = True
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag == "title":
+            self._in_title = False
+        elif tag == "head":
+            self.done = True
+
+    def handle_data(self, data: str) -> None:
+        if self._in_title:
+            self._title.append(data)
+
+    @property
+    def title(self) -> str:
+        title = _clean("".join(self._title))
+        return title or next((_clean(self._meta[name]) for name in TITLE_NAMES if name in self._meta), "")
+
+    @property
+    def description(self) -> str:
+        return next((_clean(self._meta[name]) for name in DESCRIPTION_NAMES if name in self._meta), "")
+
+
+class PageCache:
+    """
+    On-disk cache of fetched page metadata by URL (a SQLite file), so pages are not fetched
+    again within ttl seconds. Pages that could not be fetched at all are not cached.
+    """
+
+    def __init__(self, path: str, ttl: float = DEFAULT_TTL):
+        self.path = path
+        self.ttl = ttl
+        self._conn = sqlite3.connect(path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS pages (url TEXT PRIMARY KEY, status INTEGER NOT NULL, "
+            "title TEXT NOT NULL, description TEXT NOT NULL, fetched_at REAL NOT NULL)")
+        self._conn.commit()
+
+    def get_many(self, urls: Iterable[str]) -> Dict[str, PageMetadata]:
+        """Unexpired entries for the given URLs, by URL."""
+        urls = list(dict.fromkeys(urls))
+        oldest = time.time() - self.ttl
+        found = {}
+        for start in range(0, len(urls), 500):
+            chunk = urls[start:start + 500]
+            marks = ",".join("?" * len(chunk))
+            for row in self._conn.execute(
+                    f"SELECT url, status, title, description, fetched_at FROM pages "
+                    f"WHERE url IN ({marks}) AND fetched_at >= ?", (*chunk, oldest)):
+                found[row[0]] = PageMetadata(*row)
+        return found
+
+    def put_many(self, pages: Iterable[PageMetadata]) -> None:
+        """Store pages (replacing older entries for their URLs) and commit."""
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO pages(url, status, title, description, fetched_at) VALUES (?, ?, ?, ?, ?)",
+            [(page.url, page.status, page.title, page.description, page.fetched_at)
+             for page in pages if page.status])
+        self._conn.commit()
+
+    def prune(self) -> int:
+        """Delete expired entries; returns how many were deleted."""
+        deleted = self._conn.execute("DELETE FROM pages WHERE fetched_at < ?", (time.time() - self.ttl,)).rowcount
+        self._conn.commit()
+        return deleted
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class EnrichSummary:
+    """Outcome of filling in descriptions from the linked pages."""
+
+    def __init__(self, total: int = 0):
+        self.total = total  # Links without a description
+        self.fetched = 0  # Pages requested
+        self.cached = 0  # Pages answered from the cache
+        self.filled = 0  # Links that got a description
+        self.failed = 0  # Pages that could not be fetched or returned an error status
+        self.interrupted = False
+        self.started = time.perf_counter()
+        self.finished: Optional[float] = None
+
+    @property
+    def elapsed(self) -> float:
+        return (self.finished or time.perf_counter()) - self.started
+
+    @property
+    def done(self) -> int:
+        return self.fetched + self.cached
+
+    def add(self, page: PageMetadata, filled: bool) -> None:
+        if not page.status or page.status >= 400:
+            self.failed += 1
+        if filled:
+            self.filled += 1
+
+    def finish(self) -> "EnrichSummary":
+        """Stop the clock."""
+        self.finished = time.perf_counter()
+        return self
+
+    def __str__(self) -> str:
+        text = (f"{self.filled} of {self.total} links without a description filled in "
+                f"({self.fetched} pages fetched, {self.cached} from cache, {self.failed} failed) "
+                f"({self.elapsed:.2f}s)")
+        if self.interrupted:
+            text += "; interrupted, run it again to continue"
+        return text
+
+
+class MetadataFetcher:
+    """
+    Fetches the titles and meta descriptions of many pages concurrently with HTTPClient.
+
+    Each page is read only until the end of its <head>, parsed as it streams in. Pages are
+    fetched in per-host batches like LinkChecker does, so connections are reused and every
+    host gets at most per_host connections and rate requests per second, while at most
+    concurrency requests are in flight overall.
+
+    With a PageCache, pages fetched within its TTL are answered from it, and results are
+    written to it every checkpoint pages; an interrupted run therefore resumes where it
+    stopped when it is started again.
+    """
+
+    def __init__(self, concurrency: int = DEFAULT_CONCURRENCY, per_host: int = DEFAULT_PER_HOST,
+                 rate: Optional[float] = DEFAULT_RATE, timeout: float = DEFAULT_TIMEOUT,
+                 connect_to: Optional[Tuple[str, int]] = None, cache: Optional[PageCache] = None,
+                 checkpoint: int = CHECKPOINT):
+        self.concurrency = max(1, concurrency)
+        self.per_host = max(1, per_host)
+        self.rate = rate
+        self.timeout = timeout
+        self.connect_to = connect_to
+        self.cache = cache
+        self.checkpoint = max(1, checkpoint)
+        self._cancelled = False
+
+    def cancel(self) -> None:
+        """Stop after the requests in flight; safe to call from another thread."""
+        self._cancelled = True
+
+    async def fetch_one(self, client: HTTPClient, url: str) -> PageMetadata:
+        """Fetch the head of one page."""
+        parser = HeadParser()
+        decoder = None
+
+        def feed(response: Response, chunk: bytes) -> bool:
+            nonlocal decoder
+            if decoder is None:
+                content_type, _, params = response.header("content-type", "text/html").partition(";")
+                if response.status >= 400 or content_type.strip().lower() not in HTML_TYPES:
+                    return True
+                charset = params.partition("charset=")[2].strip(" \"'") or "utf-8"
+                try:
+                    decoder = codecs.getincrementaldecoder(charset)(errors="replace")
+                except LookupError:
+                    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+            parser.feed(decoder.decode(chunk))
+            return parser.done
+
+        try:
+            response = await client.request("GET", url, {"Accept": "text/html,application/xhtml+xml"},
+                                            body_limit=MAX_HEAD_BYTES, stop=feed)
+        except HTTPError as e:
+            return PageMetadata(url, 0, error=str(e))
+        if response.status >= 400:
+            return PageMetadata(url, response.status)
+        return PageMetadata(url, response.status, parser.title, parser.description)
+
+    async def run(self, targets: List[FetchTarget], on_result: Callable[[str, PageMetadata], None],
+                  on_cached: Optional[Callable[[str, PageMetadata], None]] = None) -> None:
+        """
+        Fetch the pages of every target, calling on_result(link id, PageMetadata) as each one
+        arrives; pages found in the cache go to on_cached (default: on_result) first.
+        """
+        self._cancelled = False
+        if self.cache is not None:
+            cached = self.cache.get_many(url for _, url in targets)
+            for link_id, url in targets:
+                if url in cached:
+                    (on_cached or on_result)(link_id, cached[url])
+            targets = [target for target in targets if target[1] not in cached]
+        batches = deque(host_batches(targets, itemgetter(1), self.per_host))
+        client = HTTPClient(self.per_host, self.rate, self.timeout, connect_to=self.connect_to,
+                            max_idle=self.concurrency * 2)
+        unsaved: List[PageMetadata] = []
+
+        async def worker() -> None:
+            while batches and not self._cancelled:
+                for link_id, url in batches.popleft():
+                    if self._cancelled:
+                        return
+                    page = await self.fetch_one(client, url)
+                    on_result(link_id, page)
+                    if self.cache is not None:
+                        unsaved.append(page)
+                        if len(unsaved) >= self.checkpoint:
+                            self.cache.put_many(unsaved)
+                            unsaved.clear()
+
+        try:
+            async with client:
+                await asyncio.gather(*(worker() for _ in range(min(self.concurrency, len(batches)))))
+        finally:
+            # Keep what was fetched even if the run is interrupted
+            if self.cache is not None and unsaved:
+                self.cache.put_many(unsaved)
+
+    def fetch(self, targets: List[FetchTarget], on_result: Callable[[str, PageMetadata], None],
+              on_cached: Optional[Callable[[str, PageMetadata], None]] = None) -> None:
+        """Synchronous form of run."""
+        asyncio.run(self.run(targets, on_result, on_cached))
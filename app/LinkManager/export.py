@@ -0,0 +1,231 @@
+import csv  # Used (CSV output)
+import json  # Used (JSON Lines output, columnar footer)
+import os  # Used (extensions, atomic replace)
+import struct  # Used (columnar footer length)
+import sys  # Used (byte order)
+import zlib  # Used (columnar compression)
+from array import array  # Used (columnar integer arrays)
+from itertools import islice  # Used (chunking)
+from typing import List, Dict, Any, Iterable, Iterator, Optional, BinaryIO, TextIO  # Used (type hints)
+
+CHUNK_ROWS = 10000
+BUFFER_SIZE = 1 << 20
+
+EXPORT_FORMATS = ("csv", "jsonl", "columnar")
+FORMAT_EXTENSIONS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl", ".lmc": "columnar"}
+DEFAULT_EXTENSIONS = {"csv": ".csv", "jsonl": ".jsonl", "columnar": ".lmc"}
+
+CSV_FIELDS = ("url", "description", "categories", "tags", "created_at", "last_updated")
+FIELDS = ("id", "url", "description", "categories", "tags", "created_at", "last_updated")
+LIST_FIELDS = ("categories", "tags")
+
+COLUMNAR_MAGIC = b"LMC1"
+COLUMNAR_VERSION = 1
+COMPRESSION_LEVEL = 3
+
+
+def export_format_for(file_path: str, export_format: Optional[str] = None) -> str:
+    """
+    Return the export format to use: export_format if given, otherwise the one matching
+    the file extension (CSV for unknown extensions).
+    Raises ValueError for an unknown format name.
+    """
+    if export_format:
+        export_format = export_format.lower()
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError(f"Unknown export format '{export_format}' (choose from {', '.join(EXPORT_FORMATS)})")
+        return export_format
+    return FORMAT_EXTENSIONS.get(os.path.splitext(file_path)[1].lower(), "csv")
+
+
+def _chunks(items: Iterable[Any]) -> Iterator[List[Dict[str, Any]]]:
+    """Group links or link records into lists of CHUNK_ROWS records."""
+    records = (item if isinstance(item, dict) else item.to_dict() for item in items)
+    while chunk := list(islice(records, CHUNK_ROWS)):
+        yield chunk
+
+
+def write_csv(f: TextIO, items: Iterable[Any]) -> int:
+    """Write links as CSV (the layout read by bulk_import_from_csv); returns the number written."""
+    writer = csv.writer(f)
+    writer.writerow(CSV_FIELDS)
+    count = 0
+    for chunk in _chunks(items):
+        writer.writerows([
+            (r["url"], r["description"], ",".join(r["categories"]), ",".join(r["tags"]),
+             r["created_at"], r["last_updated"])
+            for r in chunk
+        ])
+        count += len(chunk)
+    return count
+
+
+def write_jsonl(f: TextIO, items: Iterable[Any]) -> int:
+    """Write one JSON object per line; returns the number written."""
+    encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+    count = 0
+    for chunk in _chunks(items):
+        f.write("\n".join(map(encode, chunk)))
+        f.write("\n")
+        count += len(chunk)
+    return count
+
+
+def _uint32s(values: Iterable[int]) -> bytes:
+    data = array("I", values)
+    if sys.byteorder == "big":
+        data.byteswap()
+    return data.tobytes()
+
+
+def _read_uint32s(payload: bytes, start: int, count: int) -> array:
+    data = array("I")
+    data.frombytes(payload[start:start + 4 * count])
+    if sys.byteorder == "big":
+        data.byteswap()
+    return data
+
+
+class ColumnarWriter:
+    """
+    Writer for the compact columnar format (.lmc), modelled on Parquet.
+
+    Layout: magic, row groups of up to CHUNK_ROWS links, a zlib-compressed JSON footer,
+    the footer length (uint32, little endian) and the magic again. Each row group stores
+    every column as a separate zlib-compressed chunk, so readers can load only the
+    columns they need:
+
+    - text columns: uint32 byte length per row, then the UTF-8 values back to back
+    - categories/tags: uint32 count per row, then uint32 ids into a dictionary of names
+      kept in the footer
+    """
+
+    def __init__(self, f: BinaryIO):
+        self.f = f
+        self.offset = 0
+        self.rows = 0
+        self.row_groups: List[Dict[str, Any]] = []
+        self.dictionaries: Dict[str, Dict[str, int]] = {field: {} for field in LIST_FIELDS}
+        self._write(COLUMNAR_MAGIC)
+
+    def _write(self, data: bytes) -> None:
+        self.f.write(data)
+        self.offset += len(data)
+
+    def _encode_list(self, field: str, values: List[List[str]]) -> bytes:
+        dictionary = self.dictionaries[field]
+        ids = []
+        for names in values:
+            for name in names:
+                name_id = dictionary.get(name)
+                if name_id is None:
+                    name_id = dictionary[name] = len(dictionary)
+                ids.append(name_id)
+        return _uint32s(map(len, values)) + _uint32s(ids)
+
+    @staticmethod
+    def _encode_text(values: List[str]) -> bytes:
+        encoded = [(value or "").encode("utf-8") for value in values]
+        return _uint32s(map(len, encoded)) + b"".join(encoded)
+
+    def write_chunk(self, records: List[Dict[str, Any]]) -> None:
+        """Append one row group."""
+        columns = []
+        for field in FIELDS:
+            values = [record.get(field) for record in records]
+            payload = self._encode_list(field, values) if field in LIST_FIELDS else self._encode_text(values)
+            data = zlib.compress(payload, COMPRESSION_LEVEL)
+            columns.append([self.offset, len(data)])
+            self._write(data)
+        self.row_groups.append({"rows": len(records), "columns": columns})
+        self.rows += len(records)
+
+    def close(self) -> None:
+        """Write the footer; the file is unreadable until this is called."""
+        footer = zlib.compress(json.dumps({
+            "version": COLUMNAR_VERSION,
+            "columns": list(FIELDS),
+            "rows": self.rows,
+            "row_groups": self.row_groups,
+            "dictionaries": {field: list(names) for field, names in self.dictionaries.items()},
+        }).encode("utf-8"))
+        self._write(footer)
+        self._write(struct.pack("<I", len(footer)) + COLUMNAR_MAGIC)
+
+
+def write_columnar(f: BinaryIO, items: Iterable[Any]) -> int:
+    """Write links in the columnar format; returns the number written."""
+    writer = ColumnarWriter(f)
+    for chunk in _chunks(items):
+        writer.write_chunk(chunk)
+    writer.close()
+    return writer.rows
+
+
+def read_columnar(file_path: str, columns: Optional[List[str]] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the records of a columnar export, one row group at a time.
+    With columns, only those columns are decompressed and returned.
+    Raises ValueError if the file is not a columnar export.
+    """
+    with open(file_path, "rb") as f:
+        if f.read(len(COLUMNAR_MAGIC)) != COLUMNAR_MAGIC:
+            raise ValueError(f"{file_path} is not a LinkManager columnar export")
+        f.seek(-8, os.SEEK_END)
+        footer_length, magic = struct.unpack("<I4s", f.read(8))
+        if magic != COLUMNAR_MAGIC:
+            raise ValueError(f"{file_path} is incomplete (missing footer)")
+        f.seek(-8 - footer_length, os.SEEK_END)
+        meta = json.loads(zlib.decompress(f.read(footer_length)))
+
+        fields = columns or meta["columns"]
+        unknown = [field for field in fields if field not in meta["columns"]]
+        if unknown:
+            raise ValueError(f"Unknown columns: {', '.join(unknown)}")
+        positions = {field: meta["columns"].index(field) for field in fields}
+
+        for group in meta["row_groups"]:
+            rows = group["rows"]
+            decoded = {}
+            for field in fields:
+                offset, size = group["columns"][positions[field]]
+                f.seek(offset)
+                payload = zlib.decompress(f.read(size))
+                counts = _read_uint32s(payload, 0, rows)
+                if field in LIST_FIELDS:
+                    names = meta["dictionaries"][field]
+                    ids = _read_uint32s(payload, 4 * rows, sum(counts))
+                    values, start = [], 0
+                    for count in counts:
+                        values.append([names[name_id] for name_id in ids[start:start + count]])
+                        start += count
+                else:
+                    values, start = [], 4 * rows
+                    for length in counts:
+                        values.append(payload[start:start + length].decode("utf-8"))
+                        start += length
+                decoded[field] = values
+            for row in range(rows):
+                yield {field: decoded[field][row] for field in fields}
+
+
+def write_export(file_path: str, items: Iterable[Any], export_format: Optional[str] = None) -> int:
+    """
+    Stream links or link records into file_path in the given format (see export_format_for).
+    The file is written next to its destination and moved into place once complete,
+    so readers never see a partial export. Returns the number of links written.
+    """
+    export_format = export_format_for(file_path, export_format)
+    temp_file = f"{file_path}.tmp"
+    try:
+        if export_format == "columnar":
+            with open(temp_file, "wb", buffering=BUFFER_SIZE) as f:
+                count = write_columnar(f, items)
+        else:
+            with open(temp_file, "w", newline="", encoding="utf-8", buffering=BUFFER_SIZE) as f:
+                count = (write_csv if export_format == "csv" else write_jsonl)(f, items)
+        os.replace(temp_file, file_path)
+        return count
+    finally:
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
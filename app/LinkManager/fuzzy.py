@@ -0,0 +1,135 @@
+import re  # Used (splitting names into words)
+from collections import Counter  # Used (shared n-gram counts)
+from typing import List, Dict, Set, Tuple, Iterable, Optional  # Used (type hints)
+
+NGRAM_SIZE = 3
+PADDING = "\x00" * (NGRAM_SIZE - 1)
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def max_edits_for(term: str) -> int:
+    """Number of typos tolerated in a term: none up to 2 characters, 1 up to 5, then 2."""
+    if len(term) <= 2:
+        return 0
+    return 1 if len(term) <= 5 else 2
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """
+    Damerau-Levenshtein distance (optimal string alignment) between a and b, so that
+    a swap of two neighbouring letters counts as one typo. Stops early and returns
+    limit + 1 once the distance is known to exceed limit.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2: Optional[List[int]] = None
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i] + [0] * len(b)
+        for j, char_b in enumerate(b, 1):
+            cost = char_a != char_b
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if (previous2 is not None and j > 1 and char_a == b[j - 2] and a[i - 2] == char_b):
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return min(previous[-1], limit + 1)
+
+
+def _grams(entry: str) -> Set[str]:
+    padded = f"{PADDING}{entry}{PADDING}"
+    return {padded[i:i + NGRAM_SIZE] for i in range(len(padded) - NGRAM_SIZE + 1)}
+
+
+class VocabularyIndex:
+    """
+    N-gram index over a vocabulary of distinct names, such as the categories or tags in use.
+
+    Every name and every word of a name is an entry, indexed by its n-grams (padded at
+    both ends, so that short entries have some). Query terms are resolved against the
+    vocabulary instead of the links using it, so their cost depends on the number of
+    distinct names, not on the size of the collection. Names are expected lowercased.
+    """
+
+    def __init__(self, names: Iterable[str] = ()):
+        self._entries: Dict[str, Set[str]] = {}  # Entry -> names it belongs to
+        self._grams: Dict[str, Set[str]] = {}  # N-gram -> entries containing it
+        for name in names:
+            self.add(name)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _entries_of(name: str) -> Set[str]:
+        return {name, *_WORD_RE.findall(name)}
+
+    def add(self, name: str) -> None:
+        """Add a name to the vocabulary."""
+        for entry in self._entries_of(name):
+            names = self._entries.get(entry)
+            if names is None:
+                names = self._entries[entry] = set()
+                for gram in _grams(entry):
+                    self._grams.setdefault(gram, set()).add(entry)
+            names.add(name)
+
+    def discard(self, name: str) -> None:
+        """Remove a name from the vocabulary."""
+        for entry in self._entries_of(name):
+            names = self._entries.get(entry)
+            if names is None:
+                continue
+            names.discard(name)
+            if not names:
+                del self._entries[entry]
+                for gram in _grams(entry):
+                    entries = self._grams[gram]
+                    entries.discard(entry)
+                    if not entries:
+                        del self._grams[gram]
+
+    def containing(self, term: str) -> Set[str]:
+        """Names that contain term (lowercased) as a substring."""
+        if len(term) < NGRAM_SIZE:
+            candidates: Iterable[str] = self._entries
+        else:
+            postings = []
+            for i in range(len(term) - NGRAM_SIZE + 1):
+                entries = self._grams.get(term[i:i + NGRAM_SIZE])
+                if not entries:
+                    return set()
+                postings.append(entries)
+            postings.sort(key=len)
+            candidates = postings[0].intersection(*postings[1:])
+        # Whole names are entries themselves, so checking entries that are names suffices
+        return {entry for entry in candidates if term in entry and entry in self._entries[entry]}
+
+    def similar(self, term: str, max_edits: Optional[int] = None) -> List[Tuple[str, int]]:
+        """
+        Names that are, or contain a word that is, within max_edits typos of term (default:
+        max_edits_for(term)), as (name, distance) sorted by distance and name.
+        """
+        if max_edits is None:
+            max_edits = max_edits_for(term)
+        # An insertion, deletion or substitution changes at most NGRAM_SIZE of the padded
+        # n-grams (the q-gram lemma); a swap of neighbouring letters, NGRAM_SIZE + 1
+        grams = _grams(term)
+        shared_needed = len(grams) - (NGRAM_SIZE + 1) * max_edits
+        if shared_needed > 0:
+            shared = Counter(entry for gram in grams for entry in self._grams.get(gram, ()))
+            candidates: Iterable[str] = [entry for entry, count in shared.items() if count >= shared_needed]
+        else:
+            candidates = self._entries
+
+        best: Dict[str, int] = {}
+        for entry in candidates:
+            distance = edit_distance(term, entry, max_edits)
+            if distance > max_edits:
+                continue
+            for name in self._entries[entry]:
+                if distance < best.get(name, max_edits + 1):
+                    best[name] = distance
+        return sorted(best.items(), key=lambda item: (item[1], item[0]))
@@ -0,0 +1,340 @@
+import ssl  # Used (HTTPS connections)
+import time  # Used (latency)
+import asyncio  # Used (connections and timeouts)
+from collections import OrderedDict  # Used (least recently used idle connections)
+from urllib.parse import urlsplit, urljoin  # Used (request targets, redirects)
+from typing import List, Dict, Tuple, Optional, Any, Callable, Iterable  # Used (type hints)
+
+DEFAULT_TIMEOUT = 10.0  # Seconds to connect and read a response, per redirect hop
+DEFAULT_PER_HOST = 2  # Connections open to one host at a time
+DEFAULT_BODY_LIMIT = 1024 * 1024  # Bytes of a response body that are kept
+MAX_IDLE_CONNECTIONS = 100  # Keep-alive connections kept open across all hosts
+MAX_REDIRECTS = 5
+MAX_HEADERS = 100
+READ_SIZE = 64 * 1024
+# Unread body bytes still read (and dropped) after reading stopped early, to reuse the connection
+DRAIN_LIMIT = 64 * 1024
+USER_AGENT = "LinkManager/0.1 (+https://github.com/EricStautmeister/LinkManager)"
+REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+
+
+def host_batches(items: Iterable[Any], url_of: Callable[[Any], str], per_host: int) -> List[List[Any]]:
+    """
+    Split items into batches by the host of their URL, at most per_host batches per host,
+    longest first. Workers that each take a batch and request its URLs one after another
+    reuse their connections and never exceed the per-host limit between them.
+    """
+    hosts: Dict[str, List[Any]] = {}
+    for item in items:
+        try:
+            host = (urlsplit(url_of(item)).hostname or "").lower()
+        except ValueError:
+            host = ""
+        hosts.setdefault(host, []).append(item)
+    batches = []
+    for host_items in hosts.values():
+        lanes = min(per_host, len(host_items))
+        batches.extend(host_items[lane::lanes] for lane in range(lanes))
+    # Long batches first, so the largest hosts do not finish last on their own
+    batches.sort(key=len, reverse=True)
+    return batches
+
+
+class HTTPError(Exception):
+    """A request failed without an HTTP response (bad URL, connection error, timeout, protocol error)."""
+
+
+class Response:
+    """Status, headers (lowercase names) and the body, or as much of it as was read, of a response."""
+
+    __slots__ = ("status", "reason", "headers", "body", "url", "elapsed", "complete")
+
+    def __init__(self, status: int, reason: str, headers: Dict[str, str], url: str):
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        self.body = b""
+        self.url = url  # Final URL, after redirects
+        self.elapsed = 0.0  # Seconds from sending the first request to reading the response
+        self.complete = True  # False if reading the body was stopped early
+
+    def header(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        return self.headers.get(name.lower(), default)
+
+
+class _Connection:
+    __slots__ = ("reader", "writer", "key")
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, key: Tuple[str, str, int]):
+        self.reader = reader
+        self.writer = writer
+        self.key = key
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class _Host:
+    """Connection slots, idle connections and request pacing of one host."""
+
+    def __init__(self, per_host: int, interval: float):
+        self.slots = asyncio.Semaphore(per_host)
+        self.idle: List[_Connection] = []
+        self.interval = interval
+        self.next_start = 0.0
+
+    async def pace(self) -> None:
+        """Wait until this host may be sent the next request."""
+        if not self.interval:
+            return
+        now = asyncio.get_running_loop().time()
+        start = max(now, self.next_start)
+        self.next_start = start + self.interval
+        if start > now:
+            await asyncio.sleep(start - now)
+
+
+class HTTPClient:
+    """
+    Small asyncio HTTP/1.1 client built on the standard library, for checking and fetching
+    many links at once.
+
+    Connections are kept alive and reused per host, at most per_host are open to one host
+    at a time, and with rate set a host is sent at most rate requests per second. Idle
+    connections beyond max_idle are closed, least recently used first. Redirects are
+    followed. Only the first body_limit bytes of a body are kept; stop, if given, is called
+    with the response (status and headers) and every chunk read, and ends reading when it
+    returns True. Headers passed to request replace the default ones of the same name.
+
+    connect_to=(host, port) sends every request, unencrypted, to that address instead of
+    the URL's host (the Host header is unchanged), e.g. to a local stand-in server.
+
+    Use it as an async context manager, or call close() when done.
+    """
+
+    def __init__(self, per_host: int = DEFAULT_PER_HOST, rate: Optional[float] = None,
+                 timeout: float = DEFAULT_TIMEOUT, user_agent: str = USER_AGENT,
+                 connect_to: Optional[Tuple[str, int]] = None, max_idle: int = MAX_IDLE_CONNECTIONS):
+        self.per_host = per_host
+        self.interval = 1.0 / rate if rate else 0.0
+        self.timeout = timeout
+        self.user_agent = user_agent
+        self.connect_to = connect_to
+        self.max_idle = max_idle
+        self.connections_opened = 0
+        self._hosts: Dict[Tuple[str, str, int], _Host] = {}
+        self._idle: "OrderedDict[_Connection, None]" = OrderedDict()
+        self._ssl: Optional[ssl.SSLContext] = None
+
+    async def __aenter__(self) -> "HTTPClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Close every idle connection."""
+        connections = list(self._idle)
+        self._idle.clear()
+        for host in self._hosts.values():
+            host.idle.clear()
+        for connection in connections:
+            connection.close()
+        for connection in connections:
+            try:
+                await connection.writer.wait_closed()
+            except (OSError, ssl.SSLError):
+                pass
+
+    async def request(self, method: str, url: str, headers: Optional[Dict[str, str]] = None,
+                      body_limit: int = DEFAULT_BODY_LIMIT,
+                      stop: Optional[Callable[[Response, bytes], bool]] = None) -> Response:
+        """Send a request, following redirects; raises HTTPError if no response is received."""
+        started = time.perf_counter()
+        try:
+            response = await self._follow(method, url, headers, body_limit, stop)
+        except asyncio.TimeoutError:
+            raise HTTPError(f"Timed out after {self.timeout:g}s") from None
+        except (OSError, ssl.SSLError, asyncio.IncompleteReadError, asyncio.LimitOverrunError,
+                UnicodeDecodeError, ValueError) as e:
+            raise HTTPError(str(e) or type(e).__name__) from None
+        response.elapsed = time.perf_counter() - started
+        return response
+
+    async def _follow(self, method: str, url: str, headers: Optional[Dict[str, str]], body_limit: int,
+                      stop: Optional[Callable[[Response, bytes], bool]]) -> Response:
+        for _ in range(MAX_REDIRECTS + 1):
+            response = await self._send(method, url, headers, body_limit, stop)
+            location = response.header("location")
+            if response.status not in REDIRECT_STATUSES or not location:
+                return response
+            url = urljoin(url, location.strip())
+            if response.status == 303 and method != "HEAD":
+                method = "GET"
+        raise HTTPError(f"More than {MAX_REDIRECTS} redirects")
+
+    def _host(self, key: Tuple[str, str, int]) -> _Host:
+        host = self._hosts.get(key)
+        if host is None:
+            host = self._hosts[key] = _Host(self.per_host, self.interval)
+        return host
+
+    async def _connect(self, key: Tuple[str, str, int]) -> _Connection:
+        scheme, hostname, port = key
+        if self.connect_to is not None:
+            reader, writer = await asyncio.open_connection(*self.connect_to)
+        elif scheme == "https":
+            if self._ssl is None:
+                self._ssl = ssl.create_default_context()
+            reader, writer = await asyncio.open_connection(hostname, port, ssl=self._ssl, server_hostname=hostname)
+        else:
+            reader, writer = await asyncio.open_connection(hostname, port)
+        self.connections_opened += 1
+        return _Connection(reader, writer, key)
+
+    def _release(self, connection: _Connection) -> None:
+        """Keep a connection for reuse, closing the least recently used idle one if there are too many."""
+        self._host(connection.key).idle.append(connection)
+        self._idle[connection] = None
+        while len(self._idle) > self.max_idle:
+            oldest, _ = self._idle.popitem(last=False)
+            self._hosts[oldest.key].idle.remove(oldest)
+            oldest.close()
+
+    async def _send(self, method: str, url: str, headers: Optional[Dict[str, str]], body_limit: int,
+                    stop: Optional[Callable[[Response, bytes], bool]]) -> Response:
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise HTTPError(f"Unsupported URL: {url}")
+        default_port = 443 if parts.scheme == "https" else 80
+        port = parts.port or default_port
+        key = (parts.scheme, parts.hostname.lower(), port)
+        hostname = f"[{parts.hostname}]" if ":" in parts.hostname else parts.hostname
+        target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        request_headers = {"Host": hostname + (f":{port}" if port != default_port else ""),
+                           "User-Agent": self.user_agent, "Accept": "*/*", "Accept-Encoding": "identity"}
+        request_headers.update(headers or {})
+        lines = [f"{method} {target} HTTP/1.1"]
+        lines.extend(f"{name}: {value}" for name, value in request_headers.items())
+        data = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+        host = self._host(key)
+        async with host.slots:
+            await host.pace()
+            # Waiting for a slot or the rate limit does not count towards the timeout
+            return await asyncio.wait_for(self._exchange(host, key, data, method, url, body_limit, stop),
+                                          self.timeout)
+
+    async def _exchange(self, host: _Host, key: Tuple[str, str, int], data: bytes, method: str, url: str,
+                        body_limit: int, stop: Optional[Callable[[Response, bytes], bool]]) -> Response:
+        """Send a request on an idle or new connection to the host and read the response."""
+        while True:
+            connection, reused = None, False
+            while host.idle and connection is None:
+                connection = host.idle.pop()
+                del self._idle[connection]
+                if connection.reader.at_eof():
+                    connection.close()
+                    connection = None
+                else:
+                    reused = True
+            if connection is None:
+                connection = await self._connect(key)
+            try:
+                connection.writer.write(data)
+                await connection.writer.drain()
+                status_line = await connection.reader.readline()
+                if not status_line:
+                    raise ConnectionResetError("Connection closed without a response")
+            except (ConnectionError, asyncio.IncompleteReadError):
+                connection.close()
+                if reused:
+                    continue  # The server closed the idle connection meanwhile; retry on a new one
+                raise
+            except BaseException:
+                connection.close()
+                raise
+            break
+
+        try:
+            response, keep_alive = await self._read_response(connection, status_line, method, url, body_limit, stop)
+        except BaseException:
+            connection.close()
+            raise
+        if keep_alive:
+            self._release(connection)
+        else:
+            connection.close()
+        return response
+
+    async def _read_response(self, connection: _Connection, status_line: bytes, method: str, url: str,
+                             body_limit: int, stop: Optional[Callable[[Response, bytes], bool]]) -> Tuple[Response, bool]:
+        """Parse a response after its status line; returns it and whether the connection can be reused."""
+        version, _, rest = status_line.decode("latin-1").strip().partition(" ")
+        code, _, reason = rest.partition(" ")
+        if not version.startswith("HTTP/") or not code.isdigit():
+            raise HTTPError(f"Invalid status line: {status_line[:80]!r}")
+        headers: Dict[str, str] = {}
+        reader = connection.reader
+        for _ in range(MAX_HEADERS):
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            name = name.strip().lower()
+            # Repeated headers are joined as in RFC 9110
+            headers[name] = f"{headers[name]}, {value.strip()}" if name in headers else value.strip()
+        else:
+            raise HTTPError("Too many response headers")
+
+        response = Response(int(code), reason, headers, url)
+        connection_header = headers.get("connection", "").lower()
+        keep_alive = "close" not in connection_header and (version != "HTTP/1.0" or "keep-alive" in connection_header)
+        if method == "HEAD" or response.status in (204, 304) or 100 <= response.status < 200:
+            return response, keep_alive
+
+        body = bytearray()
+
+        def take(chunk: bytes) -> bool:
+            """Keep a chunk; returns False once reading should end."""
+            if len(body) < body_limit:
+                body.extend(chunk[:body_limit - len(body)])
+            if (stop is not None and stop(response, chunk)) or len(body) >= body_limit:
+                response.complete = False
+                return False
+            return True
+
+        if "chunked" in headers.get("transfer-encoding", "").lower():
+            while True:
+                size_line = await reader.readline()
+                size = int(size_line.split(b";")[0].strip() or b"0", 16)
+                if size == 0:
+                    while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                        pass  # Trailers
+                    break
+                chunk = await reader.readexactly(size)
+                await reader.readexactly(2)
+                if not take(chunk):
+                    keep_alive = False
+                    break
+        elif "content-length" in headers:
+            remaining = int(headers["content-length"])
+            while remaining > 0:
+                chunk = await reader.read(min(remaining, READ_SIZE))
+                if not chunk:
+                    raise asyncio.IncompleteReadError(bytes(body), remaining)
+                remaining -= len(chunk)
+                if not take(chunk):
+                    if remaining <= DRAIN_LIMIT:
+                        await reader.readexactly(remaining)
+                        remaining = 0
+                    break
+            if remaining:
+                keep_alive = False
+        else:
+            keep_alive = False  # The body ends when the connection does
+            while chunk := await reader.read(READ_SIZE):
+                if not take(chunk):
+                    break
+        response.body = bytes(body)
+        return response, keep_alive
@@ -1,8 +1,160 @@
+import io  # Used (parsing loaded file contents)
 import os
 import pprint
-from bs4 import BeautifulSoup
-from tkinter.filedialog import askopenfilename
-from tqdm import tqdm
+from collections import deque  # Used (bounded in-flight files)
+from concurrent.futures import ProcessPoolExecutor, Future  # Used (parallel parsing)
+from datetime import datetime  # Used (bookmark timestamps)
+from html.parser import HTMLParser  # Used (streaming bookmark parsing)
+from itertools import islice  # Used (batching)
+from typing import List, Dict, Any, Callable, Iterable, Iterator, Optional, TextIO, Tuple  # Used (type hints)
+from .csv_import import ImportStats, DEFAULT_BATCH_SIZE  # Used (batched imports)
+
+CHUNK_SIZE = 1 << 16
+FOLDER_SEPARATOR = "/"
+# Bookmarklets (javascript:), Firefox queries (place:), local files etc. are not imported
+WEB_SCHEMES = ("http://", "https://")
+
+
+def _timestamp(value: Optional[str]) -> Optional[str]:
+    """Convert an ADD_DATE/LAST_MODIFIED attribute (Unix time) to ISO format, or None."""
+    try:
+        seconds = int(value)
+    except (TypeError, ValueError):
+        return None
+    # Some browsers write milliseconds or microseconds
+    if seconds > 10 ** 14:
+        seconds //= 1_000_000
+    elif seconds > 10 ** 11:
+        seconds //= 1000
+    try:
+        return datetime.fromtimestamp(seconds).isoformat()
+    except (OverflowError, OSError, ValueError):
+        return None
+
+
+class BookmarkParser(HTMLParser):
+    """
+    Event-driven parser for Netscape bookmark files, the HTML format every major browser exports.
+
+    Calls on_bookmark with a link record as soon as a bookmark is complete, so memory use
+    does not depend on the size of the file. The folders (<H3>) enclosing a bookmark are
+    joined with "/" into one category that keeps the full hierarchy, e.g.
+    "Bookmarks bar/Dev/Python". TAGS attributes (Firefox) become tags and the bookmark
+    title, followed by its <DD> note if there is one, the description.
+    """
+
+    def __init__(self, on_bookmark: Callable[[Dict[str, Any]], None]):
+        super().__init__(convert_charrefs=True)
+        self.on_bookmark = on_bookmark
+        self.skipped = 0
+        self._folders: List[Optional[str]] = []  # One entry per open <DL>
+        self._folder_name: Optional[str] = None  # Last <H3>, names the next <DL>
+        self._element: Optional[str] = None  # Element whose text is being collected
+        self._text: List[str] = []
+        self._bookmark: Optional[Dict[str, Any]] = None  # Complete except for a possible <DD>
+
+    def _collect(self, element: str) -> None:
+        self._element = element
+        self._text = []
+
+    def _collected(self) -> str:
+        self._element = None
+        return " ".join("".join(self._text).split())
+
+    def _flush(self) -> None:
+        """Emit the pending bookmark, with the <DD> text collected so far."""
+        if self._element == "dd":
+            note = self._collected()
+            if self._bookmark is not None and note:
+                title = self._bookmark["description"]
+                self._bookmark["description"] = f"{title} - {note}" if title else note
+        if self._bookmark is not None:
+            self.on_bookmark(self._bookmark)
+            self._bookmark = None
+
+    def _start_bookmark(self, attributes: Dict[str, Optional[str]]) -> None:
+        url = (attributes.get("href") or "").strip()
+        if not url.lower().startswith(WEB_SCHEMES):
+            self.skipped += 1
+            return
+
+        folders = FOLDER_SEPARATOR.join(name for name in self._folders if name)
+        tags = attributes.get("tags") or ""
+        bookmark = {
+            "url": url,
+            "description": "",
+            "categories": [folders] if folders else [],
+            "tags": [tag.strip() for tag in tags.split(",") if tag.strip()],
+        }
+        created = _timestamp(attributes.get("add_date"))
+        if created:
+            bookmark["created_at"] = created
+            bookmark["last_updated"] = _timestamp(attributes.get("last_modified")) or created
+        self._bookmark = bookmark
+        self._collect("a")
+
+    def handle_starttag(self, tag: str, attrs: List) -> None:
+        if tag == "dd":
+            self._collect("dd")
+            return
+        if tag not in ("dt", "dl", "h3", "a"):
+            return
+
+        self._flush()
+        if tag == "dl":
+            self._folders.append(self._folder_name)
+            self._folder_name = None
+        elif tag == "h3":
+            self._collect("h3")
+        elif tag == "a":
+            self._start_bookmark(dict(attrs))
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag == "h3" and self._element == "h3":
+            self._folder_name = self._collected()
+        elif tag == "a" and self._element == "a":
+            self._bookmark["description"] = self._collected()
+        elif tag == "dl":
+            self._flush()
+            if self._folders:
+                self._folders.pop()
+
+    def handle_data(self, data: str) -> None:
+        if self._element is not None:
+            self._text.append(data)
+
+    def close(self) -> None:
+        super().close()
+        self._flush()
+
+
+def parse_bookmark_file(file_path: str) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Parse a whole bookmark file; returns (link records, number of skipped entries).
+    Module-level so it can run in a worker process.
+    """
+    stats = ImportStats()
+    with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+        records = list(iter_bookmarks(f, stats))
+    return records, stats.skipped
+
+
+def iter_bookmarks(f: TextIO, stats: Optional[ImportStats] = None,
+                   chunk_size: int = CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the link records of a bookmark file, reading it chunk_size characters at a time.
+    Entries that are not web links are counted in stats.skipped.
+    """
+    ready: List[Dict[str, Any]] = []
+    parser = BookmarkParser(ready.append)
+    while chunk := f.read(chunk_size):
+        parser.feed(chunk)
+        yield from ready
+        ready.clear()
+    parser.close()
+    yield from ready
+    if stats is not None:
+        stats.skipped += parser.skipped
 
 #TODO: Integrate the import handler into app
 #TODO: Test / Expand functionality for different browsers (currently tested for chromium based html bookmark files)
@@ -11,17 +163,22 @@ class ImportHandler:
         self.filename:str or None = None
         self.filecontent:str or None = None
         self.imported_data:list or None = None
-        
-        self.progress_bar_stack: list = [self.get_filename, 
-                                        self.load_file, 
-                                        self.parse_html_file]
 
-    def f_import(self) -> list:
-        for ps in tqdm(self.progress_bar_stack):
-            ps()
-        return self.imported_data
+    def f_import(self, file_path: str = None) -> list:
+        """
+        Parse a bookmark file into blocks (see parse_html_file).
+        Without file_path the file is chosen in a file dialog.
+        """
+        if file_path:
+            self.filename = file_path
+            self.filecontent = None
+        else:
+            self.get_filename()
+        return self.parse_html_file()
 
     def get_filename(self) -> str:
+        # Imported here so that headless use does not need tkinter
+        from tkinter.filedialog import askopenfilename
         initial_dir = os.path.expanduser("~/Downloads")
         file_types = [("HTML Files", "*.html")]
         filename = askopenfilename(filetypes=file_types, 
@@ -40,21 +197,24 @@ class ImportHandler:
         return self.filecontent
     
     def parse_html_file(self) -> list:
-        soup = BeautifulSoup(self.filecontent, 'lxml')
-
+        """
+        Group the bookmarks into blocks of consecutive links sharing a folder.
+        Uses the loaded file content if there is any, otherwise streams the file.
+        """
         blocks = []
         current_block = {'header': None, 'links': []}
 
-        for tag in tqdm(soup.find_all(['h3', 'a'])):
-            if tag.name == 'h3':
+        source = io.StringIO(self.filecontent) if self.filecontent is not None else self.filename
+        for bookmark in self._records(source):
+            header = bookmark['categories'][0] if bookmark['categories'] else None
+            if header != current_block['header']:
                 if current_block['header'] and current_block['links']:
                     blocks.append(current_block)
-                current_block = {'header': tag.text.strip(), 'links': []}
-            elif tag.name == 'a':
-                current_block['links'].append({
-                    'url': tag['href'],
-                    'text': tag.text.strip(),
-                })
+                current_block = {'header': header, 'links': []}
+            current_block['links'].append({
+                'url': bookmark['url'],
+                'text': bookmark['description'],
+            })
 
         # Don't forget the last block
         if current_block['header'] and current_block['links']:
@@ -63,6 +223,95 @@ class ImportHandler:
         self.imported_data = blocks
         return blocks
 
+    @staticmethod
+    def _records(source: Any, stats: Optional[ImportStats] = None) -> Iterator[Dict[str, Any]]:
+        """Stream the bookmarks of a path or a (text or binary) file object."""
+        if hasattr(source, "read"):
+            if not isinstance(source.read(0), bytes):
+                yield from iter_bookmarks(source, stats)
+                return
+            text = io.TextIOWrapper(source, encoding='utf-8', errors='replace')
+            try:
+                yield from iter_bookmarks(text, stats)
+            finally:
+                text.detach()  # Leave the caller's file open
+        else:
+            with open(source, 'r', encoding='utf-8', errors='replace') as f:
+                yield from iter_bookmarks(f, stats)
+
+    def import_into(self, manager: Any, source: Any = None, batch_size: int = DEFAULT_BATCH_SIZE,
+                    progress: Optional[Callable[[ImportStats], None]] = None) -> ImportStats:
+        """
+        Stream the bookmarks of one file (a path or file object, default: the selected
+        file) into a LinkManager. See import_files.
+        """
+        return self.import_files(manager, [source or self.filename], batch_size=batch_size, progress=progress)
+
+    def import_files(self, manager: Any, sources: Iterable[Any], workers: int = 0,
+                     batch_size: int = DEFAULT_BATCH_SIZE,
+                     progress: Optional[Callable[[ImportStats], None]] = None) -> ImportStats:
+        """
+        Import several bookmark files (paths or file objects) into a LinkManager, without any
+        user interaction, and return the combined ImportStats.
+
+        Links are added in batches of batch_size and in the order of sources, skipping URLs
+        that are already in the collection. With workers > 1, files given by path are parsed
+        concurrently in worker processes; file objects are always streamed in-process.
+        progress is called with the running stats after every batch. A file that cannot be
+        read is reported and counted in stats.errors, and the remaining files are imported.
+        """
+        stats = ImportStats()
+        for source, future in self._parsed(sources, workers):
+            try:
+                if future is None:
+                    records = self._records(source, stats)
+                else:
+                    parsed, skipped = future.result()
+                    stats.skipped += skipped
+                    records = iter(parsed)
+                while batch := list(islice(records, batch_size)):
+                    self._add_batch(manager, batch, stats, progress)
+                stats.files += 1
+                if isinstance(source, (str, os.PathLike)):
+                    self.filename = os.fspath(source)
+            except (OSError, UnicodeError, ValueError) as e:
+                stats.errors += 1
+                print(f"Error importing {getattr(source, 'name', source)}: {e}")
+        return stats
+
+    @staticmethod
+    def _parsed(sources: Iterable[Any], workers: int) -> Iterator[Tuple[Any, Optional[Future]]]:
+        """
+        Yield (source, future) in order. With workers > 1 the future parses a path in a
+        worker process; otherwise it is None and the source is streamed by the caller.
+        """
+        if workers <= 1:
+            for source in sources:
+                yield source, None
+            return
+
+        # Keep a bounded number of parsed files in flight, like the CSV import
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending = deque()
+            for source in sources:
+                is_path = isinstance(source, (str, os.PathLike))
+                pending.append((source, executor.submit(parse_bookmark_file, source) if is_path else None))
+                if len(pending) >= workers * 2:
+                    yield pending.popleft()
+            while pending:
+                yield pending.popleft()
+
+    @staticmethod
+    def _add_batch(manager: Any, batch: List[Dict[str, Any]], stats: ImportStats,
+                   progress: Optional[Callable[[ImportStats], None]]) -> None:
+        added, duplicates = manager._add_records(batch)
+        stats.rows += len(batch)
+        stats.batches += 1
+        stats.added += added
+        stats.duplicates += duplicates
+        if progress:
+            progress(stats)
+
     def show_import(self) -> None:
         for block in self.imported_data:
             print(f"Category: {block['header'].encode('cp1252', errors='replace').decode('cp1252')}")
@@ -76,6 +325,7 @@ class ImportHandler:
         
 
 if __name__ == '__main__':
+    import sys
     importer = ImportHandler()
-    data = importer.f_import()
+    data = importer.f_import(sys.argv[1] if len(sys.argv) > 1 else None)
     # importer.show_import()
\ No newline at end of file
@@ -0,0 +1,423 @@
+import re  # Used (tokenization)
+import heapq  # Used (top-k ranking)
+from collections import Counter  # Used (term frequencies)
+from math import log  # Used (BM25 idf)
+from typing import List, Dict, Set, Tuple, Iterable, Iterator, Optional, Any  # Used (type hints)
+from .fuzzy import VocabularyIndex  # Used (category and tag vocabularies)
+
+FIELDS = ("url", "description", "categories", "tags")
+# Fields holding lists of names, searched through their vocabulary
+NAME_FIELDS = ("categories", "tags")
+NGRAM_SIZE = 3
+
+# BM25 parameters and per-field weights: categories and tags are chosen by the
+# user, so a match there says more about a link than one in its URL
+BM25_K1 = 1.2
+BM25_B = 0.75
+FIELD_WEIGHTS = {"url": 1.0, "description": 1.0, "categories": 1.5, "tags": 2.0}
+DEFAULT_TOP_K = 20
+
+_TOKEN_RE = re.compile(r"\w+")
+_QUERY_RE = re.compile(r'"([^"]*)"?|(\S+)')
+
+
+def parse_query(text: str) -> List[Tuple[str, Tuple[str, ...]]]:
+    """
+    Split a ranked search query into clauses: ("term", (word,)), ("prefix", (start,))
+    for words ending in *, and ("phrase", words) for "quoted words".
+    """
+    clauses = []
+    for phrase, word in _QUERY_RE.findall(text.lower()):
+        if phrase:
+            tokens = tuple(_TOKEN_RE.findall(phrase))
+            if len(tokens) > 1:
+                clauses.append(("phrase", tokens))
+            elif tokens:
+                clauses.append(("term", tokens))
+        elif word:
+            tokens = _TOKEN_RE.findall(word)
+            if not tokens:
+                continue
+            clauses.extend(("term", (token,)) for token in tokens[:-1])
+            clauses.append(("prefix" if word.endswith("*") else "term", (tokens[-1],)))
+    return clauses
+
+
+def query_words(clauses: List[Tuple[str, Tuple[str, ...]]]) -> Set[str]:
+    """Every word of the clauses; a link can only match if a field contains one of them."""
+    return {token for _, tokens in clauses for token in tokens}
+
+
+def value_tokens(values: Iterable[str]) -> List[List[str]]:
+    """Tokens of each (lowercased) value of a field."""
+    return [_TOKEN_RE.findall(value) for value in values]
+
+
+def phrase_count(tokens: List[List[str]], phrase: Tuple[str, ...]) -> int:
+    """Number of times phrase appears as consecutive tokens within one of the values."""
+    size = len(phrase)
+    return sum(1 for value in tokens for i in range(len(value) - size + 1) if tuple(value[i:i + size]) == phrase)
+
+
+def add_clause_scores(scores: Dict[Any, float], weight: float, matches: List[Tuple[int, Dict[Any, int]]],
+                      lengths: Dict[Any, int], average: float, total: int) -> None:
+    """
+    Add the BM25 scores of one query clause in one field to scores.
+    matches holds (document frequency, term frequency per document) for each term the
+    clause matches (several for a prefix); a document gets the score of its best term.
+    lengths maps documents to their field length in tokens.
+    """
+    best: Dict[Any, float] = {}
+    for df, frequencies in matches:
+        idf = log(1 + (total - df + 0.5) / (df + 0.5))
+        for key, tf in frequencies.items():
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths[key] / average)
+            score = idf * tf * (BM25_K1 + 1) / (tf + norm)
+            if score > best.get(key, 0.0):
+                best[key] = score
+    for key, score in best.items():
+        scores[key] = scores.get(key, 0.0) + weight * score
+
+
+def top_k(scores: Dict[Any, float], k: int, position: Any) -> List[Tuple[Any, float]]:
+    """The k best (key, score) pairs, keeping collection order (position(key)) between ties."""
+    return heapq.nlargest(k, scores.items(), key=lambda item: (item[1], -position(item[0])))
+
+
+class _FieldLengths:
+    """Mapping view of one field's length in a table of per-document length tuples."""
+
+    def __init__(self, lengths: Dict[Any, Tuple[int, ...]], field_idx: int):
+        self._lengths = lengths
+        self._field_idx = field_idx
+
+    def __getitem__(self, key: Any) -> int:
+        return self._lengths[key][self._field_idx]
+
+
+class SearchIndex:
+    """
+    In-memory inverted index over the searchable fields of a link collection.
+
+    Every field keeps token postings and character n-gram postings of its lowercased
+    values. Searches answer the same case-insensitive substring test as a full scan,
+    but only verify a small candidate set instead of visiting every link.
+
+    Categories and tags are instead indexed by name: a term is resolved against the
+    vocabulary of distinct names (see VocabularyIndex), and the links are collected from
+    the postings of the matching names. similar_names finds names despite typos.
+    """
+
+    def __init__(self, links: Iterable[Any] = ()):
+        self._docs: Dict[int, Any] = {}
+        self._seq: Dict[int, int] = {}
+        self._values: Dict[int, Tuple[Tuple[str, ...], ...]] = {}
+        self._grams: Dict[str, Dict[str, Set[int]]] = {field: {} for field in FIELDS}
+        self._tokens: Dict[str, Dict[str, Set[int]]] = {field: {} for field in FIELDS}
+        self._short: Dict[str, Dict[str, Set[int]]] = {field: {} for field in FIELDS}
+        self._names: Dict[str, Dict[str, Set[int]]] = {field: {} for field in NAME_FIELDS}
+        self._vocabularies: Dict[str, VocabularyIndex] = {field: VocabularyIndex() for field in NAME_FIELDS}
+        # Ranking statistics: field lengths in tokens per document, their totals, and the
+        # term frequencies of tokens occurring more than once in a document's field
+        self._lengths: Dict[int, Tuple[int, ...]] = {}
+        self._token_total: Dict[str, int] = {field: 0 for field in FIELDS}
+        self._repeats: Dict[str, Dict[str, Dict[int, int]]] = {field: {} for field in FIELDS}
+        self._next_seq = 0
+
+        for link in links:
+            self.add(link)
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def __contains__(self, link: Any) -> bool:
+        return id(link) in self._docs
+
+    @staticmethod
+    def _extract(link: Any) -> Tuple[Tuple[str, ...], ...]:
+        """Lowercased values of every indexed field, one tuple per field."""
+        return (
+            (link.url.lower(),),
+            (link.description.lower(),),
+            tuple(cat.lower() for cat in link.categories),
+            tuple(tag.lower() for tag in link.tags),
+        )
+
+    def _post(self, key: int, values: Tuple[Tuple[str, ...], ...], add: bool,
+              field_indices: Iterable[int] = None) -> None:
+        """
+        Add or remove a document's postings for the given field values, of every field or
+        only of the fields at field_indices.
+        """
+        partial = field_indices is not None
+        lengths = list(self._lengths.get(key, (0,) * len(FIELDS))) if partial else []
+        for field_idx in (field_indices if partial else range(len(FIELDS))):
+            field = FIELDS[field_idx]
+            grams = self._grams[field]
+            tokens = self._tokens[field]
+            short = self._short[field]
+            names = self._names.get(field)
+            frequencies = Counter()
+
+            for value in values[field_idx]:
+                if names is not None:
+                    keys = [(names, value)]
+                    if add and value not in names:
+                        self._vocabularies[field].add(value)
+                    elif not add and names.get(value) == {key}:
+                        self._vocabularies[field].discard(value)
+                elif len(value) < NGRAM_SIZE:
+                    keys = [(short, value)]
+                else:
+                    keys = [(grams, value[i:i + NGRAM_SIZE]) for i in range(len(value) - NGRAM_SIZE + 1)]
+                found = _TOKEN_RE.findall(value)
+                frequencies.update(found)
+                keys.extend((tokens, token) for token in found)
+
+                for postings, term in keys:
+                    if add:
+                        postings.setdefault(term, set()).add(key)
+                    elif term in postings:
+                        docs = postings[term]
+                        docs.discard(key)
+                        if not docs:
+                            del postings[term]
+
+            length = sum(frequencies.values())
+            if partial:
+                lengths[field_idx] = length
+            else:
+                lengths.append(length)
+            self._token_total[field] += length if add else -length
+            repeats = self._repeats[field]
+            for token, count in frequencies.items():
+                if count < 2:
+                    continue
+                if add:
+                    repeats.setdefault(token, {})[key] = count
+                else:
+                    repeats[token].pop(key, None)
+                    if not repeats[token]:
+                        del repeats[token]
+
+        if add:
+            self._lengths[key] = tuple(lengths)
+        elif not partial:
+            self._lengths.pop(key, None)
+
+    def add(self, link: Any) -> None:
+        """Index a link. Links that are already indexed are re-indexed."""
+        key = id(link)
+        if key in self._docs:
+            self.update(link)
+            return
+
+        values = self._extract(link)
+        self._docs[key] = link
+        self._seq[key] = self._next_seq
+        self._next_seq += 1
+        self._values[key] = values
+        self._post(key, values, add=True)
+
+    def update(self, link: Any) -> None:
+        """Re-index a link after its fields changed; only the changed fields are re-posted."""
+        key = id(link)
+        if key not in self._docs:
+            self.add(link)
+            return
+
+        values = self._extract(link)
+        old_values = self._values[key]
+        if values == old_values:
+            return
+        changed = [field_idx for field_idx in range(len(FIELDS))
+                   if values[field_idx] != old_values[field_idx] and FIELDS[field_idx] not in NAME_FIELDS]
+        self._post(key, old_values, add=False, field_indices=changed)
+        self._values[key] = values
+        self._post(key, values, add=True, field_indices=changed)
+        for field in NAME_FIELDS:
+            field_idx = FIELDS.index(field)
+            if values[field_idx] != old_values[field_idx]:
+                self._update_names(key, field_idx, old_values[field_idx], values[field_idx])
+
+    def _update_names(self, key: int, field_idx: int, old: Tuple[str, ...], new: Tuple[str, ...]) -> None:
+        """Re-post a changed category/tag field, touching only the names and tokens that differ."""
+        field = FIELDS[field_idx]
+        names, tokens, vocabulary = self._names[field], self._tokens[field], self._vocabularies[field]
+        old_set, new_set = set(old), set(new)
+        for value in old_set - new_set:
+            docs = names.get(value)
+            if docs is not None:
+                docs.discard(key)
+                if not docs:
+                    del names[value]
+                    vocabulary.discard(value)
+        for value in new_set - old_set:
+            if value not in names:
+                vocabulary.add(value)
+            names.setdefault(value, set()).add(key)
+
+        # Tokens never span the joining spaces
+        old_frequencies = Counter(_TOKEN_RE.findall(" ".join(old)))
+        new_frequencies = Counter(_TOKEN_RE.findall(" ".join(new)))
+        for token in old_frequencies.keys() - new_frequencies.keys():
+            docs = tokens.get(token)
+            if docs is not None:
+                docs.discard(key)
+                if not docs:
+                    del tokens[token]
+        for token in new_frequencies.keys() - old_frequencies.keys():
+            tokens.setdefault(token, set()).add(key)
+
+        # Ranking statistics
+        length = sum(new_frequencies.values())
+        self._token_total[field] += length - sum(old_frequencies.values())
+        lengths = list(self._lengths[key])
+        lengths[field_idx] = length
+        self._lengths[key] = tuple(lengths)
+        repeats = self._repeats[field]
+        for token, count in old_frequencies.items():
+            if count > 1 and new_frequencies[token] < 2:
+                repeats[token].pop(key, None)
+                if not repeats[token]:
+                    del repeats[token]
+        for token, count in new_frequencies.items():
+            if count > 1:
+                repeats.setdefault(token, {})[key] = count
+
+    def remove(self, link: Any) -> None:
+        """Drop a link from the index."""
+        key = id(link)
+        if key not in self._docs:
+            return
+
+        self._post(key, self._values.pop(key), add=False)
+        del self._docs[key]
+        del self._seq[key]
+
+    def values(self, link: Any) -> Optional[Tuple[Tuple[str, ...], ...]]:
+        """The indexed (lowercased) field values of a link, or None if it is not indexed."""
+        return self._values.get(id(link))
+
+    def search(self, field: str, term: str) -> Set[int]:
+        """Return the keys of all links whose field contains term (case-insensitive)."""
+        if field not in self._grams:
+            return set()
+
+        field_idx = FIELDS.index(field)
+        term = term.lower()
+
+        if not term:
+            return {key for key, values in self._values.items() if values[field_idx]}
+
+        if field in self._names:
+            return self.name_keys(field, self._vocabularies[field].containing(term))
+
+        if len(term) >= NGRAM_SIZE:
+            grams = self._grams[field]
+            postings = []
+            for gram in {term[i:i + NGRAM_SIZE] for i in range(len(term) - NGRAM_SIZE + 1)}:
+                docs = grams.get(gram)
+                if not docs:
+                    return set()
+                postings.append(docs)
+
+            postings.sort(key=len)
+            candidates = postings[0].intersection(*postings[1:])
+            if len(term) == NGRAM_SIZE:
+                return candidates
+            return {
+                key for key in candidates
+                if any(term in value for value in self._values[key][field_idx])
+            }
+
+        # Short terms: every occurrence lies inside a single token (for word terms)
+        # or inside a single n-gram / short value, so the union is already exact.
+        result: Set[int] = set()
+        if _TOKEN_RE.fullmatch(term):
+            for token, docs in self._tokens[field].items():
+                if term in token:
+                    result |= docs
+            return result
+
+        for gram, docs in self._grams[field].items():
+            if term in gram:
+                result |= docs
+        for value, docs in self._short[field].items():
+            if term in value:
+                result |= docs
+        return result
+
+    def rank(self, query: str, k: int = DEFAULT_TOP_K, total: Optional[int] = None) -> List[Tuple[float, Any]]:
+        """
+        Return the k links most relevant to query as (score, link), best first.
+
+        Links are scored with BM25 over the tokens of each field, weighted by FIELD_WEIGHTS,
+        and summed over the query's clauses (see parse_query), so links matching more of
+        the query rank higher. A prefix clause scores its best-matching expansion. Ties
+        keep collection order. total overrides the collection size used for the inverse
+        document frequency, for indexes built over a subset of the links.
+        """
+        clauses = parse_query(query)
+        count = len(self._docs)
+        if not clauses or not count or k <= 0:
+            return []
+        total = max(total or count, count)
+        scores: Dict[int, float] = {}
+
+        for field_idx, field in enumerate(FIELDS):
+            postings = self._tokens[field]
+            repeats = self._repeats[field]
+            lengths = _FieldLengths(self._lengths, field_idx)
+            average = self._token_total[field] / count or 1.0
+            for kind, words in clauses:
+                # (document frequency, term frequency per document) for each term the clause matches
+                matches: List[Tuple[int, Dict[int, int]]] = []
+                if kind == "phrase":
+                    frequencies = {}
+                    for key in set.intersection(*(postings.get(word, set()) for word in words)):
+                        tf = phrase_count(value_tokens(self._values[key][field_idx]), words)
+                        if tf:
+                            frequencies[key] = tf
+                    matches.append((len(frequencies), frequencies))
+                else:
+                    word = words[0]
+                    expansions = [token for token in postings if token.startswith(word)] if kind == "prefix" else [word]
+                    for token in expansions:
+                        docs = postings.get(token)
+                        if docs:
+                            counts = repeats.get(token, {})
+                            matches.append((len(docs), {key: counts.get(key, 1) for key in docs}))
+                add_clause_scores(scores, FIELD_WEIGHTS[field], matches, lengths, average, total)
+
+        return [(score, self._docs[key]) for key, score in top_k(scores, k, self._seq.__getitem__)]
+
+    def similar_names(self, field: str, term: str, max_edits: Optional[int] = None) -> List[str]:
+        """
+        Category or tag names (lowercased) that are, or contain a word that is, within a
+        few typos of term, closest first (see VocabularyIndex.similar).
+        """
+        if field not in self._vocabularies:
+            return []
+        return [name for name, _ in self._vocabularies[field].similar(term.lower(), max_edits)]
+
+    def name_keys(self, field: str, names: Iterable[str]) -> Set[int]:
+        """Return the keys of all links with any of the given (lowercased) category or tag names."""
+        postings = self._names[field]
+        result: Set[int] = set()
+        for name in names:
+            result |= postings.get(name, set())
+        return result
+
+    def all_keys(self) -> Set[int]:
+        """Return the keys of every indexed link."""
+        return set(self._docs)
+
+    def resolve(self, keys: Iterable[int]) -> List[Any]:
+        """Map result keys back to links, in the order they were indexed."""
+        return list(self.iter_resolve(keys))
+
+    def iter_resolve(self, keys: Iterable[int]) -> Iterator[Any]:
+        """Like resolve, but yields the links one at a time."""
+        docs = self._docs
+        return (docs[key] for key in sorted(keys, key=self._seq.__getitem__))
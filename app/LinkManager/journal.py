@@ -0,0 +1,102 @@
+import os  # Used (file operations)
+import json  # Used (record encoding)
+from typing import List, Dict, Optional, Any  # Used (type hints)
+
+DEFAULT_COMPACT_THRESHOLD = 1024 * 1024  # Bytes of journal before the snapshot is rewritten
+
+
+class Journal:
+    """
+    Append-only log of link mutations stored next to the database file.
+
+    Every entry is a single JSON line carrying a sequence number and one operation:
+        {"seq": 7, "op": "add", "link": {...}}
+        {"seq": 8, "op": "update", "id": "9f86d081884c7d65", "link": {...}}
+        {"seq": 9, "op": "remove", "id": "9f86d081884c7d65"}
+    Links are addressed by their persistent id.
+    The snapshot records the last sequence number it contains ("journal_seq"),
+    so entries that were already folded into it are skipped on replay.
+    """
+
+    def __init__(self, db_path: str, compact_threshold: int = DEFAULT_COMPACT_THRESHOLD):
+        self.path = f"{db_path}.journal"
+        self.compact_threshold = compact_threshold
+
+    def size(self) -> int:
+        """Current size of the journal file in bytes."""
+        try:
+            return os.path.getsize(self.path)
+        except OSError:
+            return 0
+
+    def needs_compaction(self) -> bool:
+        """Whether the journal has grown past the compaction threshold."""
+        return self.size() >= self.compact_threshold
+
+    def append(self, entries: List[Dict[str, Any]]) -> None:
+        """Durably append entries to the journal."""
+        if not entries:
+            return
+        payload = "".join(json.dumps(entry, separators=(",", ":")) + "\n" for entry in entries)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def read(self, after_seq: int = 0) -> List[Dict[str, Any]]:
+        """
+        Read all entries newer than after_seq.
+        A torn trailing line (e.g. from a crash mid-write) is dropped and truncated away.
+        """
+        if not os.path.exists(self.path):
+            return []
+
+        entries = []
+        good_offset = 0
+        with open(self.path, "rb") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break
+                good_offset += len(line)
+                if entry.get("seq", 0) > after_seq:
+                    entries.append(entry)
+
+        if good_offset < self.size():
+            with open(self.path, "r+b") as f:
+                f.truncate(good_offset)
+        return entries
+
+    def clear(self) -> None:
+        """Remove the journal, typically after its entries were folded into a snapshot."""
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    @staticmethod
+    def apply(links: List[Dict[str, Any]], entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Apply journal entries, in order, to a list of link dictionaries."""
+        positions: Optional[Dict[str, int]] = None  # id -> position, built on first use
+        removed = False
+        for entry in entries:
+            op = entry.get("op")
+            if op == "add":
+                links.append(entry["link"])
+                if positions is not None:
+                    positions[entry["link"].get("id")] = len(links) - 1
+            elif op in ("update", "remove"):
+                if positions is None:
+                    positions = {link.get("id"): i for i, link in enumerate(links) if link is not None}
+                position = positions.get(entry["id"])
+                if position is None:
+                    continue
+                if op == "update":
+                    links[position] = entry["link"]
+                elif op == "remove":
+                    # Leave a hole instead of shifting every later position
+                    links[position] = None
+                    del positions[entry["id"]]
+                    removed = True
+        if removed:
+            links[:] = [link for link in links if link is not None]
+        return links
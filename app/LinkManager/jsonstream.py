@@ -0,0 +1,140 @@
+import re  # Used (whitespace skipping)
+import json  # Used (decoding values)
+from typing import Dict, Any, Callable, TextIO  # Used (type hints)
+
+CHUNK_SIZE = 1 << 20
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = re.compile(r"\s*")
+
+
+class _StreamReader:
+    """Incremental reader over a text file that decodes one JSON value at a time."""
+
+    def __init__(self, f: TextIO):
+        self.f = f
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self, size: int = CHUNK_SIZE) -> None:
+        chunk = self.f.read(max(size, CHUNK_SIZE))
+        if not chunk:
+            self.eof = True
+            return
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+
+    def _skip_whitespace(self) -> None:
+        while True:
+            self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf) or self.eof:
+                return
+            self._fill()
+
+    def next_char(self) -> str:
+        """Consume and return the next non-whitespace character."""
+        self._skip_whitespace()
+        if self.pos >= len(self.buf):
+            raise json.JSONDecodeError("Unexpected end of data", self.buf, self.pos)
+        char = self.buf[self.pos]
+        self.pos += 1
+        return char
+
+    def peek(self) -> str:
+        char = self.next_char()
+        self.pos -= 1
+        return char
+
+    def expect(self, expected: str) -> None:
+        if self.next_char() != expected:
+            raise json.JSONDecodeError(f"Expecting '{expected}'", self.buf, self.pos - 1)
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value, reading more data as needed."""
+        self._skip_whitespace()
+        while True:
+            try:
+                obj, end = _decoder.raw_decode(self.buf, self.pos)
+                # A number at the end of the buffer may continue in the next chunk
+                if end < len(self.buf) or self.eof:
+                    self.pos = end
+                    return obj
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            # Grow geometrically so very large values are not re-scanned too often
+            self._fill(len(self.buf))
+            if self.eof and self.pos >= len(self.buf):
+                raise json.JSONDecodeError("Unexpected end of data", self.buf, self.pos)
+
+
+def _read_array(reader: _StreamReader, append: Callable[[Any], None]) -> None:
+    """Decode the elements of a JSON array whose '[' was already consumed."""
+    if reader.peek() == "]":
+        reader.next_char()
+        return
+
+    raw_decode = _decoder.raw_decode
+    skip = _WHITESPACE.match
+    while True:
+        # Fast path: decode every element that is completely inside the buffer
+        buf, pos = reader.buf, reader.pos
+        limit = len(buf)
+        while True:
+            pos = skip(buf, pos).end()
+            try:
+                obj, end = raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                break
+            pos = skip(buf, end).end()
+            if pos >= limit:
+                break
+            append(obj)
+            separator = buf[pos]
+            reader.pos = pos + 1
+            if separator == "]":
+                return
+            if separator != ",":
+                raise json.JSONDecodeError("Expecting ',' delimiter", buf, pos)
+            pos += 1
+
+        # Slow path: the next element straddles the end of the buffer
+        append(reader.value())
+        separator = reader.next_char()
+        if separator == "]":
+            return
+        if separator != ",":
+            raise json.JSONDecodeError("Expecting ',' delimiter", reader.buf, reader.pos - 1)
+
+
+def read_database(f: TextIO) -> Dict[str, Any]:
+    """
+    Stream-parse a database file object ({"links": [...], ...}).
+
+    Link records are decoded one at a time, so the raw file is never held in memory
+    as a whole.
+    """
+    reader = _StreamReader(f)
+    data: Dict[str, Any] = {}
+
+    reader.expect("{")
+    if reader.peek() == "}":
+        reader.next_char()
+        return data
+
+    while True:
+        key = reader.value()
+        reader.expect(":")
+        if key == "links" and reader.peek() == "[":
+            reader.next_char()
+            links = data["links"] = []
+            _read_array(reader, links.append)
+        else:
+            data[key] = reader.value()
+
+        separator = reader.next_char()
+        if separator == "}":
+            return data
+        if separator != ",":
+            raise json.JSONDecodeError("Expecting ',' delimiter", reader.buf, reader.pos - 1)
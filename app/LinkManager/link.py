@@ -1,14 +1,79 @@
 import os  # Used (file operations, paths)
 import json  # Used (database operations)
-import csv  # Used (import/export functions)
 from termcolor import colored  # Used (output formatting)
-import shutil  # Used (backup operations)
-from typing import List, Dict, Optional, Any  # Used (type hints)
+import shutil  # Used (preserving corrupted databases)
+import secrets  # Used (link ids)
+from datetime import datetime, timedelta  # Used (timestamps)
+from collections import Counter  # Used (batched registry updates)
+from collections.abc import MutableSequence  # Used (lazy link list)
+from typing import List, Dict, Set, Optional, Any, Iterable, Iterator, Tuple  # Used (type hints)
+from .jsonstream import read_database  # Used (streaming database reads)
+from .index import SearchIndex, FIELDS, NAME_FIELDS, DEFAULT_TOP_K, parse_query  # Used (query, advanced and ranked search)
+from .cache import QueryCache, DEFAULT_CACHE_SIZE  # Used (query result cache)
+from .journal import Journal, DEFAULT_COMPACT_THRESHOLD  # Used (journaled storage)
+from .backup import BackupStore, RetentionPolicy, DEFAULT_BACKUP_INTERVAL  # Used (backup operations)
+from .vocabulary import VOCABULARY, Registry, Postings  # Used (interned categories and tags)
+from .urlnorm import canonical_url, UrlIndex  # Used (duplicate detection)
+from .csv_import import CSVImportPipeline, ImportStats, DEFAULT_BATCH_SIZE  # Used (bulk CSV import)
+from .importh import ImportHandler  # Used (browser bookmark import)
+from .export import write_export, EXPORT_FORMATS, DEFAULT_EXTENSIONS  # Used (streaming export)
+from .diskindex import DiskIndex, index_path, database_fingerprint, write_index, update_index  # Used (persistent index)
+from .locking import DatabaseLock  # Used (multi-process access)
+from .render import Renderer, window, link_entry, link_url  # Used (buffered listings)
+from .bulk import BulkChange, BulkCounts, BulkSummary, clean_names  # Used (bulk updates, renames)
+from .linkcheck import (LinkCheck, LinkChecker, BackgroundCheck, CheckSummary, check_targets,
+                        DEFAULT_CONCURRENCY)  # Used (link health checks)
+from .enrich import MetadataFetcher, PageCache, PageMetadata, EnrichSummary, CHECKPOINT, DEFAULT_TTL  # Used (descriptions from pages)
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _compact_timestamp(value: str) -> Any:
+    """Store an ISO timestamp as integer microseconds since the epoch if it round-trips exactly."""
+    try:
+        parsed = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return value
+    if parsed.tzinfo is not None or parsed.isoformat() != value:
+        return value
+    return (parsed - _EPOCH) // timedelta(microseconds=1)
+
+
+def _expand_timestamp(value: Any) -> str:
+    """Inverse of _compact_timestamp."""
+    if isinstance(value, int):
+        return (_EPOCH + timedelta(microseconds=value)).isoformat()
+    return value
+
+
+def report_similar_names(attribute: str, term: str, names: List[str]) -> None:
+    """Tell the user that a category/tag term was replaced by similar names."""
+    print(colored(f"No {attribute} contain '{term}', showing {attribute} like: {', '.join(names)}", "yellow"))
+
+
+def typo_substitutions(groups: List[List[tuple]]) -> List[Tuple[str, str, List[str]]]:
+    """(field, term, similar names used instead) of the typo terms in a query's groups (see QueryCache.put)."""
+    return [(FIELDS[field_idx], term, list(names)) for group in groups for field_idx, term, names in group
+            if names is not None]
+
+
+def new_link_id() -> str:
+    """Random identifier for a new link; it is stored with the link and never changes."""
+    return secrets.token_hex(8)
+
 
 class Link:
     """
     Represents a hyperlink with associated metadata.
 
+    Links use __slots__ and keep their categories and tags as tuples of ids interned in
+    the shared VOCABULARY; the categories/tags properties return fresh lists of names, so
+    changes must be made through the Link methods or by assigning a new list.
+    With Link.compact_timestamps enabled, timestamps are kept as integer microseconds
+    internally; created_at/last_updated and to_dict always return ISO strings.
+    Every link gets a persistent random id, which stays valid while positions shift.
+    check holds the outcome of the last health check (a LinkCheck), or None.
+
     Args:
         url (str): The URL of the link.
         description (str, optional): Description of the link. Defaults to "".
@@ -16,40 +81,82 @@ class Link:
         tags (list[str], optional): Tags associated with the link. Defaults to [].
     """
 
+    __slots__ = ("id", "url", "description", "_category_ids", "_tag_ids", "_created", "_updated",
+                 "_rowid", "check")  # _rowid: row id used by the SQLite backend
+
+    compact_timestamps: bool = False
+
     def __init__(self, url: str, description: str = "", categories: List[str] = None, tags: List[str] = None):
+        self.id: str = new_link_id()
         self.url: str = self._validate_url(url)
         self.description: str = description or ""
-        self.categories: List[str] = categories or []
-        self.tags: List[str] = tags or []
-        self.created_at: str = self._get_timestamp()
-        self.last_updated: str = self.created_at
+        self.categories = categories or []
+        self.tags = tags or []
+        self.created_at = self._get_timestamp()
+        self._updated = self._created
+        self.check: Optional[LinkCheck] = None
     
+    @property
+    def categories(self) -> List[str]:
+        return VOCABULARY.names(self._category_ids)
+
+    @categories.setter
+    def categories(self, categories: List[str]) -> None:
+        self._category_ids = VOCABULARY.intern_all(categories)
+
+    @property
+    def tags(self) -> List[str]:
+        return VOCABULARY.names(self._tag_ids)
+
+    @tags.setter
+    def tags(self, tags: List[str]) -> None:
+        self._tag_ids = VOCABULARY.intern_all(tags)
+
+    @property
+    def created_at(self) -> str:
+        return _expand_timestamp(self._created)
+
+    @created_at.setter
+    def created_at(self, value: str) -> None:
+        self._created = _compact_timestamp(value) if self.compact_timestamps else value
+
+    @property
+    def last_updated(self) -> str:
+        return _expand_timestamp(self._updated)
+
+    @last_updated.setter
+    def last_updated(self, value: str) -> None:
+        self._updated = _compact_timestamp(value) if self.compact_timestamps else value
+
     def _validate_url(self, url: str) -> str:
         """Validate and standardize URLs."""
         url = url.strip()
         # Basic URL validation
-        if not (url.startswith('http://') or url.startswith('https://')):
+        if not url.lower().startswith(('http://', 'https://')):
             url = f'https://{url}'
         return url
     
     def _get_timestamp(self) -> str:
         """Get current timestamp in ISO format."""
-        from datetime import datetime
         return datetime.now().isoformat()
     
     def add_category(self, category: str) -> None:
         """Add a category to the link if it's not already present."""
         category = category.strip()
-        if category and category not in self.categories:
-            self.categories.append(category)
-            self._update_timestamp()
+        if category:
+            category_id = VOCABULARY.intern(category)
+            if category_id not in self._category_ids:
+                self._category_ids += (category_id,)
+                self._update_timestamp()
 
     def add_tags(self, *tags: str) -> None:
         """Add one or more tags to the link if they're not already present."""
         for tag in tags:
             tag = tag.strip()
-            if tag and tag not in self.tags:
-                self.tags.append(tag)
+            if tag:
+                tag_id = VOCABULARY.intern(tag)
+                if tag_id not in self._tag_ids:
+                    self._tag_ids += (tag_id,)
         self._update_timestamp()
 
     def update_url(self, new_url: str) -> None:
@@ -64,16 +171,22 @@ class Link:
 
     def remove_category(self, category: str) -> bool:
         """Remove a category from the link if it exists."""
-        if category in self.categories:
-            self.categories.remove(category)
+        category_id = VOCABULARY.lookup(category)
+        if category_id in self._category_ids:
+            ids = list(self._category_ids)
+            ids.remove(category_id)
+            self._category_ids = tuple(ids)
             self._update_timestamp()
             return True
         return False
 
     def remove_tag(self, tag: str) -> bool:
         """Remove a tag from the link if it exists."""
-        if tag in self.tags:
-            self.tags.remove(tag)
+        tag_id = VOCABULARY.lookup(tag)
+        if tag_id in self._tag_ids:
+            ids = list(self._tag_ids)
+            ids.remove(tag_id)
+            self._tag_ids = tuple(ids)
             self._update_timestamp()
             return True
         return False
@@ -82,13 +195,52 @@ class Link:
         """Update the last_updated timestamp."""
         self.last_updated = self._get_timestamp()
 
+    def merge(self, other: "Link") -> bool:
+        """
+        Fold a duplicate of this link into it: its categories and tags are added and its
+        description is used if this link has none. Returns True if anything changed.
+        """
+        category_ids = self._category_ids + tuple(
+            i for i in dict.fromkeys(other._category_ids) if i not in self._category_ids)
+        tag_ids = self._tag_ids + tuple(i for i in dict.fromkeys(other._tag_ids) if i not in self._tag_ids)
+        description = self.description or other.description
+        if (category_ids, tag_ids, description) == (self._category_ids, self._tag_ids, self.description):
+            return False
+        self._category_ids, self._tag_ids, self.description = category_ids, tag_ids, description
+        self._update_timestamp()
+        return True
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Link":
+        """
+        Build a link from its dictionary form (as stored in the database).
+        Timestamps are only generated for records that do not carry them.
+        """
+        link = cls.__new__(cls)
+        link.id = data.get("id") or new_link_id()
+        link.url = link._validate_url(data["url"])
+        link.description = data.get("description", "") or ""
+        link.categories = data.get("categories") or []
+        link.tags = data.get("tags") or []
+        if "created_at" in data and "last_updated" in data:
+            link.created_at = data["created_at"]
+            link.last_updated = data["last_updated"]
+        else:
+            now = link._get_timestamp()
+            link.created_at = data.get("created_at", now)
+            link.last_updated = data.get("last_updated", now)
+        check = data.get("check")
+        link.check = LinkCheck.from_dict(check) if check else None
+        return link
+
     def to_json(self) -> str:
         """Convert link to JSON string."""
         return json.dumps(self.to_dict())
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert link to dictionary."""
-        return {
+        data = {
+            "id": self.id,
             "url": self.url,
             "description": self.description,
             "categories": self.categories,
@@ -96,48 +248,487 @@ class Link:
             "created_at": self.created_at,
             "last_updated": self.last_updated
         }
+        if self.check is not None:
+            data["check"] = self.check.to_dict()
+        return data
 
     def __repr__(self) -> str:
         return f"Link(url='{self.url}'\ncategories:{self.categories}\ntags:{self.tags})\nDescription:\n{self.description}"
 
 
+class LinkList(MutableSequence):
+    """
+    Ordered list of links with O(1) lookup and removal by link id.
+
+    Entries are Link objects or, for lazily loaded databases, the raw database records,
+    which are only turned into Link objects the first time they are accessed. Removing
+    a link by id leaves a tombstone in its slot; tombstones are compacted away the next
+    time the list is accessed by position, or once they fill half of the slots.
+    """
+
+    def __init__(self, records: List[Any] = None):
+        self._items: List[Any] = records if records is not None else []
+        self._slots: Optional[Dict[str, int]] = None  # id -> slot, built on first use
+        self._dead = 0
+
+    @staticmethod
+    def _item_id(item: Any) -> str:
+        return item["id"] if isinstance(item, dict) else item.id
+
+    def _slot_map(self) -> Dict[str, int]:
+        if self._slots is None:
+            item_id = self._item_id
+            self._slots = {item_id(item): slot for slot, item in enumerate(self._items) if item is not None}
+        return self._slots
+
+    def _compact(self) -> None:
+        """Drop tombstones; positions shift, so the slot map is rebuilt on next use."""
+        if self._dead:
+            self._items = [item for item in self._items if item is not None]
+            self._dead = 0
+            self._slots = None
+
+    def _materialize(self, slot: int) -> Link:
+        item = self._items[slot]
+        if isinstance(item, dict):
+            item = Link.from_dict(item)
+            self._items[slot] = item
+        return item
+
+    def __len__(self) -> int:
+        return len(self._items) - self._dead
+
+    def __getitem__(self, index):
+        self._compact()
+        if isinstance(index, slice):
+            return [self._materialize(i) for i in range(*index.indices(len(self._items)))]
+        return self._materialize(index)
+
+    def __setitem__(self, index: int, link: Link) -> None:
+        self._compact()
+        old = self._items[index]
+        self._items[index] = link
+        if self._slots is not None:
+            self._slots.pop(self._item_id(old), None)
+            self._slots[link.id] = index % len(self._items)
+
+    def __delitem__(self, index: int) -> None:
+        self._compact()
+        del self._items[index]
+        self._slots = None
+
+    def insert(self, index: int, link: Link) -> None:
+        if index >= len(self):
+            self.append(link)
+            return
+        self._compact()
+        self._items.insert(index, link)
+        self._slots = None
+
+    def append(self, link: Link) -> None:
+        if self._slots is not None:
+            self._slots[link.id] = len(self._items)
+        self._items.append(link)
+
+    def extend(self, links: Iterable[Link]) -> None:
+        for link in links:
+            self.append(link)
+
+    def __iter__(self) -> Iterator[Link]:
+        items = self._items
+        for slot in range(len(items)):
+            item = items[slot]
+            if item is None:
+                continue
+            if isinstance(item, dict):
+                item = items[slot] = Link.from_dict(item)
+            yield item
+
+    def get(self, link_id: str) -> Optional[Link]:
+        """Return the link with the given id, or None."""
+        slot = self._slot_map().get(link_id)
+        return None if slot is None else self._materialize(slot)
+
+    def remove_id(self, link_id: str) -> Optional[Link]:
+        """Remove and return the link with the given id (None if there is none) in O(1)."""
+        slot = self._slot_map().pop(link_id, None)
+        if slot is None:
+            return None
+        link = self._materialize(slot)
+        self._items[slot] = None
+        self._dead += 1
+        if self._dead * 2 > len(self._items):
+            self._compact()
+        return link
+
+    def copy(self) -> List[Link]:
+        return list(self)
+
+    def raw(self) -> Iterator[Any]:
+        """Yield every entry as stored: a Link, or a dictionary if it was never accessed."""
+        return (item for item in self._items if item is not None)
+
+    def records(self) -> Iterator[Dict[str, Any]]:
+        """Yield every entry in dictionary form without materializing links."""
+        for item in self.raw():
+            yield item if isinstance(item, dict) else item.to_dict()
+
+
 class LinkManager:
     """
     Enhanced LinkManager class for managing a collection of links with associated categories and tags.
     Includes bulk operations, improved search, backup functionality, and more secure file handling.
+
+    With lazy=True, load_from_db keeps the parsed records and only builds Link objects
+    for the entries that are accessed, which keeps one-shot commands fast.
+
+    Links can be addressed by position (as shown in listings) or by their persistent id;
+    the *_by_id methods look links up and remove them in O(1).
+
+    With journaled=True, save_to_db appends the mutations made since the last save to a
+    journal next to the database instead of rewriting it, and only rewrites the snapshot
+    once the journal grows past compact_threshold bytes. Appending does not read the
+    database, so the database as saved is backed up on the first journaled save of a
+    session and then before every backup_interval-th append (and whenever the snapshot
+    is rewritten).
+
+    With persistent_index=True, save_to_db also keeps a search index file next to the
+    database (see DiskIndex), which query_index searches without loading the database.
+
+    enrich_descriptions fills in missing descriptions from the linked pages, caching what
+    it fetched in page_cache_file.
+
+    Query and advanced search results are kept in an LRU cache of cache_size entries
+    (see QueryCache), which the mutation hooks keep up to date.
+
+    Several processes can work on the same database: loads and saves hold a DatabaseLock,
+    and a save that finds the database changed since it was loaded re-applies only the
+    links changed in this process on top of the new state (see _rebase).
     """
 
-    def __init__(self, db_path: str):
-        self.links: List[Link] = []
-        self.categories: List[str] = []
-        self.tags: List[str] = []
+    def __init__(self, db_path: str, journaled: bool = False,
+                 compact_threshold: int = DEFAULT_COMPACT_THRESHOLD,
+                 retention: Optional[RetentionPolicy] = None, lazy: bool = False,
+                 persistent_index: bool = False, cache_size: int = DEFAULT_CACHE_SIZE,
+                 backup_interval: int = DEFAULT_BACKUP_INTERVAL):
+        self.links: LinkList = LinkList()
+        # Reference-counted category/tag registries, built from the links on first use
+        self._categories: Optional[Registry] = None
+        self._tags: Optional[Registry] = None
+        # Category/tag name -> link ids, built on the first rename or merge
+        self._postings: Optional[Dict[str, Postings]] = None
         self.db = db_path
         self.backup_dir = os.path.join(os.path.dirname(db_path), "backups")
+        self.backups = BackupStore(self.backup_dir, retention)
+        self.backup_interval = max(1, backup_interval)
+        # Journal appends since the last backup; None until this session made one
+        self._appends_since_backup: Optional[int] = None
+        self.lazy = lazy
+        # Search index, built on first search and then kept up to date by every mutation
+        self._index: Optional[SearchIndex] = None
+        # Search results by normalized query, valid for the current search index
+        self.query_cache = QueryCache(cache_size)
+        # (field, term, similar names used instead) of the category/tag terms the last
+        # search took as typos; interactive callers report them with report_substitutions
+        self.typo_substitutions: List[Tuple[str, str, List[str]]] = []
+        # Canonical URL index used for duplicate detection, maintained the same way
+        self._urls: Optional[UrlIndex] = None
+        # Journal state: entries not yet written, last sequence number, and whether
+        # the in-memory links match snapshot + journal so that appending is safe
+        self.journaled = journaled
+        self._journal = Journal(db_path, compact_threshold)
+        self._journal_seq = 0
+        self._pending: List[Dict[str, Any]] = []
+        self._synced_len: Optional[int] = None
+        self.persistent_index = persistent_index
+        self.index_file = index_path(db_path)
+        # Titles and descriptions of fetched pages, shared by the databases in this directory
+        self.page_cache_file = os.path.join(os.path.dirname(db_path), "page_cache.sqlite3")
+        # Multi-process state: generation and fingerprint of the database as last loaded or
+        # saved, and the changes made since (link id -> ("add", "update" or "remove",
+        # _link_state of the link before its first update))
+        self._lock = DatabaseLock(db_path)
+        self._generation = 0
+        self._fingerprint: Optional[List[int]] = None
+        self._dirty: Dict[str, Tuple[str, Optional[tuple]]] = {}
         # Ensure backup directory exists
         os.makedirs(self.backup_dir, exist_ok=True)
 
-    def _create_backup(self) -> str:
-        """Create a backup of the current database file."""
-        if not os.path.exists(self.db):
-            return "No database file to backup."
-        
-        from datetime import datetime
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        backup_file = os.path.join(self.backup_dir, f"links_backup_{timestamp}.json")
+    def _get_index(self) -> SearchIndex:
+        """Return the search index, (re)building it if it is missing or out of sync."""
+        if self._index is None or len(self._index) != len(self.links):
+            self._index = SearchIndex(self.links)
+            # Cached results refer to the keys of the previous index
+            self.query_cache.clear()
+        return self._index
+
+    def _get_urls(self) -> UrlIndex:
+        """Return the canonical URL index, (re)building it if it is missing or out of sync."""
+        if self._urls is None or len(self._urls) != len(self.links):
+            self._urls = UrlIndex(self._link_keys())
+        return self._urls
+
+    def _link_keys(self) -> Iterator[Tuple[str, str]]:
+        """Yield (id, url) for every link, without materializing lazily loaded links."""
+        return ((item["id"], item["url"]) if isinstance(item, dict) else (item.id, item.url)
+                for item in self.links.raw())
+
+    def _find_duplicate(self, url: str) -> Optional[Link]:
+        """Return the first link whose URL has the same canonical form as url, or None."""
+        link_id = self._get_urls().find(url)
+        return None if link_id is None else self.links.get(link_id)
+
+    def _link_records(self) -> Iterator[Dict[str, Any]]:
+        """Yield every link in dictionary form, without materializing lazily loaded links."""
+        return self.links.records()
+
+    def _record(self, op: str, link: Link, old_state: tuple = None) -> None:
+        """Remember a mutation for the next save and queue its journal entry."""
+        previous = self._dirty.get(link.id)
+        if previous is None:
+            self._dirty[link.id] = (op, old_state)
+        elif previous[0] != "add":
+            self._dirty[link.id] = (op, previous[1])
+        elif op == "remove":
+            del self._dirty[link.id]  # Never saved, nothing to re-apply
+        if not self.journaled:
+            return
+        self._journal_seq += 1
+        entry = {"seq": self._journal_seq, "op": op}
+        if op != "add":
+            entry["id"] = link.id
+        if op != "remove":
+            entry["link"] = link.to_dict()
+        self._pending.append(entry)
+
+    @property
+    def categories(self) -> Registry:
+        """Categories in use, with the number of links using each."""
+        if self._categories is None:
+            self._build_registries()
+        return self._categories
+
+    @categories.setter
+    def categories(self, value: Any) -> None:
+        # The registry is derived from the links; assigning forces a rebuild, and names
+        # assigned that no link uses are kept listed as with the plain list this used to be
+        self._categories = None
+        self._postings = None
+        if value:
+            self.categories.extend(value)
+
+    @property
+    def tags(self) -> Registry:
+        """Tags in use, with the number of links using each."""
+        if self._tags is None:
+            self._build_registries()
+        return self._tags
+
+    @tags.setter
+    def tags(self, value: Any) -> None:
+        self._tags = None
+        self._postings = None
+        if value:
+            self.tags.extend(value)
+
+    def _build_registries(self) -> None:
+        """Count category and tag usage over the whole collection."""
+        categories, tags = Registry(), Registry()
+        for item in self.links.raw():
+            if isinstance(item, dict):
+                categories.add_ids(VOCABULARY.intern_all(item.get("categories") or []))
+                tags.add_ids(VOCABULARY.intern_all(item.get("tags") or []))
+            else:
+                categories.add_ids(item._category_ids)
+                tags.add_ids(item._tag_ids)
+        # Only the missing one is replaced, keeping names appended to the other
+        if self._categories is None:
+            self._categories = categories
+        if self._tags is None:
+            self._tags = tags
+
+    def _get_postings(self) -> Dict[str, Postings]:
+        """Return the category and tag postings ("categories"/"tags" -> Postings), building them if needed."""
+        if self._postings is None:
+            postings = {"categories": Postings(), "tags": Postings()}
+            for item in self.links.raw():
+                if isinstance(item, dict):
+                    postings["categories"].add(item["id"], VOCABULARY.intern_all(item.get("categories") or []))
+                    postings["tags"].add(item["id"], VOCABULARY.intern_all(item.get("tags") or []))
+                else:
+                    postings["categories"].add(item.id, item._category_ids)
+                    postings["tags"].add(item.id, item._tag_ids)
+            self._postings = postings
+        return self._postings
+
+    @staticmethod
+    def _link_state(link: Link) -> tuple:
+        """Snapshot of a link's categories, tags, URL and description, passed to _link_changed."""
+        return link._category_ids, link._tag_ids, link.url, link.description
+
+    def _link_added(self, link: Link) -> None:
+        """Keep derived structures in sync after a link was added."""
+        if self._index is not None:
+            self._index.add(link)
+            self.query_cache.update([(id(link), None, self._index.values(link))])
+        if self._categories is not None:
+            self._categories.add_ids(link._category_ids)
+            self._tags.add_ids(link._tag_ids)
+        if self._urls is not None:
+            self._urls.add(link.url, link.id)
+        if self._postings is not None:
+            self._postings["categories"].add(link.id, link._category_ids)
+            self._postings["tags"].add(link.id, link._tag_ids)
+        if self._synced_len is not None:
+            self._synced_len += 1
+        self._record("add", link)
+
+    def _links_added(self, links: List[Link]) -> None:
+        """Batch form of _link_added; category and tag counts are merged once for all links."""
+        if self._index is not None:
+            for link in links:
+                self._index.add(link)
+            self.query_cache.update([(id(link), None, self._index.values(link)) for link in links])
+        if self._categories is not None:
+            category_counts, tag_counts = Counter(), Counter()
+            for link in links:
+                category_counts.update(set(link._category_ids))
+                tag_counts.update(set(link._tag_ids))
+            self._categories.add_counts(category_counts)
+            self._tags.add_counts(tag_counts)
+        if self._urls is not None:
+            for link in links:
+                self._urls.add(link.url, link.id)
+        if self._postings is not None:
+            for link in links:
+                self._postings["categories"].add(link.id, link._category_ids)
+                self._postings["tags"].add(link.id, link._tag_ids)
+        if self._synced_len is not None:
+            self._synced_len += len(links)
+        for link in links:
+            self._record("add", link)
+
+    def _add_records(self, records: List[Dict[str, Any]]) -> Tuple[int, int]:
+        """
+        Append a batch of serialized links, skipping URLs that are already in the collection
+        (or earlier in the batch). Returns (added, skipped duplicates).
+        """
+        urls = self._get_urls()
+        seen = set()
+        links = []
+        for record in records:
+            link = Link.from_dict(record)
+            key = canonical_url(link.url)
+            if key in seen or urls.has_canonical(key):
+                continue
+            seen.add(key)
+            links.append(link)
+        self.links.extend(links)
+        self._links_added(links)
+        return len(links), len(records) - len(links)
+
+    def _link_changed(self, link: Link, old_state: tuple = None) -> None:
+        """
+        Keep derived structures in sync after a link was modified.
+        old_state is the link's _link_state from before the change.
+        """
+        if self._index is not None:
+            old_values = self._index.values(link)
+            self._index.update(link)
+            self.query_cache.update([(id(link), old_values, self._index.values(link))])
+        if old_state is not None and self._categories is not None:
+            self._categories.replace_ids(old_state[0], link._category_ids)
+            self._tags.replace_ids(old_state[1], link._tag_ids)
+        if old_state is not None and self._urls is not None:
+            self._urls.replace(old_state[2], link.url, link.id)
+        if old_state is not None and self._postings is not None:
+            self._postings["categories"].replace(link.id, old_state[0], link._category_ids)
+            self._postings["tags"].replace(link.id, old_state[1], link._tag_ids)
+        self._record("update", link, old_state)
+
+    def _links_changed(self, changes: List[Tuple[Link, tuple]], counts: BulkCounts = None) -> None:
+        """
+        Batch form of _link_changed for (link, old_state) pairs whose categories or tags
+        changed. With counts (the ids added to and removed from the links, as collected by
+        BulkChange.apply) the registries are updated once instead of link by link.
+        """
+        if self._index is not None:
+            index, cache_changes = self._index, []
+            for link, _ in changes:
+                old_values = index.values(link)
+                index.update(link)
+                cache_changes.append((id(link), old_values, index.values(link)))
+            self.query_cache.update(cache_changes)
+        if self._categories is not None:
+            if counts is not None:
+                self._categories.add_counts(counts.categories_added)
+                self._categories.discard_counts(counts.categories_removed)
+                self._tags.add_counts(counts.tags_added)
+                self._tags.discard_counts(counts.tags_removed)
+            else:
+                for link, old_state in changes:
+                    self._categories.replace_ids(old_state[0], link._category_ids)
+                    self._tags.replace_ids(old_state[1], link._tag_ids)
+        if self._postings is not None:
+            for link, old_state in changes:
+                self._postings["categories"].replace(link.id, old_state[0], link._category_ids)
+                self._postings["tags"].replace(link.id, old_state[1], link._tag_ids)
+        for link, old_state in changes:
+            self._record("update", link, old_state)
+
+    def _link_removed(self, link: Link) -> None:
+        """Keep derived structures in sync after a link was removed."""
+        if self._index is not None:
+            self.query_cache.update([(id(link), self._index.values(link), None)])
+            self._index.remove(link)
+        if self._categories is not None:
+            self._categories.discard_ids(link._category_ids)
+            self._tags.discard_ids(link._tag_ids)
+        if self._urls is not None:
+            self._urls.discard(link.url, link.id)
+        if self._postings is not None:
+            self._postings["categories"].discard(link.id, link._category_ids)
+            self._postings["tags"].discard(link.id, link._tag_ids)
+        if self._synced_len is not None:
+            self._synced_len -= 1
+        self._record("remove", link)
+
+    def _link_checked(self, link: Link) -> None:
+        """Remember a new health check result for the next save; it does not count as an edit."""
+        self._record("update", link, self._link_state(link))
+
+    def _create_backup(self, data: Dict[str, Any] = None) -> str:
+        """
+        Back up the collection into the incremental backup store and apply the retention policy.
+        Only links that changed since the previous backup are written; unchanged states are skipped.
+        """
+        if data is None:
+            if not self.links and not os.path.exists(self.db):
+                return "No database file to backup."
+            data = {
+                "links": list(self._link_records()),
+                "categories": sorted(self.categories),
+                "tags": sorted(self.tags),
+            }
         
         try:
-            shutil.copy2(self.db, backup_file)
-            return f"Backup created: {backup_file}"
+            name = self.backups.create(data)
+            if name is None:
+                return "No changes since the last backup."
+            self.backups.prune()
+            return f"Backup created: {os.path.join(self.backup_dir, name)}"
         except Exception as e:
             return f"Backup failed: {str(e)}"
     
+    def _backup_saved_state(self) -> None:
+        """Back up the database as last saved (snapshot plus journal), before a save replaces it."""
+        if os.path.exists(self.db):
+            self._create_backup(self._read_db_state())
+            self._appends_since_backup = 0
+
     def list_backups(self) -> List[str]:
-        """List available backups."""
-        if not os.path.exists(self.backup_dir):
-            return []
-        
-        backups = [f for f in os.listdir(self.backup_dir) if f.startswith("links_backup_") and f.endswith(".json")]
-        return sorted(backups, reverse=True)  # Most recent first
+        """List available backups that survived the retention policy."""
+        return self.backups.list()  # Most recent first
     
     def restore_backup(self, backup_file: str = None) -> str:
         """Restore from a backup file."""
@@ -152,71 +743,253 @@ class LinkManager:
             return f"Backup file not found: {backup_file}"
         
         try:
-            # First create a backup of current state
-            self._create_backup()
-            # Copy backup to current db
-            shutil.copy2(backup_path, self.db)
-            # Reload from db
-            self.load_from_db()
+            data = self.backups.load(backup_file)
+            with self._lock.exclusive():
+                # First create a backup of current state
+                self._create_backup()
+                # Write backup to current db; the journal belongs to the replaced state
+                data["journal_seq"] = self._journal_seq
+                temp_file = f"{self.db}.tmp"
+                with open(temp_file, "w") as f:
+                    json.dump(data, f, indent=2)
+                os.replace(temp_file, self.db)
+                self._journal.clear()
+                self._lock.write_generation(self._lock.read_generation() + 1)
+                # Reload from db
+                self.load_from_db()
             return f"Database restored from {backup_file}"
         except Exception as e:
             return f"Restore failed: {str(e)}"
 
+    def _read_db_state(self) -> Dict[str, Any]:
+        """Stream-read the snapshot and replay any newer journal entries on top of it."""
+        with open(self.db, "r", encoding="utf-8") as f:
+            data = read_database(f)
+
+        snapshot_seq = data.get("journal_seq", 0)
+        entries = self._journal.read(after_seq=snapshot_seq)
+        if entries:
+            Journal.apply(data.setdefault("links", []), entries)
+        data["journal_seq"] = entries[-1]["seq"] if entries else snapshot_seq
+        return data
+
     def load_from_db(self) -> None:
-        """Load links from the database file."""
-        self.links = []
+        """Load links from the database file, replaying the journal if there is one."""
+        self.links = LinkList()
         self.categories = []
         self.tags = []
-        
+        self._index = None
+        self._urls = None
+        self._pending = []
+        self._synced_len = None
+        self._dirty = {}
+
         try:
-            if not os.path.exists(self.db):
-                print(f"Database file not found at {self.db}. Creating a new one.")
-                self.save_to_db()
-                return
-                
-            with open(self.db, "r") as f:
+            with self._lock.shared():
+                self._generation = self._lock.read_generation()
+                self._fingerprint = database_fingerprint(self.db)
+                if not os.path.exists(self.db):
+                    print(f"Database file not found at {self.db}. Creating a new one.")
+                    self.save_to_db()
+                    return
+
                 try:
-                    data = json.load(f)
+                    data = self._read_db_state()
                 except json.JSONDecodeError:
                     print("Error: Database file is corrupted. Creating backup and starting fresh.")
-                    if os.path.getsize(self.db) > 0:
-                        self._create_backup()
-                    self.save_to_db()
+                    with self._lock.exclusive():
+                        if os.path.getsize(self.db) > 0:
+                            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                            shutil.copy2(self.db, os.path.join(self.backup_dir, f"links_corrupt_{timestamp}.json"))
+                            self._journal.clear()
+                        # Replacing the corrupted state is intended, not a conflict
+                        self._generation = self._lock.read_generation()
+                        self._fingerprint = database_fingerprint(self.db)
+                        self.save_to_db()
                     return
 
-                self.categories = data.get("categories", [])
-                self.tags = data.get("tags", [])
-
-                for link_data in data.get("links", []):
-                    link = Link(
-                        url=link_data["url"],
-                        description=link_data.get("description", ""),
-                        categories=link_data.get("categories", []),
-                        tags=link_data.get("tags", [])
-                    )
-                    # Handle timestamps for older data
-                    if "created_at" in link_data:
-                        link.created_at = link_data["created_at"]
-                    if "last_updated" in link_data:
-                        link.last_updated = link_data["last_updated"]
-                    self.links.append(link)
-                
-                print(f"Loaded {len(self.links)} links from database.")
+            self._journal_seq = data["journal_seq"]
+            self._set_records(data.get("links", []))
+            print(f"Loaded {len(self.links)} links from database.")
         except Exception as e:
             print(f"Error loading database: {e}")
-            
+
+    def _set_records(self, records: List[Dict[str, Any]]) -> None:
+        """Replace the links with records read from the database."""
+        missing_ids = False
+        for record in records:
+            if not record.get("id"):
+                record["id"] = new_link_id()
+                missing_ids = True
+
+        if self.lazy:
+            self.links = LinkList(records)
+        else:
+            self.links = LinkList([Link.from_dict(link_data) for link_data in records])
+        self.categories = []
+        self.tags = []
+        self._index = None
+        self._urls = None
+        # Ids given to links from older databases only persist once the snapshot is rewritten
+        self._synced_len = None if missing_ids else len(self.links)
+
+    def _rebase(self) -> None:
+        """
+        Re-apply the links changed since the last load or save on top of the database as
+        another process left it, instead of overwriting its changes. A link changed on both
+        sides gets both sides' changes (see _merge_changes), a link edited here but removed
+        elsewhere is kept, and a link added here is merged into one with the same URL added
+        elsewhere.
+        """
+        if os.path.exists(self.db):
+            data = self._read_db_state()
+        else:
+            data = {"links": [], "journal_seq": self._journal_seq}
+        records = data.get("links", [])
+        positions = {record.get("id"): i for i, record in enumerate(records)}
+        urls: Optional[UrlIndex] = None
+        entries = []
+        for link_id, (op, base) in self._dirty.items():
+            position = positions.get(link_id)
+            if op == "remove":
+                if position is not None:
+                    records[position] = None
+                    del positions[link_id]
+                    entries.append({"op": "remove", "id": link_id})
+                continue
+            link = self.links.get(link_id)
+            if link is None:
+                continue
+            if position is not None:
+                record = link.to_dict()
+                if base is not None and op == "update":
+                    record = self._merge_changes(base, link, records[position])
+                records[position] = record
+                entries.append({"op": "update", "id": link_id, "link": records[position]})
+                continue
+            if op == "add":
+                if urls is None:
+                    urls = UrlIndex((record["id"], record["url"]) for record in records
+                                    if record is not None and record.get("id"))
+                duplicate_id = urls.find(link.url)
+                if duplicate_id in positions:
+                    existing = Link.from_dict(records[positions[duplicate_id]])
+                    if existing.merge(link):
+                        records[positions[duplicate_id]] = existing.to_dict()
+                        entries.append({"op": "update", "id": duplicate_id,
+                                        "link": records[positions[duplicate_id]]})
+                    continue
+            positions[link_id] = len(records)
+            records.append(link.to_dict())
+            entries.append({"op": "add", "link": records[-1]})
+
+        self._set_records([record for record in records if record is not None])
+        self._journal_seq = data["journal_seq"] + len(entries)
+        self._pending = [{"seq": data["journal_seq"] + i, **entry} for i, entry in enumerate(entries, 1)
+                         ] if self.journaled else []
+        self._dirty = {entry.get("id") or entry["link"]["id"]: (entry["op"], None) for entry in entries}
+        print(f"The database was changed by another process; "
+              f"re-applied {len(entries)} local change(s) on top of it.")
+
+    @staticmethod
+    def _merge_changes(base: tuple, link: Link, record: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Three-way merge of a link changed here, from base (its _link_state before the first
+        change), with its record as saved meanwhile by another process: the fields,
+        categories and tags changed here take the local value, the others the saved one.
+        """
+        merged = link.to_dict()
+        for field, base_ids in (("categories", base[0]), ("tags", base[1])):
+            base_names = set(VOCABULARY.names(base_ids))
+            local_names = merged[field]
+            kept = [name for name in record.get(field) or [] if name in local_names or name not in base_names]
+            merged[field] = kept + [name for name in local_names if name not in base_names and name not in kept]
+        for field, base_value in (("url", base[2]), ("description", base[3])):
+            if merged[field] == base_value:
+                merged[field] = record.get(field, base_value)
+        return merged
+
     def save_to_db(self) -> None:
-        """Save links to the database file with error handling."""
+        """
+        Save links to the database file with error handling.
+        In journaled mode only the pending mutations are appended to the journal.
+
+        The database lock is held for the whole save. If another process saved since this
+        one loaded, the local changes are first re-applied on top of its state (_rebase).
+        """
+        try:
+            with self._lock.exclusive():
+                generation = self._lock.read_generation()
+                fingerprint = database_fingerprint(self.db)
+                # The fingerprint also catches writers that do not take the lock
+                if generation != self._generation or fingerprint != self._fingerprint:
+                    self._rebase()
+                    fingerprint = database_fingerprint(self.db)
+                if self._save_locked(fingerprint):
+                    self._generation = generation + 1
+                    self._lock.write_generation(self._generation)
+                self._fingerprint = database_fingerprint(self.db)
+        except Exception as e:
+            print(f"Error saving database: {e}")
+
+    def _save_locked(self, fingerprint: List[int]) -> bool:
+        """Write the pending changes while holding the lock; returns True if the database changed."""
+        pending = self._pending
+        in_sync = self._synced_len == len(self.links)
+
+        if (self.journaled and in_sync
+                and os.path.exists(self.db) and not self._journal.needs_compaction()):
+            try:
+                if pending and (self._appends_since_backup is None
+                                or self._appends_since_backup >= self.backup_interval):
+                    self._backup_saved_state()
+                self._journal.append(self._pending)
+                if pending and self._appends_since_backup is not None:
+                    self._appends_since_backup += 1
+                self._pending = []
+                self._dirty = {}
+                print(f"Database saved to {self.db}")
+                if self.persistent_index:
+                    self._update_disk_index(fingerprint, pending)
+                return bool(pending)
+            except Exception as e:
+                print(f"Error writing journal, rewriting database instead: {e}")
+
+        if not self._write_snapshot():
+            return False
+        if self.persistent_index:
+            self._update_disk_index(fingerprint, pending if self.journaled and in_sync else None)
+        return True
+
+    def _update_disk_index(self, fingerprint: List[int], pending: Optional[List[Dict[str, Any]]]) -> None:
+        """
+        Bring the index file up to date after a save. The pending journal entries are
+        appended to it if it matched the database before the save (fingerprint);
+        otherwise, or with pending=None, it is rewritten from the links.
+        """
+        try:
+            current = database_fingerprint(self.db)
+            if pending is not None and update_index(self.index_file, pending, self._journal_seq,
+                                                    fingerprint, current):
+                return
+            write_index(self.index_file, self._link_records(), self._journal_seq, current)
+        except Exception as e:
+            # The index is only an accelerator; a stale one is ignored by query_index
+            print(f"Error updating search index: {e}")
+
+    def _write_snapshot(self) -> bool:
+        """Rewrite the whole database file and fold the journal into it; returns True on success."""
         data = {
-            "links": [link.to_dict() for link in self.links],
-            "categories": self.categories,
-            "tags": self.tags,
+            "links": list(self._link_records()),
+            "categories": sorted(self.categories),
+            "tags": sorted(self.tags),
+            "journal_seq": self._journal_seq,
         }
+        temp_file = f"{self.db}.tmp"
         
         try:
-            # Create a backup before saving
-            if os.path.exists(self.db):
-                self._create_backup()
+            # Back up the database as it is on disk before replacing it
+            self._backup_saved_state()
                 
             # Write to temporary file first
             temp_file = f"{self.db}.tmp"
@@ -225,7 +998,13 @@ class LinkManager:
             
             # Rename to actual file (atomic operation)
             os.replace(temp_file, self.db)
+            # Everything in the journal is now part of the snapshot
+            self._journal.clear()
+            self._pending = []
+            self._dirty = {}
+            self._synced_len = len(self.links)
             print(f"Database saved to {self.db}")
+            return True
         except Exception as e:
             print(f"Error saving database: {e}")
             if os.path.exists(temp_file):
@@ -233,9 +1012,36 @@ class LinkManager:
                     os.remove(temp_file)
                 except:
                     pass
+            return False
 
-    def add_link(self, interactive: bool = True) -> Optional[Link]:
-        """Add a new link to the collection."""
+    @property
+    def has_unsaved_changes(self) -> bool:
+        """Whether there are changes that the next save_to_db has to write."""
+        return bool(self._dirty)
+
+    def refresh(self) -> bool:
+        """
+        Pick up what other processes saved since the last load or save, for long-running
+        sessions such as the daemon. Local changes are saved first (and so rebased onto the
+        new state). Returns True if the links were reloaded.
+        """
+        with self._lock.shared():
+            stale = (self._lock.read_generation() != self._generation
+                     or database_fingerprint(self.db) != self._fingerprint)
+        if not stale:
+            return False
+        if self.has_unsaved_changes:
+            self.save_to_db()
+        else:
+            self.load_from_db()
+        return True
+
+    def add_link(self, interactive: bool = True, url: str = None, description: str = "",
+                 categories: List[str] = None, tags: List[str] = None) -> Optional[Link]:
+        """
+        Add a new link to the collection.
+        When called with interactive=False, the link is built from the given arguments.
+        """
         try:
             if interactive:
                 url = input("URL: ")
@@ -257,17 +1063,22 @@ class LinkManager:
                 
                 tags = [tag.strip() for tag in tags_input.split(",")] if tags_input else []
             else:
-                # Called programmatically - would be implemented by caller
-                return None
+                if not url:
+                    return None
+                categories = categories or []
+                tags = tags or []
 
             link = Link(url, description, categories, tags)
-            self.links.append(link)
+            existing = self._find_duplicate(link.url)
+            if existing is not None:
+                old_state = self._link_state(existing)
+                if existing.merge(link):
+                    self._link_changed(existing, old_state)
+                print(f"Link already exists: {existing.url} (categories and tags merged)")
+                return existing
 
-            # Update global categories and tags
-            if categories:
-                self.categories = list(set(self.categories) | set(categories))
-            if tags:
-                self.tags = list(set(self.tags) | set(tags))
+            self.links.append(link)
+            self._link_added(link)
             
             print("Link added successfully!")
             return link
@@ -279,272 +1090,545 @@ class LinkManager:
             print(f"Error adding link: {e}")
             return None
 
-    def bulk_import_from_csv(self, file_path: str) -> str:
-        """Import links from a CSV file."""
+    def bulk_import_from_csv(self, file_path: str, batch_size: int = DEFAULT_BATCH_SIZE,
+                             workers: int = 0, show_progress: bool = True) -> str:
+        """
+        Import links from a CSV file.
+        Rows are parsed in batches of batch_size, across worker processes if workers > 1,
+        and every batch is merged into the collection at once. URLs that are already in the
+        collection are skipped.
+        """
         if not os.path.exists(file_path):
             return f"Error: File not found at {file_path}"
-        
-        added_count = 0
-        error_count = 0
-        
+
+        def report(stats: ImportStats) -> None:
+            print(f"\rImporting... {stats}", end="", flush=True)
+
+        pipeline = CSVImportPipeline(self, batch_size, workers, report if show_progress else None)
         try:
-            with open(file_path, 'r', newline='', encoding='utf-8') as csvfile:
-                reader = csv.DictReader(csvfile)
-                if not reader.fieldnames:
-                    return "Error: CSV file appears to be empty or invalid"
-                
-                # Check required fields
-                required_fields = ['url']
-                for field in required_fields:
-                    if field not in reader.fieldnames:
-                        return f"Error: CSV file missing required field '{field}'"
-                
-                for row in reader:
-                    try:
-                        url = row['url'].strip()
-                        if not url:
-                            continue
-                            
-                        description = row.get('description', '').strip()
-                        
-                        categories = []
-                        if 'categories' in row and row['categories']:
-                            categories = [cat.strip() for cat in row['categories'].split(',')]
-                            
-                        tags = []
-                        if 'tags' in row and row['tags']:
-                            tags = [tag.strip() for tag in row['tags'].split(',')]
-                        
-                        link = Link(url, description, categories, tags)
-                        self.links.append(link)
-                        
-                        # Update global categories and tags
-                        if categories:
-                            self.categories = list(set(self.categories) | set(categories))
-                        if tags:
-                            self.tags = list(set(self.tags) | set(tags))
-                            
-                        added_count += 1
-                    except Exception as e:
-                        error_count += 1
-                        print(f"Error processing row: {e}")
-        
-            return f"Import completed: {added_count} links added, {error_count} errors"
+            stats = pipeline.run(file_path)
+        except ValueError as e:
+            return f"Error: {e}"
         except Exception as e:
             return f"Import failed: {e}"
+        if show_progress and stats.batches:
+            print()
+
+        return (f"Import completed: {stats.added} links added, {stats.duplicates} duplicates skipped, "
+                f"{stats.errors} errors ({stats.throughput:.0f} rows/s)")
     
+    def import_bookmarks(self, sources: Any, batch_size: int = DEFAULT_BATCH_SIZE, workers: int = 0,
+                         show_progress: bool = True) -> str:
+        """
+        Import HTML bookmark files exported from browsers.
+        sources is a path or file object, or a list of them; with workers > 1 the files are
+        parsed concurrently. Each bookmark's folder path becomes its category and URLs that
+        are already in the collection are skipped.
+        """
+        if isinstance(sources, (str, os.PathLike)) or hasattr(sources, "read"):
+            sources = [sources]
+
+        def report(stats: ImportStats) -> None:
+            print(f"\rImporting... {stats.files} files, {stats.rows} bookmarks, {stats.added} links added",
+                  end="", flush=True)
+
+        try:
+            stats = ImportHandler().import_files(self, sources, workers, batch_size,
+                                                 report if show_progress else None)
+        except Exception as e:
+            return f"Import failed: {e}"
+        if show_progress and stats.batches:
+            print()
+
+        return (f"Import completed: {stats.added} links added from {stats.files} files, "
+                f"{stats.duplicates} duplicates skipped, {stats.skipped} non-web bookmarks ignored, "
+                f"{stats.errors} files failed ({stats.throughput:.0f} bookmarks/s)")
+
     def export_to_csv(self, file_path: str) -> str:
         """Export links to a CSV file."""
+        return self.export_links(file_path, "csv")
+
+    def export_links(self, file_path: str, export_format: str = None, search_params: Dict[str, str] = None,
+                     search_mode: str = "AND", advanced: Dict[str, List[str]] = None) -> str:
+        """
+        Stream links to a CSV, JSON Lines or columnar (.lmc) file in large buffered chunks.
+        The format defaults to the one matching the file extension.
+
+        With search_params (as for query, combined with search_mode) or advanced (field ->
+        terms, as for advanced_search) only the matching links are exported; they are
+        written as they are found rather than collected into a list first.
+        """
         try:
-            with open(file_path, 'w', newline='', encoding='utf-8') as csvfile:
-                fieldnames = ['url', 'description', 'categories', 'tags', 'created_at', 'last_updated']
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                writer.writeheader()
-                
-                for link in self.links:
-                    writer.writerow({
-                        'url': link.url,
-                        'description': link.description,
-                        'categories': ','.join(link.categories),
-                        'tags': ','.join(link.tags),
-                        'created_at': link.created_at,
-                        'last_updated': link.last_updated
-                    })
-                
-            return f"Exported {len(self.links)} links to {file_path}"
+            if advanced:
+                items = self._iter_advanced_matches(*(advanced.get(field, []) for field in
+                                                      ("url", "description", "categories", "tags")))
+            elif search_params and any(search_params.values()):
+                items = self._iter_matches({k: v for k, v in search_params.items() if v}, search_mode)
+            else:
+                items = self._link_records()
+            count = write_export(file_path, items, export_format)
+            return f"Exported {count} links to {file_path}"
         except Exception as e:
             return f"Export failed: {e}"
 
+    def _link_at(self, index: int) -> Optional[Link]:
+        """Return the link at a position, or None (with an error message) if it is out of range."""
+        if index >= len(self.links) or index < 0:
+            print("Error: Index is out of range.")
+            return None
+        return self.links[index]
+
+    def _link_with_id(self, link_id: str) -> Optional[Link]:
+        """Return the link with an id, or None (with an error message) if there is none."""
+        link = self.links.get(link_id)
+        if link is None:
+            print(f"Error: No link with id {link_id}.")
+        return link
+
+    def get_link(self, link_id: str) -> Optional[Link]:
+        """Return the link with the given id, or None."""
+        return self.links.get(link_id)
+
+    def _add_category(self, link: Link, category: str) -> bool:
+        old_state = self._link_state(link)
+        link.add_category(category)
+        self._link_changed(link, old_state)
+        return True
+
     def add_link_category(self, index: int, category: str) -> bool:
         """Add a category to a link."""
-        if index >= len(self.links):
-            print("Error: Index is out of range.")
-            return False
-            
-        self.links[index].add_category(category)
-        if category not in self.categories:
-            self.categories.append(category)
+        link = self._link_at(index)
+        return link is not None and self._add_category(link, category)
+
+    def add_link_category_by_id(self, link_id: str, category: str) -> bool:
+        """Add a category to the link with the given id."""
+        link = self._link_with_id(link_id)
+        return link is not None and self._add_category(link, category)
+
+    def _add_tag(self, link: Link, tag: str) -> bool:
+        old_state = self._link_state(link)
+        link.add_tags(tag)
+        self._link_changed(link, old_state)
         return True
 
     def add_link_tag(self, index: int, tag: str) -> bool:
         """Add a tag to a link."""
-        if index >= len(self.links):
-            print("Error: Index is out of range.")
-            return False
-            
-        self.links[index].add_tags(tag)
-        if tag not in self.tags:
-            self.tags.append(tag)
+        link = self._link_at(index)
+        return link is not None and self._add_tag(link, tag)
+
+    def add_link_tag_by_id(self, link_id: str, tag: str) -> bool:
+        """Add a tag to the link with the given id."""
+        link = self._link_with_id(link_id)
+        return link is not None and self._add_tag(link, tag)
+
+    def _update_url(self, link: Link, new_url: str) -> bool:
+        old_state = self._link_state(link)
+        link.update_url(new_url)
+        self._link_changed(link, old_state)
+        print("Link URL updated")
         return True
 
     def update_link_url(self, index: int, new_url: str) -> bool:
         """Update the URL of a link."""
-        if index >= len(self.links):
-            print("Error: Index is out of range.")
-            return False
-            
-        self.links[index].update_url(new_url)
-        print("Link URL updated")
+        link = self._link_at(index)
+        return link is not None and self._update_url(link, new_url)
+
+    def update_link_url_by_id(self, link_id: str, new_url: str) -> bool:
+        """Update the URL of the link with the given id."""
+        link = self._link_with_id(link_id)
+        return link is not None and self._update_url(link, new_url)
+
+    def _update_description(self, link: Link, new_description: str) -> bool:
+        old_state = self._link_state(link)
+        link.update_description(new_description)
+        self._link_changed(link, old_state)
+        print("Description updated")
         return True
 
     def update_link_description(self, index: int, new_description: str) -> bool:
         """Update the description of a link."""
-        if index >= len(self.links):
-            print("Error: Index is out of range.")
-            return False
-            
-        self.links[index].update_description(new_description)
-        print("Description updated")
-        return True
+        link = self._link_at(index)
+        return link is not None and self._update_description(link, new_description)
+
+    def update_link_description_by_id(self, link_id: str, new_description: str) -> bool:
+        """Update the description of the link with the given id."""
+        link = self._link_with_id(link_id)
+        return link is not None and self._update_description(link, new_description)
 
     def remove_link(self, index: int) -> bool:
         """Remove a link from the collection."""
-        if index >= len(self.links) or index < 0:
-            print("Error: Index is out of range.")
+        if self._link_at(index) is None:
             return False
-            
+
         removed = self.links.pop(index)
+        self._link_removed(removed)
+        print(f"Removed link: {removed.url}")
+        return True
+
+    def remove_link_by_id(self, link_id: str) -> bool:
+        """Remove the link with the given id in O(1)."""
+        removed = self.links.remove_id(link_id)
+        if removed is None:
+            print(f"Error: No link with id {link_id}.")
+            return False
+        self._link_removed(removed)
         print(f"Removed link: {removed.url}")
-        
-        # Update categories and tags lists if needed
-        self._refresh_categories_and_tags()
         return True
     
+    def dedupe_links(self) -> int:
+        """
+        Merge links whose URLs are equal after normalization into the one added first
+        and remove the others. Returns the number of links removed.
+        """
+        removed = 0
+        for keeper_id, *duplicate_ids in self._get_urls().duplicates():
+            keeper = self.links.get(keeper_id)
+            old_state = self._link_state(keeper)
+            changed = False
+            for duplicate_id in duplicate_ids:
+                duplicate = self.links.remove_id(duplicate_id)
+                changed = keeper.merge(duplicate) or changed
+                self._link_removed(duplicate)
+                removed += 1
+            if changed:
+                self._link_changed(keeper, old_state)
+        return removed
+
     def _refresh_categories_and_tags(self) -> None:
-        """Refresh the global categories and tags lists based on actual link data."""
-        # Get all unique categories and tags from links
-        all_categories = set()
-        all_tags = set()
-        
-        for link in self.links:
-            all_categories.update(link.categories)
-            all_tags.update(link.tags)
-        
-        # Update the lists
-        self.categories = sorted(list(all_categories))
-        self.tags = sorted(list(all_tags))
+        """Rebuild the category and tag registries from actual link data."""
+        self._build_registries()
+
+    def _remove_category(self, link: Link, category: str) -> bool:
+        old_state = self._link_state(link)
+        result = link.remove_category(category)
+        if result:
+            self._link_changed(link, old_state)
+        return result
 
     def remove_link_category(self, index: int, category: str) -> bool:
         """Remove a category from a link."""
-        if index >= len(self.links):
-            print("Error: Index is out of range.")
-            return False
-            
-        result = self.links[index].remove_category(category)
+        link = self._link_at(index)
+        return link is not None and self._remove_category(link, category)
+
+    def remove_link_category_by_id(self, link_id: str, category: str) -> bool:
+        """Remove a category from the link with the given id."""
+        link = self._link_with_id(link_id)
+        return link is not None and self._remove_category(link, category)
+
+    def _remove_tag(self, link: Link, tag: str) -> bool:
+        old_state = self._link_state(link)
+        result = link.remove_tag(tag)
         if result:
-            # Check if any other link uses this category
-            category_in_use = any(category in link.categories for link in self.links)
-            if not category_in_use and category in self.categories:
-                self.categories.remove(category)
+            self._link_changed(link, old_state)
         return result
 
     def remove_link_tag(self, index: int, tag: str) -> bool:
         """Remove a tag from a link."""
-        if index >= len(self.links):
-            print("Error: Index is out of range.")
-            return False
-            
-        result = self.links[index].remove_tag(tag)
-        if result:
-            # Check if any other link uses this tag
-            tag_in_use = any(tag in link.tags for link in self.links)
-            if not tag_in_use and tag in self.tags:
-                self.tags.remove(tag)
-        return result
+        link = self._link_at(index)
+        return link is not None and self._remove_tag(link, tag)
 
-    def bulk_add_tag(self, tag: str, indices: List[int] = None) -> int:
-        """Add a tag to multiple links."""
-        if not tag.strip():
-            return 0
-            
-        count = 0
-        tag = tag.strip()
-        
+    def remove_link_tag_by_id(self, link_id: str, tag: str) -> bool:
+        """Remove a tag from the link with the given id."""
+        link = self._link_with_id(link_id)
+        return link is not None and self._remove_tag(link, tag)
+
+    def _links_at(self, indices: Optional[Iterable[int]]) -> Iterator[Link]:
+        """Links at the given positions (all links if None), skipping invalid ones."""
         if indices is None:
             indices = range(len(self.links))
-            
         for idx in indices:
             if 0 <= idx < len(self.links):
-                self.links[idx].add_tags(tag)
-                count += 1
-                
-        if count > 0 and tag not in self.tags:
-            self.tags.append(tag)
-            
-        return count
+                yield self.links[idx]
+
+    def _links_with_ids(self, link_ids: Iterable[str]) -> Iterator[Link]:
+        """Links with the given ids, skipping unknown ones."""
+        for link_id in link_ids:
+            link = self.links.get(link_id)
+            if link is not None:
+                yield link
+
+    def _bulk_targets(self, where: Optional[Dict[str, List[str]]], indices: Optional[Iterable[int]],
+                      link_ids: Optional[Iterable[str]]) -> Iterator[Link]:
+        """
+        Links selected for a bulk update: those with the given ids or at the given positions
+        (all links if neither is given), narrowed down to the ones matching where.
+        """
+        term_lists = [(where or {}).get(field, []) for field in FIELDS]
+        # Selectors that drive a change match exactly: a misspelled name selects nothing
+        if link_ids is None and indices is None:
+            return self._iter_advanced_matches(*term_lists, fuzzy=False)
+        links = self._links_with_ids(link_ids) if link_ids is not None else self._links_at(indices)
+        matched = self._advanced_keys(*term_lists, fuzzy=False)
+        if matched is None:
+            return links
+        return (link for link in links if id(link) in matched)
+
+    def bulk_update(self, where: Dict[str, List[str]] = None, add_tags: Iterable[str] = (),
+                    remove_tags: Iterable[str] = (), add_categories: Iterable[str] = (),
+                    remove_categories: Iterable[str] = (), indices: Iterable[int] = None,
+                    link_ids: Iterable[str] = None) -> BulkSummary:
+        """
+        Add and remove tags and categories on every link matching where (field -> terms, as
+        for advanced_search, but category and tag terms match exactly, without the typo
+        fallback; all links if empty), optionally only among the links at indices or with
+        link_ids.
+
+        The matched links are changed in one pass and share one last_updated timestamp;
+        links that already have the requested state are left untouched. The search index
+        and the category/tag registries are updated once for the whole batch.
+        """
+        summary = BulkSummary()
+        change = BulkChange(add_categories, remove_categories, add_tags, remove_tags)
+        if not change:
+            return summary.finish()
+
+        counts = BulkCounts()
+        changes = []
+        for link in self._bulk_targets(where, indices, link_ids):
+            summary.matched += 1
+            category_ids, tag_ids = change.apply(link._category_ids, link._tag_ids, counts)
+            if category_ids is not link._category_ids or tag_ids is not link._tag_ids:
+                changes.append((link, self._link_state(link)))
+                link._category_ids, link._tag_ids = category_ids, tag_ids
+
+        self._commit_changes(changes, counts)
+        summary.changed = len(changes)
+        return summary.finish(counts)
+
+    def _commit_changes(self, changes: List[Tuple[Link, tuple]], counts: BulkCounts) -> None:
+        """Give the changed links one shared last_updated timestamp and pass them to _links_changed."""
+        if not changes:
+            return
+        now = datetime.now().isoformat()
+        updated = _compact_timestamp(now) if Link.compact_timestamps else now
+        for link, _ in changes:
+            link._updated = updated
+        self._links_changed(changes, counts)
+
+    def _merge_names(self, field: str, sources: Iterable[str], target: str) -> BulkSummary:
+        """
+        Replace the category or tag (field) names sources by target on every link using one
+        of them, in the position of the first one; each affected list is deduplicated.
+        """
+        summary = BulkSummary()
+        target = target.strip()
+        # Built first: interns the names of lazily loaded links
+        postings = self._get_postings()[field]
+        source_ids = {VOCABULARY.lookup(name) for name in clean_names(sources) if name != target} - {-1}
+        if not target or not source_ids:
+            return summary.finish()
+        target_id = VOCABULARY.intern(target)
+        attribute = "_category_ids" if field == "categories" else "_tag_ids"
+        counts = BulkCounts()
+        added, removed = getattr(counts, f"{field}_added"), getattr(counts, f"{field}_removed")
+
+        changes = []
+        for link_id in postings.links(source_ids):
+            link = self.links.get(link_id)
+            old_ids = getattr(link, attribute)
+            removed.update(source_ids.intersection(old_ids))
+            if target_id not in old_ids:
+                added[target_id] += 1
+            changes.append((link, self._link_state(link)))
+            setattr(link, attribute, tuple(dict.fromkeys(
+                target_id if name_id in source_ids else name_id for name_id in old_ids)))
+        self._commit_changes(changes, counts)
+        summary.matched = summary.changed = len(changes)
+        return summary.finish(counts)
+
+    def rename_tag(self, old: str, new: str) -> BulkSummary:
+        """Rename a tag on every link using it; if new is already a tag, the two are merged."""
+        return self._merge_names("tags", [old], new)
+
+    def rename_category(self, old: str, new: str) -> BulkSummary:
+        """Rename a category on every link using it; if new is already a category, the two are merged."""
+        return self._merge_names("categories", [old], new)
+
+    def merge_tags(self, sources: List[str], target: str) -> BulkSummary:
+        """Replace the tags sources by target on every link using one of them."""
+        return self._merge_names("tags", sources, target)
+
+    def merge_categories(self, sources: List[str], target: str) -> BulkSummary:
+        """Replace the categories sources by target on every link using one of them."""
+        return self._merge_names("categories", sources, target)
+
+    def bulk_add_tag(self, tag: str, indices: List[int] = None) -> int:
+        """Add a tag to multiple links."""
+        return self.bulk_update(add_tags=[tag], indices=indices).matched
+
+    def bulk_add_tag_by_ids(self, tag: str, link_ids: List[str]) -> int:
+        """Add a tag to the links with the given ids."""
+        return self.bulk_update(add_tags=[tag], link_ids=link_ids).matched
 
     def bulk_add_category(self, category: str, indices: List[int] = None) -> int:
         """Add a category to multiple links."""
-        if not category.strip():
-            return 0
-            
-        count = 0
-        category = category.strip()
-        
-        if indices is None:
-            indices = range(len(self.links))
-            
-        for idx in indices:
-            if 0 <= idx < len(self.links):
-                self.links[idx].add_category(category)
-                count += 1
-                
-        if count > 0 and category not in self.categories:
-            self.categories.append(category)
-            
-        return count
+        return self.bulk_update(add_categories=[category], indices=indices).matched
+
+    def bulk_add_category_by_ids(self, category: str, link_ids: List[str]) -> int:
+        """Add a category to the links with the given ids."""
+        return self.bulk_update(add_categories=[category], link_ids=link_ids).matched
 
     def bulk_remove_tag(self, tag: str) -> int:
         """Remove a tag from all links that have it."""
-        count = 0
-        for link in self.links:
-            if tag in link.tags:
-                link.remove_tag(tag)
-                count += 1
-                
-        if tag in self.tags:
-            self.tags.remove(tag)
-            
-        return count
+        return self.bulk_update(remove_tags=[tag]).changed
 
     def bulk_remove_category(self, category: str) -> int:
         """Remove a category from all links that have it."""
-        count = 0
-        for link in self.links:
-            if category in link.categories:
-                link.remove_category(category)
-                count += 1
-                
-        if category in self.categories:
-            self.categories.remove(category)
-            
-        return count
+        return self.bulk_update(remove_categories=[category]).changed
+
+    def record_check(self, link_id: str, check: LinkCheck) -> bool:
+        """Store a health check result on the link with the given id; False if it no longer exists."""
+        link = self.links.get(link_id)
+        if link is None:
+            return False
+        link.check = check
+        self._link_checked(link)
+        return True
 
-    def list_all(self) -> None:
-        """List all links with their details."""
+    def _check_targets(self, link_ids: Optional[Iterable[str]] = None) -> List[Tuple[str, ...]]:
+        """Check targets for the given links (all by default), without materializing lazily loaded links."""
+        return check_targets(self.links.raw() if link_ids is None else self._links_with_ids(link_ids))
+
+    def check_links(self, link_ids: Optional[Iterable[str]] = None, concurrency: int = DEFAULT_CONCURRENCY,
+                    **options: Any) -> CheckSummary:
+        """
+        Check that links still resolve and store the status, latency and check time on each
+        (see LinkChecker, which takes the remaining options). Blocks until every link was
+        checked; start_link_check runs the same check in the background.
+        """
+        targets = self._check_targets(link_ids)
+        summary = CheckSummary(len(targets))
+
+        def store(link_id: str, check: LinkCheck) -> None:
+            if self.record_check(link_id, check):
+                summary.add(check)
+
+        LinkChecker(concurrency, **options).check(targets, store)
+        return summary.finish()
+
+    def start_link_check(self, link_ids: Optional[Iterable[str]] = None, concurrency: int = DEFAULT_CONCURRENCY,
+                         **options: Any) -> BackgroundCheck:
+        """
+        Start checking links in a background thread and return the BackgroundCheck; its
+        apply() stores the results received so far and must be called from this thread.
+        """
+        return BackgroundCheck(self, LinkChecker(concurrency, **options), self._check_targets(link_ids)).start()
+
+    def broken_links(self) -> List[Link]:
+        """Links whose last health check failed."""
+        broken = []
+        for item in self.links.raw():
+            if isinstance(item, dict):
+                if item.get("check") and not LinkCheck.from_dict(item["check"]).ok:
+                    broken.append(self.links.get(item["id"]))
+            elif item.check is not None and not item.check.ok:
+                broken.append(item)
+        return broken
+
+    def list_broken_links(self) -> None:
+        """List the links whose last health check failed, with the outcome of the check."""
+        broken = self.broken_links()
+        if not broken:
+            print(colored("No broken links found.", "yellow"))
+            return
+        out = Renderer()
+        out.render(out.colored(f"Broken Links ({len(broken)} found):", "light_blue") + "\n", broken,
+                   lambda index, link: (out.colored(f"[{index}] {link.url}", "light_magenta")
+                                        + f"\n  {link.check}\n"))
+
+    def _enrich_targets(self, link_ids: Optional[Iterable[str]] = None) -> List[Tuple[str, str]]:
+        """(id, URL) of the given links (all by default) without a description, without materializing lazily loaded links."""
+        targets = []
+        for item in self.links.raw() if link_ids is None else self._links_with_ids(link_ids):
+            if isinstance(item, dict):
+                if not item.get("description"):
+                    targets.append((item["id"], item["url"]))
+            elif not item.description:
+                targets.append((item.id, item.url))
+        return targets
+
+    def _fill_description(self, link_id: str, description: str) -> bool:
+        """Set the description of a link that still has none; returns True if it was set."""
+        link = self.links.get(link_id)
+        if link is None or link.description or not description:
+            return False
+        old_state = self._link_state(link)
+        link.update_description(description)
+        self._link_changed(link, old_state)
+        return True
+
+    def enrich_descriptions(self, link_ids: Optional[Iterable[str]] = None, concurrency: int = DEFAULT_CONCURRENCY,
+                            ttl: float = DEFAULT_TTL, cache_path: Optional[str] = None, show_progress: bool = True,
+                            **options: Any) -> EnrichSummary:
+        """
+        Fill in the description of links that have none with the title and meta description
+        of the linked page (see MetadataFetcher, which takes the remaining options).
+        Fetched pages are cached in cache_path (default: page_cache_file) for ttl seconds,
+        so after an interruption (Ctrl+C) a new run continues with the pages that were not
+        fetched yet. The descriptions filled in are kept until the next save.
+        """
+        targets = self._enrich_targets(link_ids)
+        summary = EnrichSummary(len(targets))
+        if not targets:
+            return summary.finish()
+
+        def store(link_id: str, page: PageMetadata) -> None:
+            summary.add(page, self._fill_description(link_id, page.summary()))
+            if show_progress and summary.done % CHECKPOINT == 0:
+                print(f"\rFetching descriptions... {summary.done} of {summary.total} pages, "
+                      f"{summary.filled} filled in", end="", flush=True)
+
+        def fetched(link_id: str, page: PageMetadata) -> None:
+            summary.fetched += 1
+            store(link_id, page)
+
+        def cached(link_id: str, page: PageMetadata) -> None:
+            summary.cached += 1
+            store(link_id, page)
+
+        cache = PageCache(cache_path or self.page_cache_file, ttl)
+        try:
+            MetadataFetcher(concurrency, cache=cache, **options).fetch(targets, fetched, cached)
+        except KeyboardInterrupt:
+            summary.interrupted = True
+        finally:
+            cache.close()
+        if show_progress and summary.done >= CHECKPOINT:
+            print()
+        return summary.finish()
+
+    def _links_window(self, offset: int = 0, limit: Optional[int] = None) -> Iterator[Any]:
+        """Links (or, if never accessed, their records) from position offset on, at most limit of them."""
+        return window(self.links.raw(), offset, limit)
+
+    def list_all(self, offset: int = 0, limit: Optional[int] = None) -> None:
+        """List links with their details; offset and limit select part of the listing."""
         if not self.links:
             print(colored("No links found.", "yellow"))
             return
-            
-        print("\n" + colored("All Links:", "light_blue"))
-        for index, link in enumerate(self.links):
-            print(
-                colored(f"[{index}] URL: {link.url}", "light_magenta"),
-                f"\nCategories: {', '.join(link.categories)}\nTags: {', '.join(link.tags)}"
-            )
-            if link.description:
-                print(f"Description: {link.description}")
-            print(f"Created: {link.created_at.split('T')[0]} | Last Updated: {link.last_updated.split('T')[0]}\n")
-
-    def list_links(self) -> None:
-        """List all links (URLs only)."""
+
+        out = Renderer()
+        out.render("\n" + out.colored("All Links:", "light_blue") + "\n", self._links_window(offset, limit),
+                   lambda index, link: link_entry(out, index, link, timestamps=True), start=offset)
+
+    def list_links(self, offset: int = 0, limit: Optional[int] = None) -> None:
+        """List links (URLs only); offset and limit select part of the listing."""
         if not self.links:
             print(colored("No links found.", "yellow"))
             return
-            
-        print(colored("Existing Links:", "light_blue"))
-        for index, link in enumerate(self.links):
-            print(colored(f"[{index}] {link.url}", "light_magenta"))
+
+        out = Renderer()
+        out.render(out.colored("Existing Links:", "light_blue") + "\n", self._links_window(offset, limit),
+                   lambda index, link: out.colored(f"[{index}] {link_url(link)}", "light_magenta") + "\n",
+                   start=offset)
+
+    @staticmethod
+    def _print_usage(header: str, usage: Iterable[Tuple[str, int]]) -> None:
+        """List category or tag names with the number of links using them."""
+        out = Renderer()
+        out.render(out.colored(header, "light_blue") + "\n", usage,
+                   lambda index, item: (f"{out.colored(f'[{index}] {item[0]}', 'light_magenta')}\n"
+                                        f"  Used in {item[1]} link{'s' if item[1] != 1 else ''}\n"))
 
     def list_categories(self) -> None:
         """List all categories."""
@@ -552,25 +1636,25 @@ class LinkManager:
             print(colored("No categories found.", "yellow"))
             return
             
-        print(colored("Existing Categories:", "light_blue"))
-        for index, cat in enumerate(sorted(self.categories)):
-            print(colored(f"[{index}] {cat}", "light_magenta"))
-            # Count links using this category
-            count = sum(1 for link in self.links if cat in link.categories)
-            print(f"  Used in {count} link{'s' if count != 1 else ''}")
+        self._print_usage("Existing Categories:", self.categories.items())
 
     def list_tags(self) -> None:
         """List all tags."""
         if not self.tags:
             print(colored("No tags found.", "yellow"))
             return
+            
+        self._print_usage("Existing Tags:", self.tags.items())
 
-        print(colored("Existing Tags:", "light_blue"))
-        for index, tag in enumerate(sorted(self.tags)):
-            print(colored(f"[{index}] {tag}", "light_magenta"))
-            # Count links using this tag
-            count = sum(tag in link.tags for link in self.links)
-            print(f"  Used in {count} link{'s' if count != 1 else ''}")
+    @staticmethod
+    def print_results(results: List[Link], offset: int = 0, limit: Optional[int] = None) -> None:
+        """Print search results; offset and limit select part of them."""
+        if not results:
+            print(colored("No matching links found.", "yellow"))
+            return
+        out = Renderer()
+        out.render(out.colored(f"Search Results ({len(results)} links found):", "light_blue") + "\n",
+                   window(results, offset, limit), lambda index, link: link_entry(out, index, link), start=offset)
 
     def query(self, interactive: bool = True, search_params: Dict[str, str] = None) -> List[Link]:
         # sourcery skip: low-code-quality
@@ -600,123 +1684,251 @@ class LinkManager:
                 print(colored("No search criteria provided.", "yellow"))
             return []
             
-        results = []
+        results = self._match_links(search_params, search_mode)
         
+        if interactive:
+            self.report_substitutions()
+            self.print_results(results)
+                
+        return results
+
+    def ranked_search(self, interactive: bool = True, query: str = None,
+                      k: int = DEFAULT_TOP_K) -> List[Tuple[float, Link]]:
+        """
+        Return the k links most relevant to a free-text query as (score, link), best first.
+        Words match whole words in any field, word* matches words starting with word and
+        "quoted words" match the exact phrase (see SearchIndex.rank).
+        """
+        if interactive:
+            query = input(colored('Search for (words, prefix*, "a phrase"): ', "light_blue")).strip()
+            count = input(colored(f"Number of results [{k}]: ", "light_blue")).strip()
+            if count.isdigit() and int(count) > 0:
+                k = int(count)
+
+        if not query or not parse_query(query):
+            if interactive:
+                print(colored("No search criteria provided.", "yellow"))
+            return []
+
+        results = self._rank(query, k)
+        if interactive:
+            self.print_ranked(results)
+        return results
+
+    def _rank(self, query: str, k: int) -> List[Tuple[float, Link]]:
+        return self._get_index().rank(query, k)
+
+    @staticmethod
+    def print_ranked(results: List[Tuple[float, Link]], offset: int = 0, limit: Optional[int] = None) -> None:
+        """Print ranked search results with their scores; offset and limit select part of them."""
+        if not results:
+            print(colored("No matching links found.", "yellow"))
+            return
+        out = Renderer()
+        out.render(out.colored(f"Top {len(results)} results:", "light_blue") + "\n", window(results, offset, limit),
+                   lambda index, result: link_entry(out, index, result[1], label=f"({result[0]:.2f}) URL: "),
+                   start=offset)
+
+    def rank_index(self, query: str, k: int = DEFAULT_TOP_K) -> Optional[List[Tuple[float, Link]]]:
+        """
+        Like ranked_search, but scores the links from the word postings of the index file
+        and only decodes the top k. Returns None if there is no index file matching the database.
+        """
+        index = DiskIndex.open(self.index_file, database_fingerprint(self.db))
+        if index is None:
+            return None
+        with index:
+            return [(score, Link.from_dict(record)) for score, record in index.rank(query, k)]
+
+    def _match_keys(self, search_params: Dict[str, str], search_mode: str = "AND", index: Any = None) -> Set[int]:
+        """
+        Return the keys of the links matching the search parameters in index (default: the
+        search index, with results cached in query_cache).
+        """
+        groups, exact_counts = [], {}
+        if index is not None:
+            matched = self._uncached_match_keys(index, search_params, search_mode, groups, exact_counts)
+            self.typo_substitutions = typo_substitutions(groups)
+            return matched
+
+        index = self._get_index()
+        cache_key = QueryCache.match_key(search_params, search_mode)
+        cached = self.query_cache.get(cache_key)
+        if cached is not None:
+            self.typo_substitutions = typo_substitutions(self.query_cache.groups(cache_key))
+            return cached
+        matched = self._uncached_match_keys(index, search_params, search_mode, groups, exact_counts)
+        self.query_cache.put(cache_key, matched, groups, exact_counts)
+        self.typo_substitutions = typo_substitutions(groups)
+        return matched
+
+    def _uncached_match_keys(self, index: Any, search_params: Dict[str, str], search_mode: str,
+                             groups: List[List[tuple]] = None, exact_counts: Dict[tuple, int] = None) -> Set[int]:
+        """
+        _match_keys without the cache. With groups, every term is searched (no early exit)
+        and the query is described in groups and exact_counts for QueryCache.put.
+        """
         if search_mode == "AND":
-            # Start with all links and filter down
-            results = self.links.copy()
-            
+            # Intersect per-attribute matches, stopping as soon as nothing is left
+            matched = None
             for attribute, key in search_params.items():
-                temp_results = []
-                for link in results:
-                    if attribute == "url" and key.lower() in link.url.lower():
-                        temp_results.append(link)
-                    elif attribute == "description" and key.lower() in link.description.lower():
-                        temp_results.append(link)
-                    elif attribute == "categories" and any(key.lower() in cat.lower() for cat in link.categories):
-                        temp_results.append(link)
-                    elif attribute == "tags" and any(key.lower() in tag.lower() for tag in link.tags):
-                        temp_results.append(link)
-                results = temp_results
+                terms = None if groups is None else []
+                keys = self._search(index, attribute, key, terms, exact_counts)
+                if terms is not None:
+                    groups.append(terms)  # Stays empty (never matches) for unknown attributes
+                matched = keys if matched is None else matched & keys
+                if not matched and groups is None:
+                    return set()
         else:  # OR logic
-            seen_links = set()
+            matched = set()
+            terms = None if groups is None else []
             for attribute, key in search_params.items():
-                for link in self.links:
-                    # Skip links we've already found
-                    if id(link) in seen_links:
-                        continue
-                        
-                    found = False
-                    if attribute == "url" and key.lower() in link.url.lower():
-                        found = True
-                    elif attribute == "description" and key.lower() in link.description.lower():
-                        found = True
-                    elif attribute == "categories" and any(key.lower() in cat.lower() for cat in link.categories):
-                        found = True
-                    elif attribute == "tags" and any(key.lower() in tag.lower() for tag in link.tags):
-                        found = True
-                        
-                    if found:
-                        results.append(link)
-                        seen_links.add(id(link))
-        
-        if interactive:
-            if results:
-                print(colored(f"Search Results ({len(results)} links found):", "light_blue"))
-                for index, link in enumerate(results):
-                    print(
-                        colored(f"[{index}] URL: {link.url}", "light_magenta"),
-                        f"\nCategories: {', '.join(link.categories)}\nTags: {', '.join(link.tags)}"
-                    )
-                    if link.description:
-                        print(f"Description: {link.description}\n")
-            else:
-                print(colored("No matching links found.", "yellow"))
-                
-        return results
+                matched |= self._search(index, attribute, key, terms, exact_counts)
+            if terms:
+                groups.append(terms)
 
-    def advanced_search(self) -> List[Link]:
-        """Advanced search with multiple criteria and boolean operators."""
-        print(colored("Advanced Search", "light_blue"))
+        return matched or set()
+
+    def query_index(self, search_params: Dict[str, str], search_mode: str = "AND") -> Optional[List[Link]]:
+        """
+        Search the index file instead of the loaded links, building Link objects only for
+        the matches. Returns None if there is no index file matching the database, in
+        which case the caller should load the database and use query. Typos in category
+        and tag terms are resolved as in query, against the names recorded in the index.
+        """
+        index = DiskIndex.open(self.index_file, database_fingerprint(self.db))
+        if index is None:
+            return None
+        with index:
+            search_params = {k: v for k, v in search_params.items() if v}
+            if not search_params:
+                return []
+            keys = self._match_keys(search_params, search_mode, index)
+            return [Link.from_dict(record) for record in index.resolve(keys)]
+
+    @staticmethod
+    def _search(index: Any, attribute: str, term: str, terms: List[tuple] = None,
+                exact_counts: Dict[tuple, int] = None, fuzzy: bool = True) -> Set[int]:
+        """
+        index.search, except that (with fuzzy) a category or tag term without any match is
+        taken as a typo and matched against the most similar names instead (see
+        SearchIndex.similar_names and DiskIndex.similar_names). Appends the term to terms and, for category/tag terms,
+        the number of exact matches to exact_counts, in the form QueryCache.put expects.
+        """
+        keys = index.search(attribute, term)
+        names = None
+        if fuzzy and not keys and term:
+            names = index.similar_names(attribute, term) or None
+        if terms is not None and attribute in FIELDS:
+            field_idx = FIELDS.index(attribute)
+            terms.append((field_idx, term.lower(), None if names is None else tuple(names)))
+            if attribute in NAME_FIELDS and term and names is None:
+                exact_counts[(field_idx, term.lower())] = len(keys)
+        if names is None:
+            return keys
+        return index.name_keys(attribute, names)
+
+    def _match_links(self, search_params: Dict[str, str], search_mode: str = "AND") -> List[Link]:
+        """Return the links matching the non-empty search parameters, in collection order."""
+        return self._get_index().resolve(self._match_keys(search_params, search_mode))
+
+    def _iter_matches(self, search_params: Dict[str, str], search_mode: str = "AND") -> Iterator[Link]:
+        """Like _match_links, but yields the links one at a time."""
+        return self._get_index().iter_resolve(self._match_keys(search_params, search_mode))
+
+    def _advanced_keys(self, url_list: List[str], desc_list: List[str],
+                       cat_list: List[str], tag_list: List[str], fuzzy: bool = True) -> Optional[Set[int]]:
+        """
+        Index keys matching any term of every non-empty field list, or None if all lists are
+        empty. Results are cached in query_cache. Without fuzzy, category and tag terms only
+        match exactly (no typo fallback, see _search) and the cache is not used.
+        """
+        term_lists = [url_list, desc_list, cat_list, tag_list]
+        self.typo_substitutions = []
+        if not any(term_lists):
+            return None
+        index = self._get_index()
+        cache_key = QueryCache.advanced_key(term_lists)
+        cached = self.query_cache.get(cache_key) if fuzzy else None
+        if cached is not None:
+            self.typo_substitutions = typo_substitutions(self.query_cache.groups(cache_key))
+            return cached
+
+        matched = None
+        groups, exact_counts = [], {}
+        for attribute, terms in zip(FIELDS, term_lists):
+            if not terms:
+                continue
+            keys = set()
+            group = []
+            for term in terms:
+                keys |= self._search(index, attribute, term, group, exact_counts, fuzzy)
+            groups.append(group)
+            matched = keys if matched is None else matched & keys
+        if fuzzy:
+            self.query_cache.put(cache_key, matched, groups, exact_counts)
+        self.typo_substitutions = typo_substitutions(groups)
+        return matched
+
+    def _advanced_match(self, url_list: List[str], desc_list: List[str],
+                        cat_list: List[str], tag_list: List[str]) -> List[Link]:
+        """Return the links matching any term of every non-empty field list (AND between fields)."""
+        return list(self._iter_advanced_matches(url_list, desc_list, cat_list, tag_list))
+
+    def _iter_advanced_matches(self, url_list: List[str], desc_list: List[str],
+                               cat_list: List[str], tag_list: List[str], fuzzy: bool = True) -> Iterator[Link]:
+        """Like _advanced_match, but yields the links one at a time (see _advanced_keys for fuzzy)."""
+        matched = self._advanced_keys(url_list, desc_list, cat_list, tag_list, fuzzy)
+        if matched is None:
+            return iter(self.links)
+        return self._get_index().iter_resolve(matched)
+
+    @staticmethod
+    def read_search_criteria() -> Dict[str, List[str]]:
+        """Ask for advanced search criteria; returns field -> terms (fields left blank are omitted)."""
         print("Enter search criteria. Multiple terms separated by commas will be treated as OR.")
         print("Leave blank to skip a field.\n")
-        
+
         url_terms = input(colored("URL contains: ", "light_blue")).strip()
         desc_terms = input(colored("Description contains: ", "light_blue")).strip()
         cat_terms = input(colored("Categories (comma-separated OR): ", "light_blue")).strip()
         tag_terms = input(colored("Tags (comma-separated OR): ", "light_blue")).strip()
-        
+
         # Split terms by comma
-        url_list = [t.strip() for t in url_terms.split(",")] if url_terms else []
-        desc_list = [t.strip() for t in desc_terms.split(",")] if desc_terms else []
-        cat_list = [t.strip() for t in cat_terms.split(",")] if cat_terms else []
-        tag_list = [t.strip() for t in tag_terms.split(",")] if tag_terms else []
-        
-        results = []
-        for link in self.links:
-            # URL check
-            url_match = not url_list or any(term.lower() in link.url.lower() for term in url_list)
-            
-            # Description check
-            desc_match = not desc_list or any(term.lower() in link.description.lower() for term in desc_list)
-            
-            # Category check
-            cat_match = not cat_list or any(
-                any(term.lower() in cat.lower() for cat in link.categories)
-                for term in cat_list
-            )
-            
-            # Tag check
-            tag_match = not tag_list or any(
-                any(term.lower() in tag.lower() for tag in link.tags)
-                for term in tag_list
-            )
-            
-            # All criteria must match (AND logic between fields)
-            if url_match and desc_match and cat_match and tag_match:
-                results.append(link)
-        
-        if results:
-            print(colored(f"Search Results ({len(results)} links found):", "light_blue"))
-            for index, link in enumerate(results):
-                print(
-                    colored(f"[{index}] URL: {link.url}", "light_magenta"),
-                    f"\nCategories: {', '.join(link.categories)}\nTags: {', '.join(link.tags)}"
-                )
-                if link.description:
-                    print(f"Description: {link.description}\n")
-        else:
-            print(colored("No matching links found.", "yellow"))
-            
+        criteria = {}
+        for field, terms in zip(FIELDS, (url_terms, desc_terms, cat_terms, tag_terms)):
+            if terms:
+                criteria[field] = [t.strip() for t in terms.split(",")]
+        return criteria
+
+    def advanced_search(self) -> List[Link]:
+        """Advanced search with multiple criteria and boolean operators."""
+        print(colored("Advanced Search", "light_blue"))
+        criteria = self.read_search_criteria()
+
+        results = self._advanced_match(*(criteria.get(field, []) for field in FIELDS))
+
+        self.report_substitutions()
+        self.print_results(results)
         return results
+
+    def report_substitutions(self) -> None:
+        """Tell the user which similar names the last search used for category/tag typos."""
+        for attribute, term, names in self.typo_substitutions:
+            report_similar_names(attribute, term, names)
         
     def edit_link(self, index: int) -> bool:
         """Edit a link's properties interactively."""
-        if index >= len(self.links) or index < 0:
-            print("Error: Index is out of range.")
-            return False
+        link = self._link_at(index)
+        return link is not None and self._edit(link)
+
+    def edit_link_by_id(self, link_id: str) -> bool:
+        """Edit the properties of the link with the given id interactively."""
+        link = self._link_with_id(link_id)
+        return link is not None and self._edit(link)
 
-        link = self.links[index]
+    def _edit(self, link: Link) -> bool:
+        old_state = self._link_state(link)
         print(colored(f"Editing link: {link.url}", "light_blue"))
         print("Press Enter to keep current values, or enter new values.")
 
@@ -733,10 +1945,6 @@ class LinkManager:
             link.categories = []
         elif new_cats:
             link.categories = [cat.strip() for cat in new_cats.split(",")]
-            # Update global categories
-            for cat in link.categories:
-                if cat and cat not in self.categories:
-                    self.categories.append(cat)
 
         # Tags
         print(f"Current tags: {', '.join(link.tags)}")
@@ -745,13 +1953,9 @@ class LinkManager:
             link.tags = []
         elif new_tags:
             link.tags = [tag.strip() for tag in new_tags.split(",")]
-            # Update global tags
-            for tag in link.tags:
-                if tag and tag not in self.tags:
-                    self.tags.append(tag)
 
-        # Refresh categories and tags
-        self._refresh_categories_and_tags()
+        # Update index and category/tag registries
+        self._link_changed(link, old_state)
         print("Link updated successfully.")
         return True
 
@@ -763,6 +1967,10 @@ def bulk_operations_menu(link_collection):
     print("2. Add category to multiple links")
     print("3. Remove tag from all links")
     print("4. Remove category from all links")
+    print("5. Remove duplicate links")
+    print("6. Add/remove tags and categories on links matching a search")
+    print("7. Rename or merge tags")
+    print("8. Rename or merge categories")
     print("0. Return to main menu")
 
     choice = input(colored("[BULK]> ", "light_green")).strip()
@@ -817,6 +2025,44 @@ def bulk_operations_menu(link_collection):
             count = link_collection.bulk_remove_category(category)
             print(f"Removed category '{category}' from {count} links.")
 
+    elif choice == "5":
+        # Merge links with the same normalized URL
+        count = link_collection.dedupe_links()
+        print(f"Removed {count} duplicate links.")
+
+    elif choice == "6":
+        # Change every link matching advanced search criteria in one pass
+        criteria = link_collection.read_search_criteria()
+        if not criteria:
+            confirm = input(f"No criteria given. Change all {len(link_collection.links)} links? (y/n): ")
+            if confirm.strip().lower() != "y":
+                return
+
+        def names(prompt: str) -> List[str]:
+            return [name.strip() for name in input(prompt).split(",") if name.strip()]
+
+        summary = link_collection.bulk_update(
+            criteria,
+            add_tags=names("Tags to add (comma-separated): "),
+            remove_tags=names("Tags to remove (comma-separated): "),
+            add_categories=names("Categories to add (comma-separated): "),
+            remove_categories=names("Categories to remove (comma-separated): "))
+        print(summary)
+
+    elif choice in ("7", "8"):
+        # Rename a tag/category, or merge several into one
+        if choice == "7":
+            link_collection.list_tags()
+            label, merge = "Tags", link_collection.merge_tags
+        else:
+            link_collection.list_categories()
+            label, merge = "Categories", link_collection.merge_categories
+        sources = [name.strip() for name in input(f"{label} to rename or merge (comma-separated): ").split(",")
+                   if name.strip()]
+        target = input("New name: ").strip()
+        if sources and target:
+            print(merge(sources, target))
+
     elif choice == "0":
         return
     else:
@@ -827,7 +2073,9 @@ def import_export_menu(link_collection):
     """Menu for import/export operations."""
     print(colored("\nImport/Export Menu:", "light_blue"))
     print("1. Import links from CSV")
-    print("2. Export links to CSV")
+    print("2. Export links (CSV, JSON Lines or columnar)")
+    print("3. Import browser bookmarks (HTML)")
+    print("4. Fill in missing descriptions from the linked pages")
     print("0. Return to main menu")
 
     choice = input(colored("[IMPORT/EXPORT]> ", "light_green")).strip()
@@ -838,15 +2086,38 @@ def import_export_menu(link_collection):
             print(result)
 
     elif choice == "2":
-        # Export to CSV
-        default_path = os.path.join(os.path.dirname(link_collection.db), "links_export.csv")
-        file_path = input(f"Enter CSV file path [{default_path}]: ").strip()
+        export_format = input(f"Format ({'/'.join(EXPORT_FORMATS)}) [csv]: ").strip().lower() or "csv"
+        if export_format not in EXPORT_FORMATS:
+            print("Invalid format.")
+            return
+
+        default_path = os.path.join(os.path.dirname(link_collection.db),
+                                    "links_export" + DEFAULT_EXTENSIONS[export_format])
+        file_path = input(f"Enter export file path [{default_path}]: ").strip()
         if not file_path:
             file_path = default_path
 
-        result = link_collection.export_to_csv(file_path)
+        advanced = None
+        if input("Only export links matching a search? (y/n): ").strip().lower() == 'y':
+            print("Multiple terms separated by commas will be treated as OR. Leave blank to skip a field.")
+            advanced = {}
+            for field, prompt in (("url", "URL contains: "), ("description", "Description contains: "),
+                                  ("categories", "Categories: "), ("tags", "Tags: ")):
+                terms = input(colored(prompt, "light_blue")).strip()
+                advanced[field] = [t.strip() for t in terms.split(",")] if terms else []
+
+        result = link_collection.export_links(file_path, export_format, advanced=advanced)
         print(result)
 
+    elif choice == "3":
+        if file_path := input("Enter bookmark HTML file path: ").strip():
+            result = link_collection.import_bookmarks(file_path)
+            print(result)
+
+    elif choice == "4":
+        print("Fetching the title and description of every link without a description (Ctrl+C to stop)...")
+        print(link_collection.enrich_descriptions())
+
     elif choice == "0":
         return
     else:
@@ -4,6 +4,13 @@ import sys   # Used in command-line argument handling
 import argparse  # Used for command-line argument parsing
 
 from . import Link, LinkManager, bulk_operations_menu, import_export_menu, backup_restore_menu  # Used throughout the code
+from . import SQLiteLinkManager, is_sqlite_path, migrate_json_to_sqlite  # Used for the SQLite backend
+from .export import EXPORT_FORMATS  # Used for the --format choices
+from .index import DEFAULT_TOP_K  # Used for the --top default
+from .daemon import DaemonClient, serve, socket_path  # Used for --daemon and forwarding --add/--query
+from .link import report_similar_names  # Used for the typo notices of queries answered by the daemon
+from .render import Renderer, window  # Used for --query/--list output
+from .linkcheck import DEFAULT_CONCURRENCY  # Used for the --concurrency default
 from termcolor import colored  # Used for text coloring in multiple places
 
 
@@ -28,6 +35,9 @@ class HelpManager:
                    "11. Bulk operations\n"
                    "12. Import/Export\n"
                    "13. Backup/Restore\n"
+                   "14. Ranked Search\n"
+                   "15. Check link health\n"
+                   "16. List broken links\n"
                    "20. Exit",
             
             "extensive": (
@@ -43,8 +53,11 @@ class HelpManager:
                 "[9, edit]: Edit a link's properties\n"
                 "[10, rm, remove]: Remove a link from the database\n"
                 "[11, bulk]: Bulk operations menu (add/remove tags or categories)\n"
-                "[12, import, export]: Import/Export links from/to CSV\n"
+                "[12, import, export]: Import links from CSV or browser bookmarks, export them to CSV/JSONL/columnar\n"
                 "[13, backup, restore]: Backup or restore the database\n"
+                "[14, rank, search, s]: Search all fields by relevance (words, prefix*, \"phrases\"), best matches first\n"
+                "[15, check, health]: Check in the background that every link still resolves; again to show progress\n"
+                "[16, broken, dead]: List the links whose last check failed\n"
                 "[20, exit, close, quit]: Save and exit the application"
             )
         }
@@ -58,10 +71,14 @@ class HelpManager:
         print(colored(self.helpdata["extensive"], "light_magenta"))
 
 #FIXME: Just a Note: This might be buggy. Changing the install scripts and Project setup overwrote my previous db. However it appears to still work as I could not reproduce this. 
-def db_setup():
-    """Set up the database directory and file."""
+def db_setup(db_name: str = None):
+    """
+    Set up the database directory and file.
+    The file name (default: $LINKMANAGER_DB or links.json) selects the storage backend:
+    .db/.sqlite/.sqlite3 use SQLite, anything else the JSON format.
+    """
     link_dir = "LinkManager"
-    db_name = "links.json"
+    db_name = db_name or os.environ.get("LINKMANAGER_DB", "links.json")
 
     # Get user's home directory
     home_directory = os.path.expanduser('~')
@@ -79,19 +96,76 @@ def db_setup():
 
     # Create empty database file if it doesn't exist
     if not os.path.exists(db_path): 
-        with open(db_path, 'w') as db:
-            json.dump({"links": [], "categories": [], "tags": []}, db)
-            print(f'Database created under: {db_path}')
+        if is_sqlite_path(db_path):
+            SQLiteLinkManager(db_path).close()  # Creates the schema
+        else:
+            with open(db_path, 'w') as db:
+                json.dump({"links": [], "categories": [], "tags": []}, db)
+        print(f'Database created under: {db_path}')
 
     return db_path
 
 
-def main():    # sourcery skip: low-code-quality
+def open_link_manager(db_path: str, lazy: bool = False) -> LinkManager:
+    """
+    Create the LinkManager matching the database file type.
+    lazy=True defers building Link objects until they are used (for one-shot commands).
+    JSON databases keep a persistent search index file for --query.
+    """
+    if is_sqlite_path(db_path):
+        return SQLiteLinkManager(db_path)
+    return LinkManager(db_path, journaled=True, lazy=lazy, persistent_index=True)
+
+
+def print_window(header: str, results: list, args: argparse.Namespace, format_line) -> None:
+    """Print one line per result within --offset/--limit, in buffered pages."""
+    out = Renderer()
+    out.render(header + "\n", window(results, args.offset, args.limit), lambda index, result: format_line(result) + "\n")
+
+
+def run_with_daemon(db_path: str, args: argparse.Namespace, search_params: dict) -> bool:
+    """
+    Send --add or --query to the daemon serving db_path, if one is running, and print its answer.
+    Returns False if there is no daemon, so that the caller handles the command itself.
+    """
+    client = DaemonClient(socket_path(db_path))
+    if args.add:
+        response = client.request("add", url=args.add)
+    elif args.rank:
+        response = client.request("query", query=args.query, rank=True, k=args.top)
+    else:
+        response = client.request("query", params=search_params)
+    if response is None:
+        return False
+
+    if response.get("output"):
+        print(response["output"])
+    if not response.get("ok"):
+        print(f"Error: {response.get('error')}")
+    elif args.add:
+        return True  # The output printed above already reports the add
+    elif args.rank:
+        print(f"Searching for: {args.query}")
+        print_window(f"Top {len(response['result'])} matching links:", response["result"], args,
+                     lambda result: f"{result[0]:6.2f}  URL: {result[1]['url']}")
+    else:
+        print(f"Searching for: {args.query}")
+        for attribute, term, names in response.get("substitutions", []):
+            report_similar_names(attribute, term, names)
+        print_window(f"Found {len(response['result'])} matching links:", response["result"], args,
+                     lambda link: f"URL: {link['url']}")
+    return True
+
+
+def main(db_name: str = None):    # sourcery skip: low-code-quality
     """Main function for the LinkManager CLI."""
+    check = None  # Background link check, its results are applied between commands
     # Setup
     try:
-        db_path = db_setup()
-        link_collection = LinkManager(db_path)
+        # Long-running sessions keep timestamps as integers to save memory
+        Link.compact_timestamps = True
+        db_path = db_setup(db_name)
+        link_collection = open_link_manager(db_path)
         link_collection.load_from_db()
         help_mgr = HelpManager()
 
@@ -101,6 +175,12 @@ def main():    # sourcery skip: low-code-quality
 
         while True:
             try:
+                if check is not None:
+                    check.apply()
+                    if check.done:
+                        print(colored(f"Link check finished: {check.summary}", "light_blue"))
+                        check = None
+
                 print("\nEnter Command")
                 choice = input(colored("[>>]: ", "light_green")).strip().lower()
 
@@ -160,7 +240,24 @@ def main():    # sourcery skip: low-code-quality
                 elif choice in ["13", "backup", "restore"]:
                     backup_restore_menu(link_collection)
 
+                elif choice in ["14", "rank", "search", "s"]:
+                    link_collection.ranked_search()
+
+                elif choice in ["15", "check", "health"]:
+                    if check is None:
+                        check = link_collection.start_link_check()
+                        print(f"Checking {check.summary.total} links in the background; "
+                              "results are stored as they arrive.")
+                    else:
+                        print(f"Link check running: {check.summary.checked} of {check.summary.total} links checked.")
+
+                elif choice in ["16", "broken", "dead"]:
+                    link_collection.list_broken_links()
+
                 elif choice in ["20", "exit", "close", "quit"]:
+                    if check is not None and not check.done:
+                        print("Stopping the link check...")
+                        check.cancel()
                     print("Saving data and exiting...")
                     link_collection.save_to_db()
                     print("Goodbye!")
@@ -180,6 +277,8 @@ def main():    # sourcery skip: low-code-quality
         print(f"Fatal error: {e}")
     finally:
         try:
+            if check is not None:
+                check.apply()
             link_collection.save_to_db()
             print("Link data saved successfully.")
         except Exception as e:
@@ -191,50 +290,155 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="LinkManager - CLI tool for managing and querying collections of links.")
     parser.add_argument('--add', help="Add a link with the given URL", metavar="URL")
     parser.add_argument('--query', help="Search for links containing the given text", metavar="QUERY")
-    parser.add_argument('--export', help="Export links to CSV file", metavar="FILENAME")
+    parser.add_argument('--rank', action='store_true', help="Rank --query results by relevance (words, prefix*, \"phrases\") instead of matching substrings")
+    parser.add_argument('--top', type=int, default=DEFAULT_TOP_K, help=f"Number of ranked results to show (default: {DEFAULT_TOP_K})", metavar="K")
+    parser.add_argument('--list', action='store_true', help="List links with their details")
+    parser.add_argument('--limit', type=int, help="Show at most N links of --list/--query", metavar="N")
+    parser.add_argument('--offset', type=int, default=0, help="Skip the first N links of --list/--query", metavar="N")
+    parser.add_argument('--export', help="Export links to a file (with --query, only the matching links)", metavar="FILENAME")
+    parser.add_argument('--format', choices=EXPORT_FORMATS, help="Format of the --export file (default: from its extension, else csv)")
     parser.add_argument('--import', dest='import_file', help="Import links from CSV file", metavar="FILENAME")
+    parser.add_argument('--import-bookmarks', nargs='+', help="Import HTML bookmark files exported from browsers", metavar="FILENAME")
+    parser.add_argument('--workers', type=int, default=0, help="Worker processes used to parse --import/--import-bookmarks files", metavar="N")
     parser.add_argument('--backup', action='store_true', help="Create a backup of the database")
+    parser.add_argument('--dedupe', action='store_true', help="Merge links whose URLs are duplicates of each other")
+    parser.add_argument('--rename-tag', nargs=2, help="Rename a tag on every link (merging it into NEW if that exists)", metavar=("OLD", "NEW"))
+    parser.add_argument('--rename-category', nargs=2, help="Rename a category on every link (merging it into NEW if that exists)", metavar=("OLD", "NEW"))
+    parser.add_argument('--merge-tags', nargs='+', help="Merge tags into the last one given", metavar="TAG")
+    parser.add_argument('--merge-categories', nargs='+', help="Merge categories into the last one given", metavar="CATEGORY")
+    parser.add_argument('--check-links', action='store_true', help="Check that every link still resolves and list the broken ones")
+    parser.add_argument('--enrich', action='store_true', help="Fill in missing descriptions from the titles and meta descriptions of the linked pages; with --import/--import-bookmarks, after importing")
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY, help=f"Requests in flight at once for --check-links/--enrich (default: {DEFAULT_CONCURRENCY})", metavar="N")
+    parser.add_argument('--db', help="Database file name inside ~/LinkManager (.json or .db for SQLite)", metavar="NAME")
+    parser.add_argument('--migrate-sqlite', action='store_true', help="Copy links.json into a SQLite database (links.db or --db)")
+    parser.add_argument('--daemon', action='store_true', help="Keep the database loaded and serve --add/--query of other invocations until stopped")
+    parser.add_argument('--stop-daemon', action='store_true', help="Stop the running daemon")
+    parser.add_argument('--no-daemon', action='store_true', help="Handle --add/--query here even if a daemon is running")
     
     args = parser.parse_args()
+    operations = [args.add, args.query, args.export, args.import_file, args.import_bookmarks, args.backup, args.dedupe, args.migrate_sqlite,
+                  args.daemon, args.stop_daemon, args.list, args.rename_tag, args.rename_category, args.merge_tags,
+                  args.merge_categories, args.check_links, args.enrich]
     
-    # Handle command line operations if any arguments are provided
-    if len(sys.argv) > 1:
+    # Handle command line operations if any are requested
+    if any(operations):
         try:
-            db_path = db_setup()
-            link_collection = LinkManager(db_path)
-            link_collection.load_from_db()
+            if args.migrate_sqlite:
+                json_path = db_setup("links.json")
+                sqlite_path = os.path.join(os.path.dirname(json_path), args.db or "links.db")
+                print(migrate_json_to_sqlite(json_path, sqlite_path))
+                sys.exit(0)
+
+            db_path = db_setup(args.db)
+            if args.daemon:
+                # Long-running sessions keep timestamps as integers to save memory
+                Link.compact_timestamps = True
+                serve(open_link_manager(db_path), socket_path(db_path))
+                sys.exit(0)
+
+            if args.stop_daemon:
+                response = DaemonClient(socket_path(db_path)).request("shutdown")
+                print("Daemon stopped." if response else "No daemon is running.")
+                sys.exit(0)
+
+            search_params = None
+            if args.query:
+                search_params = {"url": args.query, "description": args.query, "categories": args.query, "tags": args.query}
+
+            # Adds and queries are answered by the daemon if one is running
+            if (args.add or args.query) and not (args.export or args.no_daemon):
+                if run_with_daemon(db_path, args, search_params):
+                    sys.exit(0)
+
+            link_collection = open_link_manager(db_path, lazy=True)
+
+            # A plain query is answered from the index file if it is up to date
+            results = None
+            if args.query and not (args.add or args.export) and link_collection.persistent_index:
+                if args.rank:
+                    results = link_collection.rank_index(args.query, args.top)
+                else:
+                    results = link_collection.query_index(search_params)
+            if results is None:
+                link_collection.load_from_db()
             
             if args.add:
                 print(f"Adding link: {args.add}")
-                link = Link(args.add)
-                link_collection.links.append(link)
-                link_collection.save_to_db()
-                print("Link added successfully.")
+                # add_link reports whether the link was added or merged into an existing one
+                if link_collection.add_link(interactive=False, url=args.add) is not None:
+                    link_collection.save_to_db()
                 
-            elif args.query:
-                print(f"Searching for: {args.query}")
-                search_params = {"url": args.query, "description": args.query, "categories": args.query, "tags": args.query}
-                results = link_collection.query(interactive=False, search_params=search_params)
-                print(f"Found {len(results)} matching links:")
-                for link in results:
-                    print(f"URL: {link.url}")
-                    
             elif args.export:
-                result = link_collection.export_to_csv(args.export)
+                result = link_collection.export_links(args.export, args.format, search_params=search_params)
                 print(result)
+
+            elif args.query and args.rank:
+                print(f"Searching for: {args.query}")
+                if results is None:
+                    results = link_collection.ranked_search(interactive=False, query=args.query, k=args.top)
+                print_window(f"Top {len(results)} matching links:", results, args,
+                             lambda result: f"{result[0]:6.2f}  URL: {result[1].url}")
+
+            elif args.query:
+                print(f"Searching for: {args.query}")
+                if results is None:
+                    results = link_collection.query(interactive=False, search_params=search_params)
+                link_collection.report_substitutions()
+                print_window(f"Found {len(results)} matching links:", results, args, lambda link: f"URL: {link.url}")
                 
+            elif args.list:
+                link_collection.list_all(args.offset, args.limit)
+
             elif args.import_file:
-                result = link_collection.bulk_import_from_csv(args.import_file)
+                result = link_collection.bulk_import_from_csv(args.import_file, workers=args.workers)
                 print(result)
+                if args.enrich:
+                    print(link_collection.enrich_descriptions(concurrency=args.concurrency))
+                link_collection.save_to_db()
+
+            elif args.import_bookmarks:
+                result = link_collection.import_bookmarks(args.import_bookmarks, workers=args.workers)
+                print(result)
+                if args.enrich:
+                    print(link_collection.enrich_descriptions(concurrency=args.concurrency))
                 link_collection.save_to_db()
                 
             elif args.backup:
                 result = link_collection._create_backup()
                 print(result)
+
+            elif args.dedupe:
+                count = link_collection.dedupe_links()
+                link_collection.save_to_db()
+                print(f"Removed {count} duplicate links.")
+
+            elif args.rename_tag or args.rename_category or args.merge_tags or args.merge_categories:
+                if args.rename_tag:
+                    summary = link_collection.rename_tag(*args.rename_tag)
+                elif args.rename_category:
+                    summary = link_collection.rename_category(*args.rename_category)
+                elif args.merge_tags:
+                    summary = link_collection.merge_tags(args.merge_tags[:-1], args.merge_tags[-1])
+                else:
+                    summary = link_collection.merge_categories(args.merge_categories[:-1], args.merge_categories[-1])
+                link_collection.save_to_db()
+                print(summary)
+
+            elif args.check_links:
+                print("Checking links...")
+                summary = link_collection.check_links(concurrency=args.concurrency)
+                link_collection.save_to_db()
+                print(summary)
+                link_collection.list_broken_links()
+
+            elif args.enrich:
+                summary = link_collection.enrich_descriptions(concurrency=args.concurrency)
+                link_collection.save_to_db()
+                print(summary)
                 
         except Exception as e:
             print(f"Error: {e}")
         sys.exit(0)
     
     # Otherwise start the interactive CLI
-    main()
\ No newline at end of file
+    main(args.db)
\ No newline at end of file
@@ -0,0 +1,271 @@
+import time  # Used (elapsed time)
+import queue  # Used (handing results to the main thread)
+import asyncio  # Used (concurrent checks)
+import threading  # Used (background checks)
+from collections import deque  # Used (batch queue)
+from datetime import datetime  # Used (check timestamps)
+from operator import itemgetter  # Used (target URLs)
+from urllib.parse import urlsplit  # Used (hosts that refuse HEAD)
+from typing import List, Dict, Set, Tuple, Optional, Any, Callable, Iterable  # Used (type hints)
+from .httpclient import HTTPClient, HTTPError, host_batches, DEFAULT_PER_HOST, DEFAULT_TIMEOUT  # Used (HTTP requests)
+
+DEFAULT_CONCURRENCY = 32  # Requests in flight at once
+DEFAULT_RATE = 4.0  # Requests per second to one host
+# Statuses after which a HEAD request is retried as GET, for servers that mishandle HEAD
+HEAD_RETRY_STATUSES = (400, 403, 405, 406, 429, 500, 501, 503)
+# Statuses that say a server does not support HEAD at all; its other links are checked with GET
+HEAD_UNSUPPORTED_STATUSES = (405, 501)
+# Bytes of a GET response read: small bodies are read to the end so the connection can be reused
+GET_BODY_LIMIT = 64 * 1024
+
+# (link id, URL, ETag, Last-Modified) of a link to check
+CheckTarget = Tuple[str, str, Optional[str], Optional[str]]
+
+
+class LinkCheck:
+    """
+    Outcome of the last health check of a link: the HTTP status (0 if no response was
+    received, with the reason in error), the latency in seconds, when it was checked, and
+    the validators the server sent, which make the next check a conditional request.
+    """
+
+    __slots__ = ("status", "latency", "checked_at", "etag", "last_modified", "error")
+
+    def __init__(self, status: int, latency: float, checked_at: str, etag: Optional[str] = None,
+                 last_modified: Optional[str] = None, error: Optional[str] = None):
+        self.status = status
+        self.latency = latency
+        self.checked_at = checked_at
+        self.etag = etag
+        self.last_modified = last_modified
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        """Whether the link answered with a success, redirect or not-modified status."""
+        return 0 < self.status < 400
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {"status": self.status, "latency": round(self.latency, 4), "checked_at": self.checked_at}
+        for field in ("etag", "last_modified", "error"):
+            if getattr(self, field) is not None:
+                data[field] = getattr(self, field)
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LinkCheck":
+        return cls(data.get("status", 0), data.get("latency", 0.0), data.get("checked_at", ""),
+                   data.get("etag"), data.get("last_modified"), data.get("error"))
+
+    def __str__(self) -> str:
+        outcome = f"HTTP {self.status}" if self.status else f"unreachable ({self.error})"
+        return f"{outcome}, {self.latency * 1000:.0f} ms, checked {self.checked_at[:19]}"
+
+
+class CheckSummary:
+    """Counts of the outcomes of a link check run."""
+
+    def __init__(self, total: int = 0):
+        self.total = total  # Links to check
+        self.checked = 0
+        self.ok = 0
+        self.not_modified = 0  # Conditional requests answered with 304
+        self.broken = 0  # Answered with an error status
+        self.unreachable = 0  # No response
+        self.started = time.perf_counter()
+        self.finished: Optional[float] = None
+
+    @property
+    def elapsed(self) -> float:
+        return (self.finished or time.perf_counter()) - self.started
+
+    def finish(self) -> "CheckSummary":
+        """Stop the clock."""
+        self.finished = time.perf_counter()
+        return self
+
+    def add(self, check: LinkCheck) -> None:
+        self.checked += 1
+        if check.status == 304:
+            self.not_modified += 1
+        if check.ok:
+            self.ok += 1
+        elif check.status:
+            self.broken += 1
+        else:
+            self.unreachable += 1
+
+    def __str__(self) -> str:
+        return (f"{self.checked} of {self.total} links checked: {self.ok} ok ({self.not_modified} not modified), "
+                f"{self.broken} broken, {self.unreachable} unreachable ({self.elapsed:.2f}s)")
+
+
+def check_targets(items: Iterable[Any]) -> List[CheckTarget]:
+    """Check targets for links, given as Link objects or database records."""
+    targets = []
+    for item in items:
+        if isinstance(item, dict):
+            link_id, url, check = item["id"], item["url"], item.get("check") or {}
+            targets.append((link_id, url, check.get("etag"), check.get("last_modified")))
+        else:
+            check = item.check
+            targets.append((item.id, item.url, check and check.etag, check and check.last_modified))
+    return targets
+
+
+class LinkChecker:
+    """
+    Checks many links concurrently with HTTPClient.
+
+    Each link is requested with HEAD (retried as GET for servers that reject HEAD), as a
+    conditional request when the previous check stored an ETag or Last-Modified, so an
+    unchanged page costs a 304 without a body. At most concurrency requests are in flight.
+    The links of a host are checked one after another by at most per_host workers, which
+    keeps reusing the same connections and lets the client pace them to rate requests per
+    second; different hosts are checked in parallel.
+
+    connect_to is passed on to HTTPClient, e.g. to check against a local stand-in server.
+    """
+
+    def __init__(self, concurrency: int = DEFAULT_CONCURRENCY, per_host: int = DEFAULT_PER_HOST,
+                 rate: Optional[float] = DEFAULT_RATE, timeout: float = DEFAULT_TIMEOUT,
+                 connect_to: Optional[Tuple[str, int]] = None):
+        self.concurrency = max(1, concurrency)
+        self.per_host = max(1, per_host)
+        self.rate = rate
+        self.timeout = timeout
+        self.connect_to = connect_to
+        self.connections_opened = 0
+        self._cancelled = False
+        self._get_hosts: Set[str] = set()  # Hosts that refused HEAD
+
+    def cancel(self) -> None:
+        """Stop a running check after the requests in flight; safe to call from another thread."""
+        self._cancelled = True
+
+    async def check_one(self, client: HTTPClient, target: CheckTarget) -> LinkCheck:
+        """Check one link."""
+        _, url, etag, last_modified = target
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        started = time.perf_counter()
+        checked_at = datetime.now().isoformat()
+        try:
+            host = urlsplit(url).hostname
+            response = None
+            if host not in self._get_hosts:
+                response = await client.request("HEAD", url, headers)
+                if response.status in HEAD_UNSUPPORTED_STATUSES:
+                    self._get_hosts.add(host)
+            if response is None or response.status in HEAD_RETRY_STATUSES:
+                # Only the status is needed; a large body is not read to the end
+                response = await client.request("GET", url, headers, body_limit=GET_BODY_LIMIT)
+        except (HTTPError, ValueError) as e:
+            return LinkCheck(0, time.perf_counter() - started, checked_at, error=str(e))
+        if response.status == 304:
+            # Unchanged: the validators sent with the request stay valid
+            return LinkCheck(304, response.elapsed, checked_at, response.header("etag") or etag,
+                             response.header("last-modified") or last_modified)
+        if response.status >= 400:
+            return LinkCheck(response.status, response.elapsed, checked_at)
+        return LinkCheck(response.status, response.elapsed, checked_at, response.header("etag"),
+                         response.header("last-modified"))
+
+    async def run(self, targets: List[CheckTarget], on_result: Callable[[str, LinkCheck], None]) -> None:
+        """Check every target, calling on_result(link id, LinkCheck) as each check completes."""
+        self._cancelled = False
+        self._get_hosts.clear()
+        batches = deque(host_batches(targets, itemgetter(1), self.per_host))
+        client = HTTPClient(self.per_host, self.rate, self.timeout, connect_to=self.connect_to,
+                            max_idle=max(self.concurrency, 1) * 2)
+
+        async def worker() -> None:
+            while batches and not self._cancelled:
+                for target in batches.popleft():
+                    if self._cancelled:
+                        return
+                    on_result(target[0], await self.check_one(client, target))
+
+        async with client:
+            await asyncio.gather(*(worker() for _ in range(min(self.concurrency, len(batches)))))
+        self.connections_opened = client.connections_opened
+
+    def check(self, targets: List[CheckTarget],
+              on_result: Optional[Callable[[str, LinkCheck], None]] = None) -> Dict[str, LinkCheck]:
+        """Synchronous form of run; returns link id -> LinkCheck."""
+        results: Dict[str, LinkCheck] = {}
+
+        def collect(link_id: str, check: LinkCheck) -> None:
+            results[link_id] = check
+            if on_result is not None:
+                on_result(link_id, check)
+
+        asyncio.run(self.run(targets, collect))
+        return results
+
+
+class BackgroundCheck:
+    """
+    Runs a LinkChecker on its own event loop in a worker thread, so an interactive session
+    stays responsive while links are checked.
+
+    The worker only queues results; apply() stores them on the links through the manager
+    and must be called from the thread that uses the manager (the interactive loop calls it
+    between commands), so the manager is never touched by two threads at once.
+    """
+
+    def __init__(self, manager: Any, checker: LinkChecker, targets: List[CheckTarget]):
+        self.manager = manager
+        self.checker = checker
+        self.summary = CheckSummary(len(targets))
+        self.error: Optional[BaseException] = None
+        self._targets = targets
+        self._results: "queue.SimpleQueue[Tuple[str, LinkCheck]]" = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="link-check", daemon=True)
+
+    def start(self) -> "BackgroundCheck":
+        self._thread.start()
+        return self
+
+    def _run(self) -> None:
+        try:
+            asyncio.run(self.checker.run(self._targets, lambda link_id, check: self._results.put((link_id, check))))
+        except Exception as e:
+            self.error = e
+
+    @property
+    def running(self) -> bool:
+        return self._thread.is_alive()
+
+    @property
+    def done(self) -> bool:
+        """Whether the check has finished and all of its results were applied."""
+        return not self.running and self._results.empty()
+
+    def apply(self) -> int:
+        """Store the results received so far on their links; returns how many were applied."""
+        applied = 0
+        while True:
+            try:
+                link_id, check = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if self.manager.record_check(link_id, check):
+                self.summary.add(check)
+                applied += 1
+        if self.done and self.summary.finished is None:
+            self.summary.finish()
+        return applied
+
+    def wait(self, timeout: Optional[float] = None) -> int:
+        """Wait for the check to finish, then apply its results."""
+        self._thread.join(timeout)
+        return self.apply()
+
+    def cancel(self, timeout: Optional[float] = None) -> int:
+        """Stop the check, wait for the requests in flight and apply the results received."""
+        self.checker.cancel()
+        return self.wait(timeout)
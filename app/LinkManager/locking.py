@@ -0,0 +1,82 @@
+import os  # Used (lock file handling)
+import json  # Used (lock file state)
+from contextlib import contextmanager  # Used (lock scopes)
+from typing import Iterator  # Used (type hints)
+
+try:
+    import fcntl  # Used (advisory locks)
+except ImportError:  # Windows: no advisory locking, the generation check still detects conflicts
+    fcntl = None
+
+
+class DatabaseLock:
+    """
+    Advisory lock shared by every process working on the same database, held in a
+    lock file next to it (links.json.lock).
+
+    Readers hold it shared and writers exclusively, so a process never reads a half
+    written journal or snapshot. The lock file also stores the generation of the
+    database, a counter every save increments, so that a process can tell whether the
+    database changed since it loaded it.
+
+    The lock is released by the operating system if its holder dies, and nested
+    acquisitions by the same object do not block (a shared lock is upgraded).
+    """
+
+    def __init__(self, db_path: str):
+        self.path = f"{db_path}.lock"
+        self._file = None
+        self._depth = 0
+        self._exclusive = False
+
+    @contextmanager
+    def shared(self) -> Iterator["DatabaseLock"]:
+        """Hold the lock for reading the database."""
+        with self._hold(False):
+            yield self
+
+    @contextmanager
+    def exclusive(self) -> Iterator["DatabaseLock"]:
+        """Hold the lock for writing the database."""
+        with self._hold(True):
+            yield self
+
+    @contextmanager
+    def _hold(self, exclusive: bool) -> Iterator[None]:
+        previous = self._exclusive
+        if self._depth == 0:
+            self._file = open(self.path, "a+", encoding="utf-8")
+        if fcntl is not None and (self._depth == 0 or (exclusive and not previous)):
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        self._exclusive = previous or exclusive
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            if self._depth == 0:
+                # Closing the file releases the lock
+                self._file.close()
+                self._file = None
+                self._exclusive = False
+            elif self._exclusive and not previous:
+                if fcntl is not None:
+                    fcntl.flock(self._file.fileno(), fcntl.LOCK_SH)
+                self._exclusive = False
+
+    def read_generation(self) -> int:
+        """Return the generation stored by the last save; the lock must be held."""
+        self._file.seek(0)
+        try:
+            return int(json.loads(self._file.read() or "{}").get("generation", 0))
+        except (ValueError, AttributeError, TypeError):
+            return 0
+
+    def write_generation(self, generation: int) -> None:
+        """Store the generation of a save; the lock must be held exclusively."""
+        # Rewritten in place: replacing the file would separate it from the lock
+        self._file.seek(0)
+        self._file.truncate()
+        self._file.write(json.dumps({"generation": generation}))
+        self._file.flush()
+        os.fsync(self._file.fileno())
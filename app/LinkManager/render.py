@@ -0,0 +1,135 @@
+import os  # Used (pager environment, NO_COLOR)
+import sys  # Used (standard streams)
+import shlex  # Used (pager command line)
+import subprocess  # Used (pager process)
+from contextlib import contextmanager  # Used (output scopes)
+from itertools import islice  # Used (offset/limit windows)
+from typing import Iterable, Iterator, Optional, Any, TextIO  # Used (type hints)
+from termcolor import colored  # Used (output formatting)
+from .linkcheck import LinkCheck  # Used (health check lines)
+
+DEFAULT_PAGE_SIZE = 500  # Entries formatted into each write
+DEFAULT_PAGER = "less"
+PAGER_OPTIONS = "FRX"  # less: quit if one screen, keep colors, leave output on screen
+
+
+def _isatty(stream: Any) -> bool:
+    try:
+        return stream.isatty()
+    except (AttributeError, ValueError):
+        return False
+
+
+def window(items: Iterable[Any], offset: int = 0, limit: Optional[int] = None) -> Iterator[Any]:
+    """Items from offset on, at most limit of them."""
+    offset = max(offset, 0)
+    return islice(items, offset, None if limit is None else offset + max(limit, 0))
+
+
+class Renderer:
+    """
+    Buffered, paginated output for listings.
+
+    Entries are formatted into pages of page_size and each page is written with a single
+    call, instead of several print and colored calls per entry. Colors are only used when
+    the output is a terminal (and NO_COLOR is not set). On an interactive terminal the output
+    is streamed through a pager ($PAGER, default less), which for less only takes over the
+    screen if the output does not fit on it. Output ends quietly when the reader goes away,
+    e.g. when the pager is closed or the output is piped into head.
+    """
+
+    def __init__(self, stream: TextIO = None, color: bool = None, pager: bool = None,
+                 page_size: int = DEFAULT_PAGE_SIZE):
+        self.stream = stream or sys.stdout
+        terminal = _isatty(self.stream)
+        self.color = terminal and "NO_COLOR" not in os.environ if color is None else color
+        self.pager = terminal and _isatty(sys.stdin) if pager is None else pager
+        self.page_size = page_size
+
+    def colored(self, text: str, color: str) -> str:
+        """text in color, if colors are used."""
+        return colored(text, color) if self.color else text
+
+    def render(self, header: str, entries: Iterable[Any], format_entry: Any, start: int = 0) -> int:
+        """
+        Write header and then format_entry(index, entry) for every entry, numbering them
+        from start, page by page. Returns the number of entries written.
+        """
+        written = 0
+        with self._output() as out:
+            try:
+                page = [header] if header else []
+                for written, entry in enumerate(entries, 1):
+                    page.append(format_entry(start + written - 1, entry))
+                    if len(page) >= self.page_size:
+                        out.write("".join(page))
+                        page = []
+                if page:
+                    out.write("".join(page))
+                out.flush()
+            except BrokenPipeError:
+                self._discard_output(out)
+        return written
+
+    @contextmanager
+    def _output(self) -> Iterator[TextIO]:
+        """The stream to write to: a pager's input, or the stream itself."""
+        if not self.pager:
+            yield self.stream
+            return
+        env = dict(os.environ)
+        env.setdefault("LESS", PAGER_OPTIONS)
+        try:
+            pager = subprocess.Popen(shlex.split(os.environ.get("PAGER") or DEFAULT_PAGER),
+                                     stdin=subprocess.PIPE, text=True, env=env)
+        except (OSError, ValueError):
+            yield self.stream  # No usable pager
+            return
+        try:
+            yield pager.stdin
+        finally:
+            try:
+                pager.stdin.close()
+            except BrokenPipeError:
+                pass
+            pager.wait()
+
+    def _discard_output(self, out: TextIO) -> None:
+        # The reader is gone; make the final flush at exit a no-op instead of another error
+        if out is sys.stdout:
+            devnull = os.open(os.devnull, os.O_WRONLY)
+            os.dup2(devnull, sys.stdout.fileno())
+            os.close(devnull)
+
+
+def link_url(link: Any) -> str:
+    """URL of a Link or a database record."""
+    return link["url"] if isinstance(link, dict) else link.url
+
+
+def link_entry(renderer: Renderer, index: int, link: Any, label: str = "URL: ",
+               timestamps: bool = False) -> str:
+    """
+    A link with its categories, tags and description (and timestamps, id and last health
+    check) as text.
+    link is a Link or a database record, so lazily loaded links need not be built.
+    """
+    if isinstance(link, dict):
+        url, description = link["url"], link.get("description") or ""
+        categories, tags = link.get("categories") or [], link.get("tags") or []
+    else:
+        url, description, categories, tags = link.url, link.description, link.categories, link.tags
+    text = (f"{renderer.colored(f'[{index}] {label}{url}', 'light_magenta')}\n"
+            f"Categories: {', '.join(categories)}\nTags: {', '.join(tags)}\n")
+    if description:
+        text += f"Description: {description}\n"
+    if timestamps:
+        if isinstance(link, dict):
+            created, updated, link_id = link.get("created_at", ""), link.get("last_updated", ""), link["id"]
+            check = LinkCheck.from_dict(link["check"]) if link.get("check") else None
+        else:
+            created, updated, link_id, check = link.created_at, link.last_updated, link.id, link.check
+        text += f"Created: {created.partition('T')[0]} | Last Updated: {updated.partition('T')[0]} | ID: {link_id}\n"
+        if check is not None:
+            text += f"Health: {check}\n"
+    return text + "\n" if timestamps or description else text
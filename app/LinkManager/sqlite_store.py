@@ -0,0 +1,756 @@
+import os  # Used (file operations, paths)
+import json  # Used (aggregated category/tag columns)
+import sqlite3  # Used (storage backend)
+from collections.abc import MutableSequence  # Used (lazy link view)
+from datetime import datetime  # Used (timestamps)
+from typing import List, Dict, Optional, Any, Iterable, Iterator, Tuple  # Used (type hints)
+
+from termcolor import colored  # Used (output formatting)
+
+from .link import Link, LinkManager, new_link_id  # Used (base classes, link ids)
+from .urlnorm import canonical_url  # Used (duplicate detection)
+from .index import SearchIndex, FIELDS, parse_query, query_words  # Used (ranked search)
+from .fuzzy import VocabularyIndex  # Used (typo-tolerant category/tag search)
+from .bulk import BulkChange, BulkSummary, clean_names  # Used (bulk updates, renames)
+from .linkcheck import LinkCheck  # Used (stored health checks)
+
+SQLITE_EXTENSIONS = (".db", ".sqlite", ".sqlite3")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS links (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL,
+    description TEXT NOT NULL DEFAULT '',
+    created_at TEXT NOT NULL,
+    last_updated TEXT NOT NULL,
+    canonical_url TEXT,
+    uid TEXT
+);
+CREATE TABLE IF NOT EXISTS categories (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS tags (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS link_categories (
+    link_id INTEGER NOT NULL REFERENCES links(id) ON DELETE CASCADE,
+    category_id INTEGER NOT NULL REFERENCES categories(id),
+    position INTEGER NOT NULL,
+    PRIMARY KEY (link_id, category_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS link_tags (
+    link_id INTEGER NOT NULL REFERENCES links(id) ON DELETE CASCADE,
+    tag_id INTEGER NOT NULL REFERENCES tags(id),
+    position INTEGER NOT NULL,
+    PRIMARY KEY (link_id, tag_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS link_checks (
+    link_id INTEGER PRIMARY KEY REFERENCES links(id) ON DELETE CASCADE,
+    status INTEGER NOT NULL,
+    latency REAL NOT NULL,
+    checked_at TEXT NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_link_categories_category ON link_categories(category_id);
+CREATE INDEX IF NOT EXISTS idx_link_tags_tag ON link_tags(tag_id);
+"""
+
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS links_fts USING fts5(
+    url, description, content='links', content_rowid='id', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS links_fts_insert AFTER INSERT ON links BEGIN
+    INSERT INTO links_fts(rowid, url, description) VALUES (new.id, new.url, new.description);
+END;
+CREATE TRIGGER IF NOT EXISTS links_fts_delete AFTER DELETE ON links BEGIN
+    INSERT INTO links_fts(links_fts, rowid, url, description) VALUES ('delete', old.id, old.url, old.description);
+END;
+CREATE TRIGGER IF NOT EXISTS links_fts_update AFTER UPDATE OF url, description ON links BEGIN
+    INSERT INTO links_fts(links_fts, rowid, url, description) VALUES ('delete', old.id, old.url, old.description);
+    INSERT INTO links_fts(rowid, url, description) VALUES (new.id, new.url, new.description);
+END;
+"""
+
+# Columns needed to build a Link, with categories and tags aggregated in position order
+# and the last health check as a JSON array (NULL if never checked)
+LINK_COLUMNS = """
+    l.id, l.url, l.description, l.created_at, l.last_updated,
+    (SELECT json_group_array(name) FROM (
+        SELECT c.name FROM link_categories lc JOIN categories c ON c.id = lc.category_id
+        WHERE lc.link_id = l.id ORDER BY lc.position)),
+    (SELECT json_group_array(name) FROM (
+        SELECT t.name FROM link_tags lt JOIN tags t ON t.id = lt.tag_id
+        WHERE lt.link_id = l.id ORDER BY lt.position)),
+    l.uid,
+    (SELECT json_array(status, latency, checked_at, etag, last_modified, error)
+        FROM link_checks WHERE link_id = l.id)
+"""
+
+CHECK_COLUMNS = ("status", "latency", "checked_at", "etag", "last_modified", "error")
+
+# Per-field SQL used for substring matching; the term is bound as "?"
+FIELD_TABLES = {
+    "categories": ("link_categories", "category_id", "categories"),
+    "tags": ("link_tags", "tag_id", "tags"),
+}
+
+
+def is_sqlite_path(db_path: str) -> bool:
+    """Whether a database path selects the SQLite backend."""
+    return os.path.splitext(db_path)[1].lower() in SQLITE_EXTENSIONS
+
+
+class SQLiteLinkView(MutableSequence):
+    """
+    List-like view of the links table, ordered by insertion.
+    Link objects are only built for the rows that are actually accessed.
+    """
+
+    def __init__(self, manager: "SQLiteLinkManager"):
+        self._manager = manager
+
+    def __len__(self) -> int:
+        return self._manager._conn.execute("SELECT COUNT(*) FROM links").fetchone()[0]
+
+    def _id_at(self, index: int) -> int:
+        if index < 0:
+            index += len(self)
+        row = None
+        if index >= 0:
+            row = self._manager._conn.execute(
+                "SELECT id FROM links ORDER BY id LIMIT 1 OFFSET ?", (index,)).fetchone()
+        if row is None:
+            raise IndexError("link index out of range")
+        return row[0]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return self._manager._fetch_one(self._id_at(index))
+
+    def __setitem__(self, index: int, link: Link) -> None:
+        link._rowid = self._id_at(index)
+        self._manager._write_link(link)
+
+    def __delitem__(self, index: int) -> None:
+        self._manager._conn.execute("DELETE FROM links WHERE id = ?", (self._id_at(index),))
+
+    def insert(self, index: int, link: Link) -> None:
+        """
+        Append link (index must be len(self), as in append). The position of a row is its
+        id, which the category, tag and full-text tables refer to, so inserting before
+        existing rows would renumber them all; LinkManager only ever appends.
+        """
+        if index < len(self):
+            raise ValueError("Links can only be appended to a SQLite database, not inserted before other links.")
+        self._manager._insert_link(link)
+
+    def __iter__(self) -> Iterator[Link]:
+        return self._manager._select("", ())
+
+    def get(self, link_id: str) -> Optional[Link]:
+        """Return the link with the given id, or None."""
+        return next(self._manager._select("WHERE l.uid = ?", (link_id,)), None)
+
+    def remove_id(self, link_id: str) -> Optional[Link]:
+        """Remove and return the link with the given id (None if there is none)."""
+        link = self.get(link_id)
+        if link is not None:
+            self._manager._conn.execute("DELETE FROM links WHERE id = ?", (link._rowid,))
+        return link
+
+    def raw(self) -> Iterator[Link]:
+        return iter(self)
+
+    def records(self) -> Iterator[Dict[str, Any]]:
+        return (link.to_dict() for link in self)
+
+    def copy(self) -> List[Link]:
+        return list(self)
+
+
+class SQLiteLinkManager(LinkManager):
+    """
+    LinkManager backed by a SQLite database with normalized link, category and tag tables.
+    Searches, listings and bulk operations run as SQL (with an FTS5 trigram index for URL and
+    description search when available) instead of walking every Link in Python.
+    """
+
+    def __init__(self, db_path: str, **kwargs: Any):
+        super().__init__(db_path, **kwargs)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._fts = False
+        self._connect()
+        self.links = SQLiteLinkView(self)
+
+    # The global lists are derived from the link tables; assignments by the base class are ignored
+    @property
+    def categories(self) -> List[str]:
+        if self._conn is None:
+            return []
+        return [row[0] for row in self._conn.execute(
+            "SELECT name FROM categories WHERE id IN (SELECT category_id FROM link_categories) ORDER BY name")]
+
+    @categories.setter
+    def categories(self, value: List[str]) -> None:
+        pass
+
+    @property
+    def tags(self) -> List[str]:
+        if self._conn is None:
+            return []
+        return [row[0] for row in self._conn.execute(
+            "SELECT name FROM tags WHERE id IN (SELECT tag_id FROM link_tags) ORDER BY name")]
+
+    @tags.setter
+    def tags(self, value: List[str]) -> None:
+        pass
+
+    def _connect(self) -> None:
+        """Open the database and create the schema if needed."""
+        self._conn = sqlite3.connect(self.db)
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.create_function("pylower", 1, lambda value: value.lower() if value else value,
+                                   deterministic=True)
+        self._conn.executescript(SCHEMA)
+        self._upgrade_schema()
+        try:
+            self._conn.executescript(FTS_SCHEMA)
+            self._fts = True
+        except sqlite3.OperationalError:
+            # SQLite built without FTS5 or the trigram tokenizer: fall back to instr()
+            self._fts = False
+
+    def _upgrade_schema(self) -> None:
+        """Add and fill the canonical URL and link id columns for databases created before they existed."""
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(links)")}
+        for column in ("canonical_url", "uid"):
+            if column not in columns:
+                self._conn.execute(f"ALTER TABLE links ADD COLUMN {column} TEXT")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_links_canonical ON links(canonical_url)")
+        self._conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_links_uid ON links(uid)")
+
+        missing = self._conn.execute("SELECT id, url FROM links WHERE canonical_url IS NULL").fetchall()
+        if missing:
+            self._conn.executemany("UPDATE links SET canonical_url = ? WHERE id = ?",
+                                   [(canonical_url(url), link_id) for link_id, url in missing])
+        missing = self._conn.execute("SELECT id FROM links WHERE uid IS NULL").fetchall()
+        if missing:
+            self._conn.executemany("UPDATE links SET uid = ? WHERE id = ?",
+                                   [(new_link_id(), link_id) for link_id, in missing])
+        self._conn.commit()
+
+    def close(self) -> None:
+        """Close the database connection without committing."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    # ---- row <-> Link ------------------------------------------------------------
+
+    @staticmethod
+    def _row_to_link(row: Tuple) -> Link:
+        link = Link(row[1], row[2], json.loads(row[5]), json.loads(row[6]))
+        link.created_at = row[3]
+        link.last_updated = row[4]
+        link._rowid = row[0]
+        link.id = row[7]
+        if row[8] is not None:
+            link.check = LinkCheck(*json.loads(row[8]))
+        return link
+
+    def _select(self, where: str, params: Tuple) -> Iterator[Link]:
+        """Stream the links matching a WHERE clause, in insertion order."""
+        cursor = self._conn.execute(
+            f"SELECT {LINK_COLUMNS} FROM links l {where} ORDER BY l.id", params)
+        for row in cursor:
+            yield self._row_to_link(row)
+
+    def _fetch_one(self, link_id: int) -> Link:
+        row = self._conn.execute(f"SELECT {LINK_COLUMNS} FROM links l WHERE l.id = ?", (link_id,)).fetchone()
+        if row is None:
+            raise IndexError("link not found")
+        return self._row_to_link(row)
+
+    def _name_ids(self, table: str, names: List[str]) -> Dict[str, int]:
+        """Return name -> id for category or tag names, creating missing rows."""
+        names = [name for name in dict.fromkeys(names) if name]
+        if not names:
+            return {}
+        self._conn.executemany(f"INSERT OR IGNORE INTO {table}(name) VALUES (?)", [(name,) for name in names])
+        ids = {}
+        for start in range(0, len(names), 500):
+            chunk = names[start:start + 500]
+            marks = ",".join("?" * len(chunk))
+            ids.update(self._conn.execute(f"SELECT name, id FROM {table} WHERE name IN ({marks})", chunk))
+        return ids
+
+    def _write_values(self, link_id: int, categories: List[str], tags: List[str]) -> None:
+        for field, values in (("categories", categories), ("tags", tags)):
+            link_table, id_column, table = FIELD_TABLES[field]
+            self._conn.execute(f"DELETE FROM {link_table} WHERE link_id = ?", (link_id,))
+            ids = self._name_ids(table, values)
+            self._conn.executemany(
+                f"INSERT OR IGNORE INTO {link_table}(link_id, {id_column}, position) VALUES (?, ?, ?)",
+                [(link_id, ids[value], position) for position, value in enumerate(values) if value in ids])
+
+    def _insert_link(self, link: Link) -> None:
+        cursor = self._conn.execute(
+            "INSERT INTO links(url, description, created_at, last_updated, canonical_url, uid) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (link.url, link.description, link.created_at, link.last_updated, canonical_url(link.url), link.id))
+        link._rowid = cursor.lastrowid
+        self._write_values(link._rowid, link.categories, link.tags)
+
+    def _write_link(self, link: Link) -> None:
+        self._conn.execute(
+            "UPDATE links SET url = ?, description = ?, created_at = ?, last_updated = ?, canonical_url = ? "
+            "WHERE id = ?",
+            (link.url, link.description, link.created_at, link.last_updated, canonical_url(link.url),
+             link._rowid))
+        self._write_values(link._rowid, link.categories, link.tags)
+
+    def _insert_many(self, links_data: List[Dict[str, Any]]) -> int:
+        """Insert serialized links in bulk, preserving their order."""
+        now = datetime.now().isoformat()
+        start = (self._conn.execute("SELECT COALESCE(MAX(id), 0) FROM links").fetchone()[0]) + 1
+        rows = []
+        for offset, data in enumerate(links_data):
+            link = Link(data["url"])  # Normalizes the URL like every other entry point
+            rows.append((start + offset, link.url, data.get("description", "") or "",
+                         data.get("created_at", now), data.get("last_updated", data.get("created_at", now)),
+                         canonical_url(link.url), data.get("id") or link.id))
+        self._conn.executemany(
+            "INSERT INTO links(id, url, description, created_at, last_updated, canonical_url, uid) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+        self._write_checks([(start + offset, LinkCheck.from_dict(data["check"]))
+                            for offset, data in enumerate(links_data) if data.get("check")])
+
+        for field in ("categories", "tags"):
+            link_table, id_column, table = FIELD_TABLES[field]
+            ids = self._name_ids(table, [value for data in links_data for value in data.get(field, [])])
+            self._conn.executemany(
+                f"INSERT OR IGNORE INTO {link_table}(link_id, {id_column}, position) VALUES (?, ?, ?)",
+                [(start + offset, ids[value], position)
+                 for offset, data in enumerate(links_data)
+                 for position, value in enumerate(data.get(field, [])) if value in ids])
+        return len(rows)
+
+    def _replace_all(self, links_data: List[Dict[str, Any]]) -> int:
+        """Replace the whole collection with serialized links."""
+        self._conn.execute("DELETE FROM links")
+        count = self._insert_many(links_data)
+        self._refresh_categories_and_tags()
+        return count
+
+    # ---- persistence ---------------------------------------------------------------
+
+    def load_from_db(self) -> None:
+        """Open the database; links are read on demand."""
+        self._index = None
+        if self._conn is None:
+            self._connect()
+        print(f"Loaded {len(self.links)} links from database.")
+
+    def save_to_db(self) -> None:
+        """Commit pending changes to the database."""
+        try:
+            self._conn.commit()
+            print(f"Database saved to {self.db}")
+        except Exception as e:
+            print(f"Error saving database: {e}")
+
+    @property
+    def has_unsaved_changes(self) -> bool:
+        """Whether there is an uncommitted transaction."""
+        return self._conn is not None and self._conn.in_transaction
+
+    def refresh(self) -> bool:
+        """Queries always read the committed state, so there is nothing to reload."""
+        return False
+
+    def restore_backup(self, backup_file: str = None) -> str:
+        """Restore from a backup file."""
+        if not backup_file:
+            backups = self.list_backups()
+            if not backups:
+                return "No backups available."
+            backup_file = backups[0]  # Most recent
+
+        if not os.path.exists(os.path.join(self.backup_dir, backup_file)):
+            return f"Backup file not found: {backup_file}"
+
+        try:
+            data = self.backups.load(backup_file)
+            # First create a backup of current state
+            self._create_backup()
+            self._replace_all(data.get("links", []))
+            self._conn.commit()
+            return f"Database restored from {backup_file}"
+        except Exception as e:
+            self._conn.rollback()
+            return f"Restore failed: {str(e)}"
+
+    # ---- change hooks ----------------------------------------------------------------
+
+    def _link_added(self, link: Link) -> None:
+        """Rows are written by the view when a link is appended."""
+
+    def _add_records(self, records: List[Dict[str, Any]]) -> Tuple[int, int]:
+        """Insert a batch of serialized links with a few multi-row statements, skipping known URLs."""
+        keys = [canonical_url(record["url"]) for record in records]
+        known = set()
+        unique_keys = list(set(keys))
+        for start in range(0, len(unique_keys), 500):
+            chunk = unique_keys[start:start + 500]
+            marks = ",".join("?" * len(chunk))
+            known.update(row[0] for row in self._conn.execute(
+                f"SELECT canonical_url FROM links WHERE canonical_url IN ({marks})", chunk))
+
+        fresh = []
+        for record, key in zip(records, keys):
+            if key not in known:
+                known.add(key)
+                fresh.append(record)
+        return self._insert_many(fresh), len(records) - len(fresh)
+
+    def _find_duplicate(self, url: str) -> Optional[Link]:
+        return next(self._select("WHERE l.canonical_url = ?", (canonical_url(url),)), None)
+
+    def dedupe_links(self) -> int:
+        groups: Dict[str, List[int]] = {}
+        for link_id, key in self._conn.execute(
+                "SELECT id, canonical_url FROM links WHERE canonical_url IN "
+                "(SELECT canonical_url FROM links GROUP BY canonical_url HAVING COUNT(*) > 1) ORDER BY id"):
+            groups.setdefault(key, []).append(link_id)
+
+        doomed = []
+        for keeper_id, *duplicate_ids in groups.values():
+            keeper = self._fetch_one(keeper_id)
+            changed = False
+            for duplicate_id in duplicate_ids:
+                changed = keeper.merge(self._fetch_one(duplicate_id)) or changed
+            if changed:
+                self._write_link(keeper)
+            doomed.extend(duplicate_ids)
+
+        self._conn.executemany("DELETE FROM links WHERE id = ?", [(link_id,) for link_id in doomed])
+        self._refresh_categories_and_tags()
+        return len(doomed)
+
+    def _link_changed(self, link: Link, old_state: tuple = None) -> None:
+        """Write a modified link back to its row."""
+        self._write_link(link)
+
+    def _links_changed(self, changes: List[Tuple[Link, tuple]], counts: Any = None) -> None:
+        """Write modified links back to their rows."""
+        for link, _ in changes:
+            self._write_link(link)
+        self._refresh_categories_and_tags()
+
+    def _write_checks(self, checks: List[Tuple[int, LinkCheck]]) -> None:
+        """Store health check results by row id."""
+        marks = ", ".join("?" * (len(CHECK_COLUMNS) + 1))
+        self._conn.executemany(
+            f"INSERT OR REPLACE INTO link_checks(link_id, {', '.join(CHECK_COLUMNS)}) VALUES ({marks})",
+            [(rowid, *(getattr(check, column) for column in CHECK_COLUMNS)) for rowid, check in checks])
+
+    def _link_checked(self, link: Link) -> None:
+        """Write a health check result to the link_checks table."""
+        self._write_checks([(link._rowid, link.check)])
+
+    def _check_targets(self, link_ids: Optional[Iterable[str]] = None) -> List[Tuple[str, ...]]:
+        if link_ids is not None:
+            return super()._check_targets(link_ids)
+        return self._conn.execute(
+            "SELECT l.uid, l.url, c.etag, c.last_modified FROM links l "
+            "LEFT JOIN link_checks c ON c.link_id = l.id ORDER BY l.id").fetchall()
+
+    def _enrich_targets(self, link_ids: Optional[Iterable[str]] = None) -> List[Tuple[str, str]]:
+        if link_ids is not None:
+            return super()._enrich_targets(link_ids)
+        return self._conn.execute("SELECT uid, url FROM links WHERE description = '' ORDER BY id").fetchall()
+
+    def broken_links(self) -> List[Link]:
+        return list(self._select(
+            "WHERE l.id IN (SELECT link_id FROM link_checks WHERE status = 0 OR status >= 400)", ()))
+
+    def _link_removed(self, link: Link) -> None:
+        """Drop categories and tags that are no longer used by any link."""
+        self._refresh_categories_and_tags()
+
+    def _refresh_categories_and_tags(self) -> None:
+        """Remove category and tag rows that are no longer referenced."""
+        self._conn.execute("DELETE FROM categories WHERE id NOT IN (SELECT category_id FROM link_categories)")
+        self._conn.execute("DELETE FROM tags WHERE id NOT IN (SELECT tag_id FROM link_tags)")
+
+    # ---- search ----------------------------------------------------------------------
+
+    def _term_condition(self, attribute: str, term: str, fuzzy: bool = True) -> Tuple[str, List[Any]]:
+        """
+        SQL condition (on alias l) matching links whose attribute contains term.
+        With fuzzy, a category or tag term that no name contains matches similar names
+        instead, which are recorded in typo_substitutions.
+        """
+        term = term.lower()
+        if attribute in ("url", "description"):
+            if not term:
+                return "1", []
+            if self._fts and len(term) >= 3:
+                quoted = '"' + term.replace('"', '""') + '"'
+                return ("l.id IN (SELECT rowid FROM links_fts WHERE links_fts MATCH ?)",
+                        [f"{attribute} : {quoted}"])
+            return f"instr(pylower(l.{attribute}), ?) > 0", [term]
+
+        if attribute in FIELD_TABLES:
+            link_table, id_column, table = FIELD_TABLES[attribute]
+            if not term:
+                return f"EXISTS (SELECT 1 FROM {link_table} x WHERE x.link_id = l.id)", []
+            # Resolve the term against the (small) vocabulary, then follow the indexed join table
+            condition, params = "instr(pylower(name), ?) > 0", [term]
+            if fuzzy and self._conn.execute(f"SELECT 1 FROM {table} WHERE {condition} LIMIT 1", params).fetchone() is None:
+                names = self._similar_names(attribute, term)
+                if names:
+                    self.typo_substitutions.append((attribute, term, names))
+                    condition, params = f"pylower(name) IN ({', '.join('?' * len(names))})", names
+            return (f"l.id IN (SELECT x.link_id FROM {link_table} x WHERE x.{id_column} IN "
+                    f"(SELECT id FROM {table} WHERE {condition}))", params)
+
+        return "0", []
+
+    def _similar_names(self, attribute: str, term: str) -> List[str]:
+        """Lowercased category/tag names in use within a few typos of term, closest first."""
+        link_table, id_column, table = FIELD_TABLES[attribute]
+        vocabulary = VocabularyIndex(name.lower() for (name,) in self._conn.execute(
+            f"SELECT name FROM {table} WHERE id IN (SELECT {id_column} FROM {link_table})"))
+        return [name for name, _ in vocabulary.similar(term)]
+
+    def _match_links(self, search_params: Dict[str, str], search_mode: str = "AND") -> List[Link]:
+        """Run the query as a single SQL statement."""
+        return list(self._iter_matches(search_params, search_mode))
+
+    def _iter_matches(self, search_params: Dict[str, str], search_mode: str = "AND") -> Iterator[Link]:
+        """Like _match_links, but streams the rows instead of collecting them."""
+        self.typo_substitutions = []
+        conditions, params = [], []
+        for attribute, key in search_params.items():
+            condition, values = self._term_condition(attribute, key)
+            conditions.append(f"({condition})")
+            params.extend(values)
+        joiner = " AND " if search_mode == "AND" else " OR "
+        return self._select(f"WHERE {joiner.join(conditions)}", tuple(params))
+
+    def _rank(self, query: str, k: int) -> List[Tuple[float, Link]]:
+        # Only the links containing a query word are read and ranked with a temporary index:
+        # document frequencies are exact, average field lengths are those of the candidates
+        conditions, params = [], []
+        for word in sorted(query_words(parse_query(query))):
+            for field in FIELDS:
+                condition, values = self._term_condition(field, word, fuzzy=False)
+                conditions.append(f"({condition})")
+                params.extend(values)
+        if not conditions:
+            return []
+        candidates = self._select(f"WHERE {' OR '.join(conditions)}", tuple(params))
+        return SearchIndex(candidates).rank(query, k, total=len(self.links))
+
+    def _advanced_match(self, url_list: List[str], desc_list: List[str],
+                        cat_list: List[str], tag_list: List[str]) -> List[Link]:
+        """OR the terms of each field and AND the fields, in SQL."""
+        return list(self._iter_advanced_matches(url_list, desc_list, cat_list, tag_list))
+
+    def _iter_advanced_matches(self, url_list: List[str], desc_list: List[str],
+                               cat_list: List[str], tag_list: List[str], fuzzy: bool = True) -> Iterator[Link]:
+        """Like _advanced_match, but streams the rows instead of collecting them."""
+        where, params = self._advanced_where(url_list, desc_list, cat_list, tag_list, fuzzy)
+        return self._select(where, params)
+
+    def _advanced_where(self, url_list: List[str], desc_list: List[str],
+                        cat_list: List[str], tag_list: List[str], fuzzy: bool = True) -> Tuple[str, Tuple]:
+        """
+        WHERE clause (on alias l, empty if all lists are empty) of an advanced search; without
+        fuzzy, category and tag terms only match names that contain them.
+        """
+        self.typo_substitutions = []
+        conditions, params = [], []
+        for attribute, terms in (("url", url_list), ("description", desc_list),
+                                 ("categories", cat_list), ("tags", tag_list)):
+            if not terms:
+                continue
+            alternatives = []
+            for term in terms:
+                condition, values = self._term_condition(attribute, term, fuzzy)
+                alternatives.append(f"({condition})")
+                params.extend(values)
+            conditions.append(f"({' OR '.join(alternatives)})")
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        return where, tuple(params)
+
+    # ---- listings ----------------------------------------------------------------------
+
+    def _links_window(self, offset: int = 0, limit: Optional[int] = None) -> Iterator[Link]:
+        """Links from position offset on, at most limit of them, read with a single query."""
+        cursor = self._conn.execute(f"SELECT {LINK_COLUMNS} FROM links l ORDER BY l.id LIMIT ? OFFSET ?",
+                                    (-1 if limit is None else max(limit, 0), max(offset, 0)))
+        return (self._row_to_link(row) for row in cursor)
+
+    def _usage(self, field: str) -> List[Tuple[str, int]]:
+        link_table, id_column, table = FIELD_TABLES[field]
+        return self._conn.execute(
+            f"SELECT v.name, COUNT(*) FROM {table} v JOIN {link_table} x ON x.{id_column} = v.id "
+            f"GROUP BY v.id ORDER BY v.name").fetchall()
+
+    def list_categories(self) -> None:
+        """List all categories with their usage counts."""
+        usage = self._usage("categories")
+        if not usage:
+            print(colored("No categories found.", "yellow"))
+            return
+
+        self._print_usage("Existing Categories:", usage)
+
+    def list_tags(self) -> None:
+        """List all tags with their usage counts."""
+        usage = self._usage("tags")
+        if not usage:
+            print(colored("No tags found.", "yellow"))
+            return
+
+        self._print_usage("Existing Tags:", usage)
+
+    # ---- bulk operations -----------------------------------------------------------------
+
+    def _target_ids(self, indices: Optional[List[int]], link_ids: Optional[List[str]] = None) -> str:
+        """SQL selecting the row ids of the links with the given link ids or positions (all links if None)."""
+        if link_ids is not None:
+            return "SELECT id FROM links WHERE uid IN (SELECT value FROM json_each(?))"
+        if indices is None:
+            return "SELECT id FROM links"
+        return ("SELECT id FROM (SELECT id, ROW_NUMBER() OVER (ORDER BY id) - 1 AS pos FROM links) "
+                "WHERE pos IN (SELECT value FROM json_each(?))")
+
+    def bulk_update(self, where: Dict[str, List[str]] = None, add_tags: Iterable[str] = (),
+                    remove_tags: Iterable[str] = (), add_categories: Iterable[str] = (),
+                    remove_categories: Iterable[str] = (), indices: Iterable[int] = None,
+                    link_ids: Iterable[str] = None) -> BulkSummary:
+        """Select the links and change their category and tag rows with one statement per name."""
+        summary = BulkSummary()
+        change = BulkChange(add_categories, remove_categories, add_tags, remove_tags)
+        if not change:
+            return summary.finish()
+
+        # Selectors that drive a change match exactly: a misspelled name selects nothing
+        condition, params = self._advanced_where(*((where or {}).get(field, []) for field in FIELDS), fuzzy=False)
+        selection = link_ids if link_ids is not None else indices
+        if selection is not None:
+            condition = f"{condition} AND" if condition else "WHERE"
+            condition += f" l.id IN ({self._target_ids(indices, link_ids)})"
+            params += (json.dumps(list(selection)),)
+        self._conn.execute("CREATE TEMP TABLE IF NOT EXISTS bulk_targets (id INTEGER PRIMARY KEY)")
+        self._conn.execute("CREATE TEMP TABLE IF NOT EXISTS bulk_changed (id INTEGER PRIMARY KEY)")
+        self._conn.execute("DELETE FROM bulk_targets")
+        self._conn.execute("DELETE FROM bulk_changed")
+        summary.matched = self._conn.execute(
+            f"INSERT INTO bulk_targets(id) SELECT l.id FROM links l {condition}", params).rowcount
+
+        for field, added, removed in (("categories", change.add_categories, change.remove_categories),
+                                      ("tags", change.add_tags, change.remove_tags)):
+            link_table, id_column, table = FIELD_TABLES[field]
+            for name in removed:
+                row = self._conn.execute(f"SELECT id FROM {table} WHERE name = ?", (name,)).fetchone()
+                if row is None:
+                    continue
+                selected = f"FROM {link_table} WHERE {id_column} = ? AND link_id IN (SELECT id FROM bulk_targets)"
+                self._conn.execute(f"INSERT OR IGNORE INTO bulk_changed(id) SELECT link_id {selected}", row)
+                count = self._conn.execute(f"DELETE {selected}", row).rowcount
+                if count:
+                    getattr(summary, f"{field}_removed")[name] = count
+            ids = self._name_ids(table, added)
+            for name in added:
+                missing = (f"FROM bulk_targets b WHERE NOT EXISTS "
+                           f"(SELECT 1 FROM {link_table} x WHERE x.link_id = b.id AND x.{id_column} = ?)")
+                self._conn.execute(f"INSERT OR IGNORE INTO bulk_changed(id) SELECT b.id {missing}", (ids[name],))
+                count = self._conn.execute(
+                    f"INSERT INTO {link_table}(link_id, {id_column}, position) "
+                    f"SELECT b.id, ?, (SELECT COALESCE(MAX(position) + 1, 0) FROM {link_table} "
+                    f"WHERE link_id = b.id) {missing}", (ids[name], ids[name])).rowcount
+                if count:
+                    getattr(summary, f"{field}_added")[name] = count
+
+        summary.changed = self._conn.execute(
+            "UPDATE links SET last_updated = ? WHERE id IN (SELECT id FROM bulk_changed)",
+            (datetime.now().isoformat(),)).rowcount
+        self._refresh_categories_and_tags()
+        return summary.finish()
+
+    def _merge_names(self, field: str, sources: Iterable[str], target: str) -> BulkSummary:
+        """Move the join rows of the source names to the target name, keeping the first position."""
+        summary = BulkSummary()
+        target = target.strip()
+        sources = [name for name in clean_names(sources) if name != target]
+        if not target or not sources:
+            return summary.finish()
+        link_table, id_column, table = FIELD_TABLES[field]
+        source_ids = dict(self._conn.execute(
+            f"SELECT id, name FROM {table} WHERE name IN (SELECT value FROM json_each(?))", (json.dumps(sources),)))
+        if not source_ids:
+            return summary.finish()
+        target_id = self._name_ids(table, [target])[target]
+        selected = json.dumps(list(source_ids))
+
+        self._conn.execute("CREATE TEMP TABLE IF NOT EXISTS bulk_changed (id INTEGER PRIMARY KEY)")
+        self._conn.execute("DELETE FROM bulk_changed")
+        summary.matched = summary.changed = self._conn.execute(
+            f"INSERT OR IGNORE INTO bulk_changed(id) SELECT link_id FROM {link_table} "
+            f"WHERE {id_column} IN (SELECT value FROM json_each(?))", (selected,)).rowcount
+        if not summary.changed:
+            return summary.finish()
+        removed = getattr(summary, f"{field}_removed")
+        for name_id, count in self._conn.execute(
+                f"SELECT {id_column}, COUNT(*) FROM {link_table} WHERE {id_column} IN (SELECT value FROM json_each(?)) "
+                f"GROUP BY {id_column}", (selected,)):
+            removed[source_ids[name_id]] = count
+        added = self._conn.execute(
+            f"SELECT COUNT(*) FROM bulk_changed b WHERE NOT EXISTS "
+            f"(SELECT 1 FROM {link_table} x WHERE x.link_id = b.id AND x.{id_column} = ?)", (target_id,)).fetchone()[0]
+        if added:
+            getattr(summary, f"{field}_added")[target] = added
+
+        self._conn.execute(
+            f"INSERT OR REPLACE INTO {link_table}(link_id, {id_column}, position) "
+            f"SELECT link_id, ?, MIN(position) FROM {link_table} "
+            f"WHERE link_id IN (SELECT id FROM bulk_changed) AND ({id_column} = ? OR "
+            f"{id_column} IN (SELECT value FROM json_each(?))) GROUP BY link_id", (target_id, target_id, selected))
+        self._conn.execute(f"DELETE FROM {link_table} WHERE {id_column} IN (SELECT value FROM json_each(?))",
+                           (selected,))
+        self._conn.execute("UPDATE links SET last_updated = ? WHERE id IN (SELECT id FROM bulk_changed)",
+                           (datetime.now().isoformat(),))
+        self._refresh_categories_and_tags()
+        return summary.finish()
+
+
+def migrate_json_to_sqlite(json_path: str, sqlite_path: str) -> str:
+    """One-shot migration of a links.json database (including its journal) into SQLite."""
+    if not os.path.exists(json_path):
+        return f"Error: File not found at {json_path}"
+
+    target = None
+    try:
+        data = LinkManager(json_path)._read_db_state()
+        target = SQLiteLinkManager(sqlite_path)
+        if len(target.links):
+            return f"Error: {sqlite_path} already contains links"
+        count = target._insert_many(data.get("links", []))
+        target._conn.commit()
+        return f"Migrated {count} links from {json_path} to {sqlite_path}"
+    except Exception as e:
+        return f"Migration failed: {e}"
+    finally:
+        # Closing checkpoints the write-ahead log into the database file
+        if target is not None:
+            target.close()
@@ -0,0 +1,106 @@
+import re  # Used (scheme detection)
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode  # Used (URL normalization)
+from typing import List, Dict, Optional, Iterable, Tuple  # Used (type hints)
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+# Query parameters that only track where a visitor came from
+TRACKING_PARAMS = frozenset({
+    "fbclid", "gclid", "dclid", "gbraid", "wbraid", "msclkid", "yclid", "igshid",
+    "mc_cid", "mc_eid", "_ga", "_gl", "_hsenc", "_hsmi", "ref_src", "spm",
+})
+TRACKING_PREFIXES = ("utm_",)
+
+_SCHEME_RE = re.compile(r"^[a-zA-Z][a-zA-Z0-9+.-]*://")
+
+
+def _is_tracking(name: str) -> bool:
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES)
+
+
+def canonical_url(url: str) -> str:
+    """
+    Return the canonical form of a URL, used to detect duplicates.
+
+    The scheme and host are lowercased, default ports, trailing slashes and tracking
+    query parameters are dropped and the remaining parameters are sorted. URLs without
+    a scheme get https://, like Link._validate_url.
+    """
+    url = url.strip()
+    if not _SCHEME_RE.match(url):
+        url = f"https://{url}"
+
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        # Malformed netloc (e.g. a non-numeric port): fall back to simple case folding
+        return url.rstrip("/").lower()
+
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").rstrip(".")
+    netloc = f"[{host}]" if ":" in host else host
+    if port is not None and port != DEFAULT_PORTS.get(scheme):
+        netloc = f"{netloc}:{port}"
+    if parts.username is not None:
+        userinfo = parts.netloc.rpartition("@")[0]
+        netloc = f"{userinfo}@{netloc}"
+
+    path = parts.path.rstrip("/")
+    query = urlencode(sorted(
+        (name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not _is_tracking(name)
+    ))
+    return urlunsplit((scheme, netloc, path, query, parts.fragment))
+
+
+class UrlIndex:
+    """
+    Hash index from canonical URL to the ids of the links using it, so that finding
+    the link a URL duplicates is O(1).
+    """
+
+    def __init__(self, entries: Iterable[Tuple[str, str]] = ()):
+        self._ids: Dict[str, List[str]] = {}
+        self._size = 0
+        for link_id, url in entries:
+            self.add(url, link_id)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, url: str) -> bool:
+        return canonical_url(url) in self._ids
+
+    def has_canonical(self, key: str) -> bool:
+        """Membership test for a URL that was already passed through canonical_url."""
+        return key in self._ids
+
+    def find(self, url: str) -> Optional[str]:
+        """Id of the first link added with the same canonical URL, or None."""
+        ids = self._ids.get(canonical_url(url))
+        return ids[0] if ids else None
+
+    def duplicates(self) -> List[List[str]]:
+        """Groups of link ids sharing a canonical URL, first added first."""
+        return [ids for ids in self._ids.values() if len(ids) > 1]
+
+    def add(self, url: str, link_id: str) -> None:
+        self._ids.setdefault(canonical_url(url), []).append(link_id)
+        self._size += 1
+
+    def discard(self, url: str, link_id: str) -> None:
+        key = canonical_url(url)
+        ids = self._ids.get(key)
+        if not ids or link_id not in ids:
+            return
+        ids.remove(link_id)
+        if not ids:
+            del self._ids[key]
+        self._size -= 1
+
+    def replace(self, old_url: str, new_url: str, link_id: str) -> None:
+        if old_url != new_url:
+            self.discard(old_url, link_id)
+            self.add(new_url, link_id)
@@ -0,0 +1,202 @@
+from typing import List, Dict, Set, Tuple, Iterable  # Used (type hints)
+
+
+class Vocabulary:
+    """
+    Interns category and tag strings as small integer ids.
+
+    Links store tuples of ids instead of lists of strings, so every distinct
+    name is kept in memory exactly once no matter how many links use it.
+    """
+
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self._names: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def intern(self, name: str) -> int:
+        """Return the id of name, assigning a new one if needed."""
+        name_id = self._ids.get(name)
+        if name_id is None:
+            name_id = len(self._names)
+            self._ids[name] = name_id
+            self._names.append(name)
+        return name_id
+
+    def intern_all(self, names: Iterable[str]) -> Tuple[int, ...]:
+        """Return the ids of several names, in order."""
+        return tuple(self.intern(name) for name in names)
+
+    def lookup(self, name: str) -> int:
+        """Return the id of an already interned name, or -1."""
+        return self._ids.get(name, -1)
+
+    def name(self, name_id: int) -> str:
+        return self._names[name_id]
+
+    def names(self, name_ids: Iterable[int]) -> List[str]:
+        """Return the names for several ids, in order."""
+        names = self._names
+        return [names[name_id] for name_id in name_ids]
+
+
+# Shared by every Link in the process
+VOCABULARY = Vocabulary()
+
+
+class Registry:
+    """
+    Reference-counted set of category or tag names.
+
+    Counts how many links use each name (by vocabulary id), so adding or removing
+    a link updates it in O(1) per name and a name disappears as soon as its last
+    user does. Iterating yields the names currently in use.
+
+    For code written against the plain lists it replaced, it also supports append,
+    extend, remove, index and indexing. Names appended while no link uses them are
+    listed until the registry is rebuilt (e.g. when the database is reloaded); names
+    in use cannot be removed, since they are derived from the links.
+    """
+
+    def __init__(self, vocabulary: Vocabulary = VOCABULARY):
+        self._vocabulary = vocabulary
+        self._counts: Dict[int, int] = {}
+        self._declared: Dict[int, None] = {}  # Appended names, in order, that may have no users
+
+    def __len__(self) -> int:
+        return len(self._counts) + sum(1 for name_id in self._declared if name_id not in self._counts)
+
+    def __bool__(self) -> bool:
+        return bool(self._counts or self._declared)
+
+    def __contains__(self, name: str) -> bool:
+        name_id = self._vocabulary.lookup(name)
+        return name_id in self._counts or name_id in self._declared
+
+    def __iter__(self):
+        return iter(self._vocabulary.names(self._ids()))
+
+    def __getitem__(self, index):
+        return list(self)[index]
+
+    def __repr__(self) -> str:
+        return f"Registry({list(self)!r})"
+
+    def _ids(self) -> List[int]:
+        return list(self._counts) + [name_id for name_id in self._declared if name_id not in self._counts]
+
+    def append(self, name: str) -> None:
+        """List name even if no link uses it yet."""
+        self._declared[self._vocabulary.intern(name)] = None
+
+    def extend(self, names: Iterable[str]) -> None:
+        for name in names:
+            self.append(name)
+
+    def remove(self, name: str) -> None:
+        """Remove an appended name that no link uses; raises ValueError otherwise, like list.remove."""
+        name_id = self._vocabulary.lookup(name)
+        if name_id in self._counts:
+            raise ValueError(f"{name!r} is used by {self._counts[name_id]} link(s)")
+        if name_id not in self._declared:
+            raise ValueError(f"{name!r} is not in the registry")
+        del self._declared[name_id]
+
+    def index(self, name: str) -> int:
+        try:
+            return self._ids().index(self._vocabulary.lookup(name))
+        except ValueError:
+            raise ValueError(f"{name!r} is not in the registry") from None
+
+    def add_ids(self, name_ids: Iterable[int]) -> None:
+        """Count one more user for each distinct id."""
+        counts = self._counts
+        for name_id in set(name_ids):
+            counts[name_id] = counts.get(name_id, 0) + 1
+
+    def add_counts(self, counts: Dict[int, int]) -> None:
+        """Merge per-id user counts, e.g. collected over a batch of links."""
+        own = self._counts
+        for name_id, count in counts.items():
+            own[name_id] = own.get(name_id, 0) + count
+
+    def discard_ids(self, name_ids: Iterable[int]) -> None:
+        """Count one user less for each distinct id."""
+        counts = self._counts
+        for name_id in set(name_ids):
+            remaining = counts.get(name_id, 0) - 1
+            if remaining > 0:
+                counts[name_id] = remaining
+            else:
+                counts.pop(name_id, None)
+
+    def discard_counts(self, counts: Dict[int, int]) -> None:
+        """Subtract per-id user counts, the inverse of add_counts."""
+        own = self._counts
+        for name_id, count in counts.items():
+            remaining = own.get(name_id, 0) - count
+            if remaining > 0:
+                own[name_id] = remaining
+            else:
+                own.pop(name_id, None)
+
+    def replace_ids(self, old_ids: Tuple[int, ...], new_ids: Tuple[int, ...]) -> None:
+        """Move one user from the old ids to the new ids."""
+        if old_ids == new_ids:
+            return
+        old_set, new_set = set(old_ids), set(new_ids)
+        self.add_ids(new_set - old_set)
+        self.discard_ids(old_set - new_set)
+
+    def count(self, name: str) -> int:
+        """Number of links using name."""
+        return self._counts.get(self._vocabulary.lookup(name), 0)
+
+    def items(self) -> List[Tuple[str, int]]:
+        """(name, usage count) pairs sorted by name, including appended names without users."""
+        names, counts = self._vocabulary, self._counts
+        return sorted((names.name(name_id), counts.get(name_id, 0)) for name_id in self._ids())
+
+
+class Postings:
+    """
+    Ids of the links using each category or tag name (by vocabulary id).
+
+    Lets renames and merges visit only the links that use a name instead of every link.
+    """
+
+    def __init__(self):
+        self._links: Dict[int, Set[str]] = {}
+
+    def add(self, link_id: str, name_ids: Iterable[int]) -> None:
+        """Record that a link uses the given ids."""
+        postings = self._links
+        for name_id in name_ids:
+            postings.setdefault(name_id, set()).add(link_id)
+
+    def discard(self, link_id: str, name_ids: Iterable[int]) -> None:
+        """Record that a link no longer uses the given ids."""
+        postings = self._links
+        for name_id in name_ids:
+            links = postings.get(name_id)
+            if links is not None:
+                links.discard(link_id)
+                if not links:
+                    del postings[name_id]
+
+    def replace(self, link_id: str, old_ids: Tuple[int, ...], new_ids: Tuple[int, ...]) -> None:
+        """Move a link from the old ids to the new ids."""
+        if old_ids == new_ids:
+            return
+        old_set, new_set = set(old_ids), set(new_ids)
+        self.discard(link_id, old_set - new_set)
+        self.add(link_id, new_set - old_set)
+
+    def links(self, name_ids: Iterable[int]) -> Set[str]:
+        """Ids of the links using any of the given ids (a new set)."""
+        result = set()
+        for name_id in name_ids:
+            result |= self._links.get(name_id, set())
+        return result
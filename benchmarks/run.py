@@ -0,0 +1,438 @@
+"""
+LinkManager benchmark suite.
+
+Generates synthetic link collections, times the LinkManager operations on them and
+writes the results as JSON, optionally comparing them with an earlier run:
+
+    python benchmarks/run.py --sizes 1000,100000 --output results.json
+    python benchmarks/run.py --sizes 1000,100000 --compare results.json
+"""
+import argparse  # Used for command-line argument parsing
+import contextlib  # Used (silencing the managers' output)
+import json  # Used (results file)
+import os  # Used (paths)
+import platform  # Used (environment metadata)
+import random  # Used (choosing benchmark targets)
+import shutil  # Used (fresh copies of the fixtures)
+import statistics  # Used (median)
+import subprocess  # Used (git revision)
+import sys  # Used (import path, exit code)
+import tempfile  # Used (default work directory)
+import time  # Used (timing)
+from collections import Counter  # Used (picking common tags/categories)
+from datetime import datetime  # Used (run timestamp)
+from typing import List, Dict, Any, Callable, Optional, Tuple  # Used (type hints)
+from unittest import mock  # Used (answering advanced_search's prompts)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "app"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from LinkManager import LinkManager, SQLiteLinkManager, migrate_json_to_sqlite  # noqa: E402
+from synthetic import CollectionGenerator  # noqa: E402
+from standin import StandInServer  # noqa: E402
+
+DEFAULT_SIZES = "1000,10000,100000"
+DEFAULT_THRESHOLD = 1.25
+BENCH_REMOVALS = 100
+FORMAT_VERSION = 1
+STANDIN_LATENCY = 0.005  # Seconds the stand-in server takes per response
+
+
+class Dataset:
+    """
+    Fixture files for one collection size, generated once per work directory, plus the
+    search terms and targets the cases use (drawn from the data so they hit real links).
+    """
+
+    def __init__(self, workdir: str, size: int, seed: int, backend: str):
+        self.size = size
+        self.backend = backend
+        self.dir = os.path.join(workdir, f"links-{size}-{seed}")
+        self.json_path = os.path.join(self.dir, "links.json")
+        self.csv_path = os.path.join(self.dir, "links.csv")
+        self.sqlite_path = os.path.join(self.dir, "links.db")
+        self.run_dir = os.path.join(self.dir, "run")
+        os.makedirs(self.run_dir, exist_ok=True)
+
+        generator = CollectionGenerator(size, seed)
+        if not os.path.exists(self.json_path):
+            generator.write_database(self.json_path)
+        if not os.path.exists(self.csv_path):
+            generator.write_csv(self.csv_path)
+        if backend == "sqlite" and not os.path.exists(self.sqlite_path):
+            with contextlib.redirect_stdout(open(os.devnull, "w")):
+                migrate_json_to_sqlite(self.json_path, self.sqlite_path)
+
+        tags: Counter = Counter()
+        categories: Counter = Counter()
+        words: Counter = Counter()
+        for link in generator.links():
+            tags.update(link["tags"])
+            categories.update(link["categories"])
+            words.update(link["description"].split())
+        self.common_tag = tags.most_common(1)[0][0]
+        self.rare_tag = tags.most_common()[-1][0]
+        self.common_category = categories.most_common(1)[0][0]
+        self.rare_category = categories.most_common()[-1][0]
+        self.common_word = words.most_common(1)[0][0]
+        self.domain = generator.domains[0].split("-")[0]
+
+        rng = random.Random(seed)
+        self.subset = sorted(rng.sample(range(size), max(1, size // 10)))
+        removals = min(BENCH_REMOVALS, size)
+        # Each position is valid after the removals before it
+        self.removals = [rng.randrange(size - offset) for offset in range(removals)]
+        self._shared: Optional[LinkManager] = None
+        self._opened: List[LinkManager] = []
+
+    @property
+    def db_path(self) -> str:
+        return self.sqlite_path if self.backend == "sqlite" else self.json_path
+
+    def fresh(self, lazy: bool = False, journaled: bool = False, name: str = "fresh") -> LinkManager:
+        """A manager on a private copy of the fixture, so mutating cases start from the same state."""
+        path = os.path.join(self.run_dir, name + os.path.splitext(self.db_path)[1])
+        for leftover in (path, f"{path}.journal", f"{path}-wal", f"{path}-shm"):
+            if os.path.exists(leftover):
+                os.remove(leftover)
+        shutil.rmtree(os.path.join(self.run_dir, "backups"), ignore_errors=True)
+        shutil.copyfile(self.db_path, path)
+        if self.backend == "sqlite":
+            manager = SQLiteLinkManager(path)
+        else:
+            manager = LinkManager(path, journaled=journaled, lazy=lazy)
+        manager.load_from_db()
+        self._opened.append(manager)
+        return manager
+
+    def shared(self) -> LinkManager:
+        """A loaded manager with its search index built, for read-only cases."""
+        if self._shared is None:
+            self._shared = self.fresh(name="shared")
+            self._shared._get_index()
+            self._opened.remove(self._shared)
+        return self._shared
+
+    def release(self) -> None:
+        """Drop the managers opened by fresh() since the last call."""
+        for manager in self._opened:
+            if isinstance(manager, SQLiteLinkManager):
+                manager.close()
+        self._opened = []
+
+    def close(self) -> None:
+        self.release()
+        if isinstance(self._shared, SQLiteLinkManager):
+            self._shared.close()
+        self._shared = None
+
+
+# name -> setup(dataset) returning the callable to time; setup runs before every repeat
+CASES: Dict[str, Callable[[Dataset], Callable[[], Any]]] = {}
+
+
+def case(name: str):
+    def register(setup):
+        CASES[name] = setup
+        return setup
+    return register
+
+
+@case("load_from_db")
+def _load(data: Dataset):
+    manager = data.fresh()
+    return manager.load_from_db
+
+
+@case("load_from_db_lazy")
+def _load_lazy(data: Dataset):
+    manager = data.fresh(lazy=True)
+    return manager.load_from_db
+
+
+@case("save_to_db")
+def _save(data: Dataset):
+    manager = data.fresh()
+    manager.add_link_tag(0, "bench")
+    return manager.save_to_db
+
+
+@case("save_to_db_journaled")
+def _save_journaled(data: Dataset):
+    manager = data.fresh(journaled=True)
+    manager.save_to_db()  # Fold the fixture into a synced snapshot first
+    manager.add_link_tag(0, "bench")
+    return manager.save_to_db
+
+
+@case("query_and")
+def _query_and(data: Dataset):
+    manager = data.shared()
+    manager.query_cache.clear()  # Time the search itself; see query_cached
+    params = {"description": data.common_word, "tags": data.common_tag}
+    return lambda: manager.query(interactive=False, search_params=params)
+
+
+@case("query_cached")
+def _query_cached(data: Dataset):
+    # The same query again, answered from the query cache
+    manager = data.shared()
+    params = {"description": data.common_word, "tags": data.common_tag}
+    manager.query(interactive=False, search_params=params)
+    return lambda: manager.query(interactive=False, search_params=params)
+
+
+@case("query_or")
+def _query_or(data: Dataset):
+    # query() only offers OR mode interactively, so call its matcher directly
+    manager = data.shared()
+    manager.query_cache.clear()
+    params = {"url": data.domain, "tags": data.rare_tag, "categories": data.rare_category}
+    return lambda: manager._match_links(params, "OR")
+
+
+@case("query_cold")
+def _query_cold(data: Dataset):
+    # First query after loading, including building the search index
+    manager = data.fresh()
+    params = {"tags": data.common_tag}
+    return lambda: manager.query(interactive=False, search_params=params)
+
+
+@case("advanced_search")
+def _advanced_search(data: Dataset):
+    manager = data.shared()
+    manager.query_cache.clear()
+    answers = [data.domain, "", f"{data.common_category},{data.rare_category}", f"{data.common_tag},{data.rare_tag}"]
+
+    def run():
+        with mock.patch("builtins.input", side_effect=answers):
+            return manager.advanced_search()
+    return run
+
+
+@case("bulk_import_from_csv")
+def _import(data: Dataset):
+    path = os.path.join(data.run_dir, "import.json")
+    if os.path.exists(path):
+        os.remove(path)
+    manager = LinkManager(path)
+    return lambda: manager.bulk_import_from_csv(data.csv_path, show_progress=False)
+
+
+@case("export_to_csv")
+def _export(data: Dataset):
+    manager = data.shared()
+    return lambda: manager.export_to_csv(os.path.join(data.run_dir, "export.csv"))
+
+
+@case("list_categories")
+def _list_categories(data: Dataset):
+    return data.shared().list_categories
+
+
+@case("remove_link")
+def _remove(data: Dataset):
+    manager = data.fresh()
+
+    def run():
+        for index in data.removals:
+            manager.remove_link(index)
+    return run
+
+
+@case("bulk_add_tag")
+def _bulk_add_tag(data: Dataset):
+    manager = data.fresh()
+    return lambda: manager.bulk_add_tag("bench")
+
+
+@case("bulk_add_category")
+def _bulk_add_category(data: Dataset):
+    manager = data.fresh()
+    return lambda: manager.bulk_add_category("bench", data.subset)
+
+
+@case("bulk_remove_tag")
+def _bulk_remove_tag(data: Dataset):
+    manager = data.fresh()
+    return lambda: manager.bulk_remove_tag(data.common_tag)
+
+
+@case("bulk_remove_category")
+def _bulk_remove_category(data: Dataset):
+    manager = data.fresh()
+    return lambda: manager.bulk_remove_category(data.common_category)
+
+
+@case("bulk_update")
+def _bulk_update(data: Dataset):
+    # Retag the links matching a search in one pass
+    manager = data.fresh()
+    where = {"categories": [data.common_category]}
+    return lambda: manager.bulk_update(where, add_tags=["bench"], remove_tags=[data.common_tag])
+
+
+_standin: Optional[StandInServer] = None
+
+
+def standin() -> StandInServer:
+    """The local server the network cases talk to, started on first use."""
+    global _standin
+    if _standin is None:
+        _standin = StandInServer(broken=0.05, latency=STANDIN_LATENCY).start()
+    return _standin
+
+
+@case("check_links")
+def _check_links(data: Dataset):
+    # Every link against the local stand-in server, without the per-host rate limit
+    manager = data.fresh(lazy=True)
+    address = standin().address
+    return lambda: manager.check_links(connect_to=address, rate=None)
+
+
+@case("enrich_descriptions")
+def _enrich_descriptions(data: Dataset):
+    # Links without a description, from the stand-in server with an empty page cache
+    manager = data.fresh(lazy=True)
+    address = standin().address
+    cache_path = os.path.join(data.run_dir, "page_cache.sqlite3")
+    if os.path.exists(cache_path):
+        os.remove(cache_path)
+    return lambda: manager.enrich_descriptions(cache_path=cache_path, show_progress=False,
+                                               connect_to=address, rate=None)
+
+
+def time_case(setup: Callable[[Dataset], Callable[[], Any]], data: Dataset, repeat: int) -> List[float]:
+    """Run setup + timed call repeat times, with all output discarded."""
+    samples = []
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for _ in range(repeat):
+            func = setup(data)
+            start = time.perf_counter()
+            func()
+            samples.append(time.perf_counter() - start)
+            data.release()
+    return samples
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(sizes: List[int], cases: List[str], repeat: int, seed: int, backend: str, workdir: str) -> Dict[str, Any]:
+    """Run the selected cases for every size and return the results document."""
+    results = []
+    for size in sizes:
+        print(f"Preparing {size} links...", file=sys.stderr)
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            data = Dataset(workdir, size, seed, backend)
+        for name in cases:
+            samples = time_case(CASES[name], data, repeat)
+            result = {
+                "case": name,
+                "size": size,
+                "samples": samples,
+                "min": min(samples),
+                "median": statistics.median(samples),
+            }
+            results.append(result)
+            print(f"  {name:<24} {size:>10} {result['median'] * 1000:>12.2f} ms", file=sys.stderr)
+        data.close()
+
+    return {
+        "format": FORMAT_VERSION,
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "revision": _git_revision(),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "backend": backend,
+            "seed": seed,
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[Tuple[str, int, float]]:
+    """Print median ratios against a baseline run; return the (case, size, ratio) regressions."""
+    for key in ("backend", "seed", "python"):
+        if baseline["meta"].get(key) != current["meta"].get(key):
+            print(f"Warning: {key} differs from the baseline "
+                  f"({baseline['meta'].get(key)} vs {current['meta'].get(key)})", file=sys.stderr)
+    previous = {(r["case"], r["size"]): r for r in baseline["results"]}
+    regressions = []
+    print(f"{'case':<24} {'size':>10} {'baseline ms':>12} {'current ms':>12} {'ratio':>7}")
+    for result in current["results"]:
+        old = previous.get((result["case"], result["size"]))
+        if old is None:
+            continue
+        ratio = result["median"] / old["median"] if old["median"] else float("inf")
+        marker = " REGRESSION" if ratio > threshold else ""
+        print(f"{result['case']:<24} {result['size']:>10} {old['median'] * 1000:>12.2f} "
+              f"{result['median'] * 1000:>12.2f} {ratio:>7.2f}{marker}")
+        if ratio > threshold:
+            regressions.append((result["case"], result["size"], ratio))
+    return regressions
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark LinkManager operations on synthetic collections.")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help=f"Comma-separated collection sizes (default: {DEFAULT_SIZES})")
+    parser.add_argument("--cases", help="Comma-separated cases to run (default: all)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per case (default: 3)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the synthetic collections (default: 0)")
+    parser.add_argument("--backend", choices=["json", "sqlite"], default="json", help="Storage backend (default: json)")
+    parser.add_argument("--workdir", help="Directory for generated fixtures, reused between runs (default: a temporary directory)")
+    parser.add_argument("--output", help="Write the results JSON to this file instead of stdout", metavar="FILENAME")
+    parser.add_argument("--compare", help="Compare with the results JSON of an earlier run", metavar="FILENAME")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Median ratio above which --compare reports a regression (default: {DEFAULT_THRESHOLD})")
+    parser.add_argument("--list", action="store_true", help="List the available cases and exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        print("\n".join(CASES))
+        return 0
+
+    cases = args.cases.split(",") if args.cases else list(CASES)
+    unknown = [name for name in cases if name not in CASES]
+    if unknown:
+        parser.error(f"unknown cases: {', '.join(unknown)}")
+    sizes = [int(size) for size in args.sizes.split(",")]
+
+    if args.workdir:
+        os.makedirs(args.workdir, exist_ok=True)
+        report = run_suite(sizes, cases, args.repeat, args.seed, args.backend, args.workdir)
+    else:
+        with tempfile.TemporaryDirectory(prefix="linkmanager-bench-") as workdir:
+            report = run_suite(sizes, cases, args.repeat, args.seed, args.backend, workdir)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) above {args.threshold:.2f}x", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,176 @@
+"""
+Local HTTP server standing in for the web when benchmarking or trying out the link checker,
+so no real site is contacted:
+
+    with StandInServer(broken=0.1, latency=0.02) as server:
+        manager.check_links(connect_to=server.address)
+
+Every request is answered, whatever its Host, by the path:
+
+    /status/<code>       that status
+    /delay/<ms>/...      the page for the rest of the path, after <ms> milliseconds
+    /redirect/<n>/...    a redirect to /redirect/<n-1>/..., and at 0 the page
+    /drop/...            the connection is closed without a response
+    anything else        an HTML page with a title and meta description, or a 404 for a
+                         deterministic share (broken) of host/path pairs
+
+Pages carry an ETag and Last-Modified and answer matching conditional requests with 304.
+Keep-alive is supported; the server counts connections, requests and 304 responses.
+"""
+import asyncio  # Used (server)
+import threading  # Used (running the server next to the caller)
+import zlib  # Used (deterministic ETags and broken pages)
+from collections import Counter  # Used (request statistics)
+from typing import Dict, Set, Tuple, Optional, Any  # Used (type hints)
+
+LAST_MODIFIED = "Wed, 01 Jan 2025 00:00:00 GMT"
+REASONS = {200: "OK", 301: "Moved Permanently", 302: "Found", 304: "Not Modified", 404: "Not Found",
+           405: "Method Not Allowed", 410: "Gone", 500: "Internal Server Error", 503: "Service Unavailable"}
+
+
+class StandInServer:
+    """
+    Threaded local HTTP/1.1 server (see the module docstring for its paths).
+
+    Args:
+        broken (float, optional): Share of plain pages answered with 404. Defaults to 0.
+        latency (float, optional): Seconds added before every response. Defaults to 0.
+        page_size (int, optional): Bytes of body after the <head> of a page. Defaults to 2048.
+        chunked (bool, optional): Send page bodies with chunked transfer encoding. Defaults to False.
+        head_allowed (bool, optional): Answer HEAD (else 405, like some real servers). Defaults to True.
+    """
+
+    def __init__(self, broken: float = 0.0, latency: float = 0.0, page_size: int = 2048,
+                 chunked: bool = False, head_allowed: bool = True):
+        self.broken = broken
+        self.latency = latency
+        self.page_size = page_size
+        self.chunked = chunked
+        self.head_allowed = head_allowed
+        self.address: Optional[Tuple[str, int]] = None
+        self.connections = 0
+        self.requests: Counter = Counter()  # Method -> count
+        self.not_modified = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server: Optional[asyncio.base_events.Server] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+        self._writers: Set[asyncio.StreamWriter] = set()
+
+    def __enter__(self) -> "StandInServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def start(self) -> "StandInServer":
+        self._thread = threading.Thread(target=self._serve, name="standin-server", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        return self
+
+    def stop(self) -> None:
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop = None
+
+    def url(self, path: str = "/", host: str = "example.com") -> str:
+        """URL of a path on a host; fetch it with connect_to=server.address."""
+        return f"http://{host}{path}"
+
+    def _serve(self) -> None:
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._server = self._loop.run_until_complete(asyncio.start_server(self._handle, "127.0.0.1", 0))
+        self.address = self._server.sockets[0].getsockname()[:2]
+        self._ready.set()
+        try:
+            self._loop.run_forever()
+        finally:
+            self._server.close()
+            # Closing the open connections ends their handlers; ones still sleeping are cancelled
+            for writer in self._writers:
+                writer.transport.abort()
+            handlers = asyncio.all_tasks(self._loop)
+            if handlers:
+                _, pending = self._loop.run_until_complete(asyncio.wait(handlers, timeout=1))
+                for task in pending:
+                    task.cancel()
+            self._loop.close()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        self._writers.add(writer)
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                headers: Dict[str, str] = {}
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                self.requests[method] += 1
+                if not await self._respond(writer, method, path, headers):
+                    break
+        except (ConnectionError, ValueError):
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+    async def _respond(self, writer: asyncio.StreamWriter, method: str, path: str, headers: Dict[str, str]) -> bool:
+        """Answer one request; returns False if the connection should be closed."""
+        parts = path.strip("/").split("/")
+        if parts[0] == "delay" and len(parts) > 1 and parts[1].isdigit():
+            await asyncio.sleep(int(parts[1]) / 1000)
+            path, parts = "/" + "/".join(parts[2:]), parts[2:] or [""]
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if parts[0] == "drop":
+            return False
+        if parts[0] == "status" and len(parts) > 1 and parts[1].isdigit():
+            return await self._send(writer, method, int(parts[1]))
+        if parts[0] == "redirect" and len(parts) > 1 and parts[1].isdigit():
+            remaining = int(parts[1]) - 1
+            rest = "/".join(parts[2:])
+            location = f"/redirect/{remaining}/{rest}" if remaining > 0 else f"/{rest}"
+            return await self._send(writer, method, 302, {"Location": location})
+        if method == "HEAD" and not self.head_allowed:
+            return await self._send(writer, method, 405)
+
+        host = headers.get("host", "")
+        key = zlib.crc32(f"{host}{path}".encode())
+        if key % 1000 < self.broken * 1000:
+            return await self._send(writer, method, 404)
+        etag = f'"{key:08x}"'
+        validators = {"ETag": etag, "Last-Modified": LAST_MODIFIED}
+        if headers.get("if-none-match") == etag or (
+                "if-none-match" not in headers and headers.get("if-modified-since") == LAST_MODIFIED):
+            self.not_modified += 1
+            return await self._send(writer, method, 304, validators)
+        name = path.strip("/").replace("/", " ").replace("-", " ") or host
+        head = (f"<!DOCTYPE html>\n<html>\n<head>\n<meta charset=\"utf-8\">\n<title>{name.title()}</title>\n"
+                f"<meta name=\"description\" content=\"About {name} on {host}.\">\n</head>\n<body>\n")
+        body = (head + "<p>" + "lorem ipsum " * (self.page_size // 12) + "</p>\n</body>\n</html>\n").encode()
+        return await self._send(writer, method, 200, {**validators, "Content-Type": "text/html; charset=utf-8"}, body)
+
+    async def _send(self, writer: asyncio.StreamWriter, method: str, status: int,
+                    headers: Optional[Dict[str, str]] = None, body: bytes = b"") -> bool:
+        lines = [f"HTTP/1.1 {status} {REASONS.get(status, 'Status')}"]
+        lines.extend(f"{name}: {value}" for name, value in (headers or {}).items())
+        if status == 304:
+            body = b""
+        elif self.chunked and body:
+            lines.append("Transfer-Encoding: chunked")
+            body = b"".join(b"%x\r\n%s\r\n" % (len(chunk), chunk)
+                            for chunk in (body[i:i + 1024] for i in range(0, len(body), 1024))) + b"0\r\n\r\n"
+        else:
+            lines.append(f"Content-Length: {len(body)}")
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+        if method != "HEAD":
+            writer.write(body)
+        await writer.drain()
+        return True
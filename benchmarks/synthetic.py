@@ -0,0 +1,114 @@
+import csv  # Used (CSV output)
+import json  # Used (database output)
+import random  # Used (seeded distributions)
+from bisect import bisect_left  # Used (sampling from cumulative weights)
+from datetime import datetime, timedelta  # Used (timestamps)
+from itertools import accumulate  # Used (cumulative weights)
+from typing import List, Dict, Any, Iterator, Set  # Used (type hints)
+
+SYLLABLES = ["ka", "lo", "mi", "ne", "ru", "sa", "to", "vi", "de", "po", "an", "el", "or", "qu", "zi", "ba",
+             "fe", "gu", "ho", "ja", "ly", "ce", "wo", "xe"]
+TLDS = ["com", "org", "net", "io", "dev", "de", "co.uk", "ch"]
+TRACKING = ["utm_source=newsletter", "utm_medium=social", "fbclid=abc123", "ref=home"]
+START = datetime(2020, 1, 1)
+SPAN_SECONDS = 5 * 365 * 24 * 3600
+
+
+class _Zipf:
+    """Draws items with probability proportional to 1 / rank^exponent."""
+
+    def __init__(self, items: List[str], rng: random.Random, exponent: float = 1.1):
+        self.items = items
+        self.cumulative = list(accumulate(1.0 / (rank + 1) ** exponent for rank in range(len(items))))
+        self.rng = rng
+
+    def draw(self) -> str:
+        return self.items[bisect_left(self.cumulative, self.rng.random() * self.cumulative[-1])]
+
+    def sample(self, k: int) -> List[str]:
+        """Up to k distinct items."""
+        return list(dict.fromkeys(self.draw() for _ in range(k)))
+
+
+def _words(rng: random.Random, count: int, min_syllables: int = 2, max_syllables: int = 4) -> List[str]:
+    # A dict rather than a set, so the order (and thus the Zipf ranks) does not depend on string hashing
+    words: Dict[str, None] = {}
+    while len(words) < count:
+        words["".join(rng.choice(SYLLABLES) for _ in range(rng.randint(min_syllables, max_syllables)))] = None
+    ranked = list(words)
+    rng.shuffle(ranked)
+    return ranked
+
+
+class CollectionGenerator:
+    """
+    Deterministic generator of realistic link collections.
+
+    Domains, description words, categories and tags follow Zipf distributions, so a few
+    values are very common and most are rare, like in real bookmark collections.
+
+    Args:
+        count (int): Number of links to generate.
+        seed (int, optional): Random seed; the same seed always yields the same links. Defaults to 0.
+    """
+
+    def __init__(self, count: int, seed: int = 0):
+        self.count = count
+        self.seed = seed
+        rng = random.Random(seed)
+        words = _words(rng, 5000)
+        self.domains = [f"{rng.choice(words)}-{rng.choice(words)}.{rng.choice(TLDS)}"
+                        for _ in range(max(10, min(count // 5, 200000)))]
+        self.categories = _words(rng, 40, 3, 4)
+        self.tags = _words(rng, max(20, min(count // 50, 2000)), 2, 3)
+        self.words = words
+
+    def links(self) -> Iterator[Dict[str, Any]]:
+        """Yield the links as database records."""
+        rng = random.Random(self.seed + 1)
+        domains = _Zipf(self.domains, rng)
+        words = _Zipf(self.words, rng)
+        categories = _Zipf(self.categories, rng, 0.9)
+        tags = _Zipf(self.tags, rng)
+
+        for _ in range(self.count):
+            scheme = "https" if rng.random() < 0.9 else "http"
+            path = "/".join(words.draw() for _ in range(rng.randint(0, 4)))
+            url = f"{scheme}://{domains.draw()}/{path}"
+            if rng.random() < 0.2:
+                url += "?" + rng.choice(TRACKING)
+            description = " ".join(words.draw() for _ in range(rng.randint(3, 12))) if rng.random() < 0.7 else ""
+            created = START + timedelta(seconds=rng.randrange(SPAN_SECONDS))
+            updated = created + timedelta(seconds=rng.randrange(30 * 24 * 3600)) if rng.random() < 0.3 else created
+            yield {
+                "id": f"{rng.getrandbits(64):016x}",
+                "url": url,
+                "description": description,
+                "categories": categories.sample(rng.choices((0, 1, 2), (2, 6, 2))[0]),
+                "tags": tags.sample(min(int(rng.expovariate(0.6)), 6)),
+                "created_at": created.isoformat(),
+                "last_updated": updated.isoformat(),
+            }
+
+    def write_database(self, path: str) -> None:
+        """Write the collection as a LinkManager JSON database, streaming one link at a time."""
+        categories: Set[str] = set()
+        tags: Set[str] = set()
+        with open(path, "w", encoding="utf-8") as f:
+            f.write('{"links": [')
+            for position, link in enumerate(self.links()):
+                f.write(",\n" if position else "\n")
+                f.write(json.dumps(link))
+                categories.update(link["categories"])
+                tags.update(link["tags"])
+            f.write(f'\n], "categories": {json.dumps(sorted(categories))}, '
+                    f'"tags": {json.dumps(sorted(tags))}, "journal_seq": 0}}')
+
+    def write_csv(self, path: str) -> None:
+        """Write the collection in the format read by bulk_import_from_csv."""
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["url", "description", "categories", "tags"])
+            for link in self.links():
+                writer.writerow([link["url"], link["description"], ",".join(link["categories"]),
+                                 ",".join(link["tags"])])
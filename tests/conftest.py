@@ -0,0 +1,28 @@
+import os  # Used (paths)
+import sys  # Used (import paths)
+import pytest  # Used (fixtures)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# The package lives in app/ (see setup.py); the stand-in HTTP server in benchmarks/
+sys.path[:0] = [os.path.join(ROOT, "app"), os.path.join(ROOT, "benchmarks")]
+
+from LinkManager import LinkManager  # noqa: E402
+
+
+@pytest.fixture
+def db_path(tmp_path) -> str:
+    """Path of a database that does not exist yet, in its own directory."""
+    return str(tmp_path / "links.json")
+
+
+def open_manager(path: str, **kwargs) -> LinkManager:
+    """A loaded LinkManager on path."""
+    manager = LinkManager(path, **kwargs)
+    manager.load_from_db()
+    return manager
+
+
+def add_links(manager: LinkManager, count: int, start: int = 0, **fields) -> None:
+    """Add count links https://site<i>.example/ without prompting."""
+    for i in range(start, start + count):
+        manager.add_link(interactive=False, url=f"https://site{i}.example/", **fields)
@@ -0,0 +1,101 @@
+import pytest  # Used (parametrized backends)
+from LinkManager import SQLiteLinkManager  # Used (SQLite backend)
+from conftest import open_manager  # Used (test helpers)
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def manager(request, tmp_path):
+    if request.param == "json":
+        manager = open_manager(str(tmp_path / "links.json"))
+    else:
+        manager = SQLiteLinkManager(str(tmp_path / "links.db"))
+        manager.load_from_db()
+    manager.add_link(interactive=False, url="https://docs.python.org/", categories=["Dev"], tags=["python"])
+    manager.add_link(interactive=False, url="https://pypi.org/", categories=["Dev"], tags=["python", "packages"])
+    manager.add_link(interactive=False, url="https://www.rust-lang.org/", categories=["Dev"], tags=["rust"])
+    yield manager
+    if request.param == "sqlite":
+        manager.close()
+
+
+def tags(manager) -> list:
+    return [link.tags for link in manager.links]
+
+
+def test_misspelled_selector_changes_nothing(manager):
+    before = tags(manager)
+    summary = manager.bulk_update({"tags": ["pyton"]}, remove_tags=["python"], add_tags=["archived"])
+    assert (summary.matched, summary.changed) == (0, 0)
+    assert tags(manager) == before
+    # Searches still resolve the typo
+    assert len(manager.query(interactive=False, search_params={"tags": "pyton"})) == 2
+
+
+def test_exact_selector_changes_the_matching_links(manager):
+    summary = manager.bulk_update({"tags": ["python"]}, remove_tags=["python"], add_tags=["archived"])
+    assert (summary.matched, summary.changed) == (2, 2)
+    assert tags(manager) == [["archived"], ["packages", "archived"], ["rust"]]
+
+
+def reopened(manager):
+    """The saved collection, loaded by a new manager of the same backend."""
+    manager.save_to_db()
+    other = type(manager)(manager.db)
+    other.load_from_db()
+    return other
+
+
+def check_saved(manager, expected_tags: list) -> None:
+    other = reopened(manager)
+    assert tags(other) == expected_tags
+    if isinstance(other, SQLiteLinkManager):
+        other.close()
+
+
+def test_rename_tag(manager):
+    summary = manager.rename_tag("python", "py")
+    assert (summary.matched, summary.changed) == (2, 2)
+    assert (summary.tags_removed, summary.tags_added) == ({"python": 2}, {"py": 2})
+    assert tags(manager) == [["py"], ["py", "packages"], ["rust"]]
+    assert "python" not in manager.tags and "py" in manager.tags
+    assert len(manager.query(interactive=False, search_params={"tags": "py"})) == 2
+    check_saved(manager, [["py"], ["py", "packages"], ["rust"]])
+
+
+def test_rename_to_an_existing_tag_merges_them(manager):
+    summary = manager.rename_tag("python", "packages")
+    assert summary.changed == 2
+    assert summary.tags_added == {"packages": 1}
+    # Deduplicated, in the position of the first of the two
+    assert tags(manager) == [["packages"], ["packages"], ["rust"]]
+    check_saved(manager, [["packages"], ["packages"], ["rust"]])
+
+
+def test_merge_tags(manager):
+    summary = manager.merge_tags(["python", "rust", "missing"], "code")
+    assert summary.changed == 3
+    assert (summary.tags_removed, summary.tags_added) == ({"python": 2, "rust": 1}, {"code": 3})
+    assert tags(manager) == [["code"], ["code", "packages"], ["code"]]
+    assert sorted(manager.tags) == ["code", "packages"]
+    check_saved(manager, [["code"], ["code", "packages"], ["code"]])
+
+
+def test_rename_and_merge_categories(manager):
+    manager.add_link(interactive=False, url="https://docs.rs/", categories=["Docs", "Dev"])
+    assert manager.rename_category("Dev", "Programming").changed == 4
+    summary = manager.merge_categories(["Docs"], "Programming")
+    assert summary.changed == 1 and summary.categories_added == {}
+    assert [link.categories for link in manager.links] == [["Programming"]] * 4
+    assert list(manager.categories) == ["Programming"]
+    other = reopened(manager)
+    assert [link.categories for link in other.links] == [["Programming"]] * 4
+    if isinstance(other, SQLiteLinkManager):
+        other.close()
+
+
+def test_rename_without_a_change(manager):
+    before = tags(manager)
+    for summary in (manager.rename_tag("missing", "other"), manager.rename_tag("python", " "),
+                    manager.merge_tags(["python"], "python")):
+        assert (summary.matched, summary.changed) == (0, 0)
+    assert tags(manager) == before
@@ -0,0 +1,68 @@
+from LinkManager import cache  # Used (batch limit)
+from conftest import open_manager, add_links  # Used (test helpers)
+
+QUERIES = [{"url": "python"}, {"tags": "docs"}, {"description": "guide", "categories": "dev"}, {"tags": "pyton"}]
+
+
+def urls(links) -> list:
+    return [link.url for link in links]
+
+
+def uncached(manager, params) -> list:
+    manager.query_cache.clear()
+    return urls(manager.query(interactive=False, search_params=params))
+
+
+def check(manager) -> None:
+    """Every cached result equals a fresh search."""
+    cached = [urls(manager.query(interactive=False, search_params=params)) for params in QUERIES]
+    assert cached == [uncached(manager, params) for params in QUERIES]
+    for params in QUERIES:  # Cache them again for the next mutation
+        manager.query(interactive=False, search_params=params)
+
+
+def test_cached_results_follow_mutations(db_path):
+    manager = open_manager(db_path)
+    python = manager.add_link(interactive=False, url="https://docs.python.org/", description="Python guide",
+                              categories=["Dev"], tags=["python", "docs"])
+    rust = manager.add_link(interactive=False, url="https://www.rust-lang.org/", tags=["rust"])
+    check(manager)
+    hits = manager.query_cache.hits
+
+    manager.add_link(interactive=False, url="https://python.org/", tags=["docs"])
+    check(manager)
+    assert manager.query_cache.hits > hits
+    manager.update_link_description_by_id(rust.id, "Rust guide")
+    manager.add_link_category_by_id(rust.id, "Dev")
+    check(manager)
+    manager.remove_link_tag_by_id(python.id, "docs")
+    manager.update_link_url_by_id(rust.id, "https://python-and-rust.example/")
+    check(manager)
+    manager.remove_link_by_id(python.id)
+    check(manager)
+    manager.bulk_update(add_tags=["docs"])
+    check(manager)
+
+
+def test_typo_results_are_dropped_when_their_field_changes(db_path):
+    manager = open_manager(db_path)
+    link = manager.add_link(interactive=False, url="https://docs.python.org/", tags=["python"])
+    assert urls(manager.query(interactive=False, search_params={"tags": "pyton"})) == ["https://docs.python.org/"]
+    invalidations = manager.query_cache.invalidations
+    manager.add_link_tag_by_id(link.id, "pytorch")
+    assert manager.query_cache.invalidations == invalidations + 1
+    # Unrelated fields keep the entry
+    manager.query(interactive=False, search_params={"tags": "pyton"})
+    manager.update_link_description_by_id(link.id, "Docs")
+    assert manager.query_cache.invalidations == invalidations + 1
+
+
+def test_large_batches_clear_the_cache(db_path, monkeypatch):
+    monkeypatch.setattr(cache, "MAX_INCREMENTAL_BATCH", 3)
+    manager = open_manager(db_path)
+    add_links(manager, 5, tags=["bulk"])
+    manager.query(interactive=False, search_params={"tags": "bulk"})
+    assert len(manager.query_cache) == 1
+    manager.bulk_update(add_tags=["more"])
+    assert len(manager.query_cache) == 0
+    assert len(manager.query(interactive=False, search_params={"tags": "more"})) == 5
@@ -0,0 +1,98 @@
+import multiprocessing  # Used (concurrent writer processes)
+import pytest  # Used (parametrized storage modes)
+from conftest import open_manager, add_links  # Used (test helpers)
+
+pytestmark = pytest.mark.parametrize("journaled", [False, True], ids=["snapshot", "journaled"])
+
+
+@pytest.fixture
+def shared(db_path, journaled):
+    """A database with one link, and two managers that loaded it."""
+    seed = open_manager(db_path, journaled=journaled)
+    seed.add_link(interactive=False, url="https://docs.python.org/", description="Python docs",
+                  categories=["Dev"], tags=["python", "docs"])
+    seed.save_to_db()
+    return open_manager(db_path, journaled=journaled), open_manager(db_path, journaled=journaled)
+
+
+def reload(manager):
+    return open_manager(manager.db, journaled=manager.journaled)
+
+
+def test_changes_to_different_fields_are_merged(shared):
+    first, second = shared
+    link_id = first.links[0].id
+    first.update_link_description_by_id(link_id, "The Python documentation")
+    first.add_link_tag_by_id(link_id, "reference")
+    second.remove_link_tag_by_id(link_id, "docs")
+    second.add_link_category_by_id(link_id, "Reading")
+    first.save_to_db()
+    second.save_to_db()
+
+    link = reload(first).get_link(link_id)
+    assert link.description == "The Python documentation"
+    assert link.tags == ["python", "reference"]
+    assert link.categories == ["Dev", "Reading"]
+
+
+def test_the_later_save_wins_a_conflicting_field(shared):
+    first, second = shared
+    link_id = first.links[0].id
+    first.update_link_description_by_id(link_id, "From the first")
+    second.update_link_description_by_id(link_id, "From the second")
+    first.save_to_db()
+    second.save_to_db()
+    assert reload(first).get_link(link_id).description == "From the second"
+
+
+def test_adds_from_both_sides_are_kept_and_same_urls_merged(shared):
+    first, second = shared
+    first.add_link(interactive=False, url="https://github.com/", tags=["git"])
+    first.add_link(interactive=False, url="https://pypi.org/")
+    second.add_link(interactive=False, url="https://GitHub.com", tags=["code"])
+    second.add_link(interactive=False, url="https://crates.io/")
+    first.save_to_db()
+    second.save_to_db()
+
+    links = reload(first).links
+    assert [link.url for link in links] == ["https://docs.python.org/", "https://github.com/",
+                                            "https://pypi.org/", "https://crates.io/"]
+    assert links[1].tags == ["git", "code"]
+
+
+def test_edited_link_survives_removal_elsewhere(shared):
+    first, second = shared
+    link_id = first.links[0].id
+    first.remove_link_by_id(link_id)
+    second.add_link_tag_by_id(link_id, "keep")
+    first.save_to_db()
+    second.save_to_db()
+    assert "keep" in reload(first).get_link(link_id).tags
+
+    # A removal after the other side's save wins
+    first.load_from_db()
+    first.remove_link_by_id(link_id)
+    first.save_to_db()
+    assert reload(first).get_link(link_id) is None
+
+
+def _writer(db_path: str, journaled: bool, start: int, count: int) -> None:
+    manager = open_manager(db_path, journaled=journaled)
+    for i in range(start, start + count):
+        add_links(manager, 1, start=i)
+        manager.save_to_db()
+
+
+def test_concurrent_processes_lose_no_writes(shared, journaled):
+    first, _ = shared
+    context = multiprocessing.get_context("fork")
+    writers = [context.Process(target=_writer, args=(first.db, journaled, n * 100, 10)) for n in range(4)]
+    for writer in writers:
+        writer.start()
+    for writer in writers:
+        writer.join(60)
+        assert writer.exitcode == 0
+
+    urls = {link.url for link in reload(first).links}
+    assert len(urls) == 41
+    assert {f"https://site{n * 100 + i}.example/" for n in range(4) for i in range(10)} < urls
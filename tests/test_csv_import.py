@@ -0,0 +1,30 @@
+from LinkManager.csv_import import parse_rows  # Used (row validation)
+from conftest import open_manager  # Used (test helpers)
+
+COLUMNS = {"description": 0, "url": 1, "tags": 2}
+
+
+def test_blank_and_short_rows_are_skipped():
+    rows = [[], ["only a description"], ["Docs", " https://docs.python.org/ ", "python, docs"],
+            ["No URL", ""], ["Rust", "https://www.rust-lang.org/"]]
+    records, errors = parse_rows(rows, COLUMNS)
+    assert errors == []
+    assert [(record["url"], record["description"], record["tags"]) for record in records] == [
+        ("https://docs.python.org/", "Docs", ["python", "docs"]),
+        ("https://www.rust-lang.org/", "Rust", []),
+    ]
+
+
+def test_import_file_with_blank_lines(db_path, tmp_path):
+    path = tmp_path / "links.csv"
+    path.write_text("url,description,tags\n"
+                    "https://docs.python.org/,Docs,\"python,docs\"\n"
+                    "\n"
+                    "\n"
+                    "https://www.rust-lang.org/\n"
+                    "https://DOCS.python.org,Duplicate,\n", encoding="utf-8")
+    manager = open_manager(db_path)
+    message = manager.bulk_import_from_csv(str(path), show_progress=False)
+    assert message.startswith("Import completed: 2 links added, 1 duplicates skipped, 0 errors")
+    assert [link.url for link in manager.links] == ["https://docs.python.org/", "https://www.rust-lang.org/"]
+    assert manager.links[0].tags == ["python", "docs"]
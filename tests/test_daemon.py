@@ -0,0 +1,141 @@
+import os  # Used (environment of the CLI processes)
+import sys  # Used (interpreter of the CLI processes)
+import time  # Used (waiting for the daemon)
+import socket  # Used (daemons that do not answer)
+import asyncio  # Used (running the daemon)
+import threading  # Used (clients next to the daemon)
+import subprocess  # Used (command line invocations)
+from concurrent.futures import ThreadPoolExecutor  # Used (concurrent clients)
+from LinkManager.daemon import LinkDaemon, DaemonClient, socket_path  # Used (daemon under test)
+from conftest import ROOT, open_manager  # Used (test helpers)
+
+
+def wait_for(path: str, timeout: float = 10) -> DaemonClient:
+    client = DaemonClient(path, timeout=timeout)
+    deadline = time.monotonic() + timeout
+    while client.request("ping") is None:
+        assert time.monotonic() < deadline, "daemon did not start"
+        time.sleep(0.01)
+    return client
+
+
+def serve_while(manager, drive, **options) -> tuple:
+    """Serve manager until drive(client), run in another thread, returns; returns (daemon, its result)."""
+    path = socket_path(manager.db)
+    daemon = LinkDaemon(manager, path, **options)
+    outcome = {}
+
+    def run() -> None:
+        try:
+            outcome["result"] = drive(wait_for(path))
+        except BaseException as e:
+            outcome["error"] = e
+        finally:
+            DaemonClient(path).request("shutdown")
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    asyncio.run(daemon.serve())
+    thread.join()
+    if "error" in outcome:
+        raise outcome["error"]
+    return daemon, outcome["result"]
+
+
+def test_concurrent_writes_share_commits(db_path):
+    manager = open_manager(db_path, journaled=True)
+
+    def drive(client):
+        with ThreadPoolExecutor(20) as pool:
+            responses = list(pool.map(
+                lambda i: DaemonClient(client.path).request("add", url=f"https://site{i}.example/", tags=["bulk"]),
+                range(40)))
+        # Every write was answered only once it was on disk
+        assert len(open_manager(db_path, journaled=True).links) == 40
+        return responses, client.request("stats")["result"]
+
+    _, (responses, stats) = serve_while(manager, drive, commit_delay=0.2)
+    assert all(response["ok"] and response["result"]["tags"] == ["bulk"] for response in responses)
+    assert stats["links"] == 40
+    assert 1 <= stats["commits"] < 40
+
+
+def test_requests(db_path):
+    manager = open_manager(db_path, journaled=True)
+
+    def drive(client):
+        added = client.request("add", url="https://docs.python.org/", tags=["python"])["result"]
+        edited = client.request("edit", id=added["id"], description="Docs", add_tags=["reference"])
+        found = client.request("query", params={"tags": "python"})
+        typo = client.request("query", params={"tags": "pyton"})
+        ranked = client.request("query", query="docs", rank=True, k=5)
+        missing = client.request("edit", id="nope")
+        unknown = client.request("frobnicate")
+        removed = client.request("remove", id=added["id"])
+        return added, edited, found, typo, ranked, missing, unknown, removed
+
+    _, (added, edited, found, typo, ranked, missing, unknown, removed) = serve_while(manager, drive)
+    assert added["url"] == "https://docs.python.org/"
+    assert edited["result"]["tags"] == ["python", "reference"] and edited["result"]["description"] == "Docs"
+    assert [link["id"] for link in found["result"]] == [added["id"]]
+    # Typo notices are returned for the client to print, not captured as output
+    assert [link["id"] for link in typo["result"]] == [added["id"]]
+    assert typo["substitutions"] == [["tags", "pyton", ["python"]]] and not typo["output"]
+    assert ranked["result"][0][1]["id"] == added["id"]
+    assert not missing["ok"] and "nope" in missing["error"]
+    assert not unknown["ok"]
+    assert removed["ok"] and removed["result"] is True
+    assert not open_manager(db_path, journaled=True).links
+
+
+def test_daemon_picks_up_saves_of_other_processes(db_path):
+    manager = open_manager(db_path, journaled=True)
+
+    def drive(client):
+        other = open_manager(db_path, journaled=True)
+        other.add_link(interactive=False, url="https://elsewhere.example/")
+        other.save_to_db()
+        return client.request("query", params={"url": "elsewhere"})["result"]
+
+    _, found = serve_while(manager, drive)
+    assert [link["url"] for link in found] == ["https://elsewhere.example/"]
+
+
+def test_command_line_goes_through_the_daemon(tmp_path):
+    env = {**os.environ, "HOME": str(tmp_path), "PYTHONPATH": os.path.join(ROOT, "app")}
+    env.pop("LINKMANAGER_DB", None)
+
+    def cli(*args: str) -> str:
+        return subprocess.run([sys.executable, "-m", "LinkManager.link_manager", *args], env=env,
+                              capture_output=True, text=True, timeout=60).stdout
+
+    daemon = subprocess.Popen([sys.executable, "-m", "LinkManager.link_manager", "--daemon"], env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_for(socket_path(str(tmp_path / "LinkManager" / "links.json")), timeout=30)
+        output = cli("--add", "https://example.org/")
+        assert output.strip() == "Link added successfully!"
+        assert cli("--stop-daemon").strip() == "Daemon stopped."
+        daemon.wait(30)
+    finally:
+        if daemon.poll() is None:
+            daemon.kill()
+    links = open_manager(str(tmp_path / "LinkManager" / "links.json"), journaled=True).links
+    assert [link.url for link in links] == ["https://example.org/"]
+
+
+def test_client_gives_up_on_daemons_that_do_not_answer(tmp_path):
+    path = str(tmp_path / "links.json.sock")
+    # A stale socket file that nothing listens on
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as stale:
+        stale.bind(path)
+    assert DaemonClient(path, timeout=1).request("ping") is None
+
+    # A hung daemon: the connection is accepted, but no answer ever comes
+    os.remove(path)
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as hung:
+        hung.bind(path)
+        hung.listen()
+        started = time.monotonic()
+        assert DaemonClient(path, timeout=0.2).request("ping") is None
+        assert time.monotonic() - started < 5
@@ -0,0 +1,100 @@
+import json  # Used (editing the database by hand)
+import pytest  # Used (parametrized queries)
+from LinkManager.diskindex import DiskIndex, database_fingerprint  # Used (inspecting the index file)
+from conftest import open_manager  # Used (test helpers)
+
+LINKS = [
+    ("https://docs.python.org/3/", "Python documentation", ["Dev"], ["python", "docs"]),
+    ("https://github.com/python/cpython", "CPython source code", ["Dev"], ["python", "git"]),
+    ("https://news.ycombinator.com/", "Hacker News", ["News"], ["tech"]),
+    ("https://www.rust-lang.org/", "Rust programming language", ["Dev"], ["rust"]),
+    ("https://example.com/bread", "Sourdough bread recipe", ["Cooking"], []),
+]
+
+QUERIES = [
+    {"url": "python"},
+    {"description": "source"},
+    {"tags": "python", "categories": "dev"},
+    {"tags": "py"},
+    {"url": "ycomb", "tags": "tech"},
+]
+
+
+def urls(links) -> list:
+    return [link.url for link in links]
+
+
+@pytest.fixture
+def manager(db_path):
+    manager = open_manager(db_path, journaled=True, persistent_index=True)
+    for url, description, categories, tags in LINKS:
+        manager.add_link(interactive=False, url=url, description=description, categories=categories, tags=tags)
+    manager.save_to_db()
+    return manager
+
+
+def manifest(manager) -> dict:
+    with DiskIndex.open(manager.index_file) as index:
+        return index.manifest
+
+
+def edit(manager) -> None:
+    python_docs, cpython, news, rust, bread = list(manager.links)
+    manager.update_link_description_by_id(cpython.id, "Reference interpreter")
+    manager.add_link_tag_by_id(rust.id, "python")
+    manager.remove_link_by_id(news.id)
+    manager.add_link(interactive=False, url="https://pypi.org/", description="Python packages", tags=["python"])
+    manager.save_to_db()
+
+
+@pytest.mark.parametrize("params", QUERIES)
+def test_index_answers_like_the_loaded_links(manager, params):
+    edit(manager)
+    expected = urls(manager.query(interactive=False, search_params=params))
+    assert urls(manager.query_index(params)) == expected
+    assert urls(manager.query_index(params, "OR")) == urls(manager._match_links(params, "OR"))
+
+
+def test_saves_append_to_the_index(manager):
+    before = manifest(manager)
+    manager.update_link_description_by_id(manager.links[1].id, "Reference interpreter")
+    manager.save_to_db()
+    after = manifest(manager)
+    assert after["appends"] == before["appends"] + 1
+    assert len(after["segments"]) == len(before["segments"]) + 1
+    assert after["live"] == len(manager.links)
+
+    # A fresh process answers from the index without loading the database
+    other = type(manager)(manager.db, journaled=True, persistent_index=True)
+    assert urls(other.query_index({"description": "interpreter"})) == ["https://github.com/python/cpython"]
+    assert not other.links
+
+
+def test_index_is_rewritten_once_most_documents_are_superseded(manager):
+    edit(manager)  # Supersedes 3 of 5 documents
+    assert manifest(manager)["appends"] == 0
+    assert len(manifest(manager)["segments"]) == 1
+
+
+def test_ranking_matches(manager):
+    edit(manager)
+    expected = [(round(score, 6), link.url) for score, link in manager.ranked_search(
+        interactive=False, query="python docs", k=3)]
+    assert [(round(score, 6), link.url) for score, link in manager.rank_index("python docs", 3)] == expected
+
+
+def test_stale_index_is_ignored_and_rebuilt(manager):
+    with open(manager.db, encoding="utf-8") as f:
+        data = json.load(f)
+    data["links"].append({"id": "handmade", "url": "https://handmade.example/", "description": "",
+                          "categories": [], "tags": ["python"]})
+    with open(manager.db, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+
+    other = type(manager)(manager.db, journaled=True, persistent_index=True)
+    assert other.query_index({"tags": "python"}) is None
+    other.load_from_db()
+    other.save_to_db()  # Nothing pending, but the index no longer matches and is rewritten
+    with DiskIndex.open(other.index_file, database_fingerprint(other.db)) as index:
+        assert index.manifest["appends"] == 0
+    assert "https://handmade.example/" in urls(other.query_index({"tags": "python"}))
@@ -0,0 +1,71 @@
+import pytest  # Used (fixtures)
+from standin import StandInServer  # Used (local stand-in for the web)
+from conftest import open_manager  # Used (test helpers)
+
+
+@pytest.fixture
+def server():
+    with StandInServer() as server:
+        yield server
+
+
+@pytest.fixture
+def enrich(tmp_path, server):
+    """enrich_descriptions against the stand-in server, with a page cache in tmp_path."""
+    def enrich(manager, **options):
+        return manager.enrich_descriptions(cache_path=str(tmp_path / "pages.db"), show_progress=False,
+                                           connect_to=server.address, rate=None, **options)
+    return enrich
+
+
+def test_descriptions_are_filled_in_and_kept(db_path, server, enrich):
+    manager = open_manager(db_path)
+    empty = manager.add_link(interactive=False, url=server.url("/python-docs"))
+    described = manager.add_link(interactive=False, url=server.url("/rust"), description="Mine")
+    summary = enrich(manager)
+    assert (summary.total, summary.fetched, summary.filled, summary.failed) == (1, 1, 1, 0)
+    assert empty.description == "Python Docs - About python docs on example.com."
+    assert described.description == "Mine"
+    assert server.requests["GET"] == 1
+
+    manager.save_to_db()
+    assert open_manager(db_path).get_link(empty.id).description == empty.description
+
+
+def test_failed_fetches_are_counted(db_path, server, enrich):
+    manager = open_manager(db_path)
+    for path in ("/page", "/status/404", "/status/500", "/drop/page"):
+        manager.add_link(interactive=False, url=server.url(path))
+    summary = enrich(manager)
+    assert (summary.fetched, summary.filled, summary.failed) == (4, 1, 3)
+    assert [link.description for link in manager.links].count("") == 3
+
+
+def test_rerun_after_an_interruption_uses_the_cache(db_path, server, enrich, monkeypatch):
+    manager = open_manager(db_path)
+    for i in range(10):
+        manager.add_link(interactive=False, url=server.url(f"/page{i}"))
+    manager.save_to_db()
+    fill = manager._fill_description
+    calls = []
+
+    def interrupt_after_four(link_id, description):
+        calls.append(link_id)
+        if len(calls) > 4:
+            raise KeyboardInterrupt
+        return fill(link_id, description)
+
+    monkeypatch.setattr(manager, "_fill_description", interrupt_after_four)
+    first = enrich(manager, concurrency=1, per_host=1, checkpoint=1)
+    assert first.interrupted and first.filled == 4
+    monkeypatch.undo()
+
+    # A new session (the interrupted one was not saved): the pages fetched before the
+    # interruption come from the cache
+    again = open_manager(db_path)
+    requests = server.requests["GET"]
+    second = enrich(again)
+    assert not second.interrupted
+    assert (second.cached, second.fetched, second.filled) == (4, 6, 10)
+    assert server.requests["GET"] - requests == 6
+    assert all(link.description for link in again.links)
@@ -0,0 +1,65 @@
+import json  # Used (reading JSON Lines exports)
+import pytest  # Used (parametrized formats, expected errors)
+from LinkManager import read_columnar  # Used (reading columnar exports)
+from LinkManager import export  # Used (chunk size)
+from conftest import open_manager  # Used (test helpers)
+
+LINKS = [
+    ("https://docs.python.org/3/", "Python docs, \"official\"", ["Dev"], ["python", "docs"]),
+    ("https://example.com/café", "Ünïcode\nand a newline", [], []),
+    ("https://www.rust-lang.org/", "", ["Dev", "Reading"], ["rust"]),
+]
+
+
+@pytest.fixture
+def manager(db_path):
+    manager = open_manager(db_path)
+    for url, description, categories, tags in LINKS:
+        manager.add_link(interactive=False, url=url, description=description, categories=categories, tags=tags)
+    return manager
+
+
+def records(manager) -> list:
+    return [link.to_dict() for link in manager.links]
+
+
+def test_jsonl_round_trip(manager, tmp_path):
+    path = str(tmp_path / "links.jsonl")
+    assert manager.export_links(path) == f"Exported 3 links to {path}"
+    with open(path, encoding="utf-8") as f:
+        assert [json.loads(line) for line in f] == records(manager)
+
+
+def test_columnar_round_trip(manager, tmp_path, monkeypatch):
+    monkeypatch.setattr(export, "CHUNK_ROWS", 2)  # Several row groups
+    path = str(tmp_path / "links.lmc")
+    manager.export_links(path)
+    assert list(read_columnar(path)) == [{field: record[field] for field in export.FIELDS}
+                                         for record in records(manager)]
+    assert list(read_columnar(path, ["url", "tags"])) == [{"url": r["url"], "tags": r["tags"]}
+                                                          for r in records(manager)]
+    with pytest.raises(ValueError):
+        list(read_columnar(path, ["nope"]))
+    manager.export_links(str(tmp_path / "links.jsonl"))
+    with pytest.raises(ValueError):
+        list(read_columnar(str(tmp_path / "links.jsonl")))  # Not a columnar export
+
+
+def test_csv_round_trip_through_import(manager, tmp_path):
+    path = str(tmp_path / "links.csv")
+    manager.export_links(path)
+    other = open_manager(str(tmp_path / "other.json"))
+    assert other.bulk_import_from_csv(path, show_progress=False).startswith("Import completed: 3 links added")
+    assert [(link.url, link.description, link.categories, link.tags) for link in other.links] == \
+           [(link.url, link.description, link.categories, link.tags) for link in manager.links]
+
+
+@pytest.mark.parametrize("export_format", ["csv", "jsonl", "columnar"])
+def test_filtered_export_and_explicit_format(manager, tmp_path, export_format):
+    path = str(tmp_path / "links.out")
+    message = manager.export_links(path, export_format, search_params={"tags": "python"})
+    assert message == f"Exported 1 links to {path}"
+    if export_format == "columnar":
+        assert [row["url"] for row in read_columnar(path)] == ["https://docs.python.org/3/"]
+    assert manager.export_links(path, advanced={"categories": ["dev"]}) == f"Exported 2 links to {path}"
+    assert manager.export_links(path, "xml").startswith("Export failed: Unknown export format 'xml'")
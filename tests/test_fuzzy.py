@@ -0,0 +1,83 @@
+import pytest  # Used (parametrized typos)
+from LinkManager.fuzzy import VocabularyIndex, edit_distance  # Used (typo matching)
+from LinkManager import SQLiteLinkManager  # Used (SQLite backend)
+from conftest import open_manager  # Used (test helpers)
+
+NAMES = ["dev", "news", "python", "javascript", "machine learning", "recipes", "docs"]
+
+
+@pytest.fixture
+def vocabulary() -> VocabularyIndex:
+    return VocabularyIndex(NAMES)
+
+
+@pytest.mark.parametrize("typo, name", [
+    ("dve", "dev"),
+    ("nwes", "news"),
+    ("dcos", "docs"),
+    ("pyhton", "python"),
+    ("recpies", "recipes"),
+])
+def test_transposed_letters_are_found(vocabulary, typo, name):
+    assert edit_distance(typo, name, 2) == 1
+    assert (name, 1) in vocabulary.similar(typo)
+
+
+@pytest.mark.parametrize("typo, name", [
+    ("pyton", "python"),       # Deletion
+    ("javascirpt", "javascript"),
+    ("lerning", "machine learning"),  # A word of a name
+    ("newz", "news"),          # Substitution
+])
+def test_other_typos_are_found(vocabulary, typo, name):
+    assert name in dict(vocabulary.similar(typo))
+
+
+def test_unrelated_and_short_terms_match_nothing(vocabulary):
+    assert vocabulary.similar("zebra") == []
+    assert vocabulary.similar("dx") == []  # No typos tolerated in 2 letters
+    assert vocabulary.containing("earn") == {"machine learning"}
+
+
+def test_typo_fallback_with_and_without_the_index_file(db_path):
+    manager = open_manager(db_path, journaled=True, persistent_index=True)
+    manager.add_link(interactive=False, url="https://docs.python.org/", categories=["Dev"], tags=["python"])
+    manager.add_link(interactive=False, url="https://www.rust-lang.org/", tags=["rust"])
+    manager.save_to_db()
+    manager.add_link(interactive=False, url="https://crates.io/", tags=["rust", "packages"])
+    manager.save_to_db()  # Appended to the index file
+
+    # A fresh process resolves typos against the names recorded in the index file
+    other = type(manager)(db_path, journaled=True, persistent_index=True)
+    for params in ({"tags": "pyton"}, {"tags": "packges"}, {"categories": "dve"},
+                   {"url": "python", "description": "python", "categories": "python", "tags": "python"}):
+        expected = [link.url for link in manager.query(interactive=False, search_params=params)]
+        assert [link.url for link in other.query_index(params)] == expected
+    assert [link.url for link in other.query_index({"tags": "pyton"})] == ["https://docs.python.org/"]
+    assert other.query_index({"url": "nothing-like-this"}) == []
+    assert not other.links
+
+
+@pytest.mark.parametrize("backend", ["json", "sqlite"])
+def test_typo_substitutions_are_returned_not_printed(tmp_path, capsys, backend):
+    if backend == "json":
+        manager = open_manager(str(tmp_path / "links.json"))
+    else:
+        manager = SQLiteLinkManager(str(tmp_path / "links.db"))
+        manager.load_from_db()
+    manager.add_link(interactive=False, url="https://docs.python.org/", tags=["python"])
+    capsys.readouterr()
+
+    for _ in range(2):  # The second search is answered from the query cache
+        results = manager.query(interactive=False, search_params={"tags": "pyton"})
+        assert [link.url for link in results] == ["https://docs.python.org/"]
+        assert manager.typo_substitutions == [("tags", "pyton", ["python"])]
+    manager.export_links(str(tmp_path / "out.json"), search_params={"tags": "pyton"})
+    assert "pyton" not in capsys.readouterr().out
+
+    manager.report_substitutions()
+    assert "No tags contain 'pyton', showing tags like: python" in capsys.readouterr().out
+    manager.query(interactive=False, search_params={"tags": "python"})
+    assert manager.typo_substitutions == []
+    if backend == "sqlite":
+        manager.close()
@@ -0,0 +1,86 @@
+import io  # Used (file objects as sources)
+from datetime import datetime  # Used (expected timestamps)
+from LinkManager.importh import ImportHandler, iter_bookmarks  # Used (bookmark import)
+from conftest import open_manager  # Used (test helpers)
+
+BOOKMARKS = """<!DOCTYPE NETSCAPE-Bookmark-file-1>
+<META HTTP-EQUIV="Content-Type" CONTENT="text/html; charset=UTF-8">
+<TITLE>Bookmarks</TITLE>
+<H1>Bookmarks</H1>
+<DL><p>
+    <DT><H3 ADD_DATE="1700000000">Bookmarks bar</H3>
+    <DL><p>
+        <DT><A HREF="https://docs.python.org/3/" ADD_DATE="1700000000" TAGS="python, docs">Python &amp; docs</A>
+        <DD>The official
+            documentation
+        <DT><H3>Dev</H3>
+        <DL><p>
+            <DT><A HREF="https://github.com/" ADD_DATE="1700000000123" LAST_MODIFIED="1700000500">GitHub</A>
+            <DT><A HREF="javascript:alert(1)">Bookmarklet</A>
+        </DL><p>
+        <DT><A HREF="https://news.ycombinator.com/">Hacker News</A>
+    </DL><p>
+    <DT><A HREF="place:sort=8">Recent</A>
+    <DT><A HREF="HTTP://Example.com/">Top level</A>
+</DL><p>
+"""
+
+
+def parse(chunk_size: int) -> list:
+    return list(iter_bookmarks(io.StringIO(BOOKMARKS), chunk_size=chunk_size))
+
+
+def test_parser_keeps_folders_tags_and_notes():
+    python, github, news, example = parse(1 << 16)
+    assert python["categories"] == ["Bookmarks bar"] and python["tags"] == ["python", "docs"]
+    assert python["description"] == "Python & docs - The official documentation"
+    assert python["created_at"] == python["last_updated"] == datetime.fromtimestamp(1700000000).isoformat()
+    assert github["categories"] == ["Bookmarks bar/Dev"]
+    assert github["created_at"] == datetime.fromtimestamp(1700000000).isoformat()  # Milliseconds
+    assert github["last_updated"] == datetime.fromtimestamp(1700000500).isoformat()
+    assert news["categories"] == ["Bookmarks bar"] and "created_at" not in news
+    assert example == {"url": "HTTP://Example.com/", "description": "Top level", "categories": [], "tags": []}
+
+
+def test_parsing_does_not_depend_on_chunk_boundaries():
+    expected = parse(1 << 16)
+    for chunk_size in (1, 7, 64):
+        assert parse(chunk_size) == expected
+
+
+def test_headless_import(db_path, tmp_path):
+    path = tmp_path / "bookmarks.html"
+    path.write_text(BOOKMARKS, encoding="utf-8")
+    manager = open_manager(db_path)
+    handler = ImportHandler()
+    sources = [str(path), io.BytesIO(BOOKMARKS.encode()), io.StringIO(BOOKMARKS), str(tmp_path / "missing.html")]
+    stats = handler.import_files(manager, sources, batch_size=2)
+    assert (stats.files, stats.errors, stats.rows, stats.added) == (3, 1, 12, 4)
+    assert stats.duplicates == 8 and stats.skipped == 6
+    assert [link.url for link in manager.links] == ["https://docs.python.org/3/", "https://github.com/",
+                                                    "https://news.ycombinator.com/", "HTTP://Example.com/"]
+    assert sources[1].read(0) == b""  # The caller's file is left open
+
+    # The old block view, without a file dialog
+    blocks = handler.f_import(str(path))
+    assert [(block["header"], [link["url"] for link in block["links"]]) for block in blocks] == [
+        ("Bookmarks bar", ["https://docs.python.org/3/"]),
+        ("Bookmarks bar/Dev", ["https://github.com/"]),
+        ("Bookmarks bar", ["https://news.ycombinator.com/"]),
+    ]
+
+
+def test_parallel_import_matches_sequential(tmp_path):
+    paths = []
+    for n in range(3):
+        path = tmp_path / f"bookmarks{n}.html"
+        path.write_text(BOOKMARKS.replace("github.com", f"github{n}.com"), encoding="utf-8")
+        paths.append(str(path))
+    results = []
+    for workers in (0, 2):
+        manager = open_manager(str(tmp_path / f"links{workers}.json"))
+        message = manager.import_bookmarks(paths, workers=workers, show_progress=False)
+        assert message.startswith("Import completed: 6 links added from 3 files, 6 duplicates skipped, "
+                                  "6 non-web bookmarks ignored, 0 files failed")
+        results.append([link.url for link in manager.links])
+    assert results[0] == results[1]
@@ -0,0 +1,137 @@
+import random  # Used (generated collections)
+from math import log  # Used (brute-force BM25)
+import pytest  # Used (parametrized queries)
+from LinkManager.index import (  # Used (index under test, ranking parameters)
+    SearchIndex, FIELDS, FIELD_WEIGHTS, BM25_K1, BM25_B, value_tokens
+)
+from conftest import open_manager  # Used (test helpers)
+
+WORDS = ["python", "rust", "docs", "news", "git", "recipes", "api", "blog", "data", "web"]
+CATEGORIES = ["Dev", "Reading", "Cooking", "Tools"]
+
+
+def contains(link, field: str, term: str) -> bool:
+    """Brute-force test of a single term, as query did before the index."""
+    term = term.lower()
+    if field in ("url", "description"):
+        return term in getattr(link, field).lower()
+    return any(term in value.lower() for value in getattr(link, field))
+
+
+@pytest.fixture
+def manager(db_path):
+    rng = random.Random(1)
+    manager = open_manager(db_path)
+    for i in range(150):
+        words = rng.sample(WORDS, 3)
+        manager.add_link(interactive=False, url=f"https://{words[0]}{i}.example/{words[1]}",
+                         description=f"{words[1].title()} and {words[2]}",
+                         categories=rng.sample(CATEGORIES, rng.randint(0, 2)),
+                         tags=rng.sample(WORDS, rng.randint(0, 3)))
+    manager._get_index()
+    # Mutations after the index was built have to keep it up to date
+    links = list(manager.links)
+    for link in links[::7]:
+        manager.remove_link_by_id(link.id)
+    for link in links[1::5]:
+        manager.add_link_tag_by_id(link.id, "Later")
+        manager.update_link_description_by_id(link.id, "Changed python description")
+    return manager
+
+
+@pytest.mark.parametrize("params", [
+    {"url": "python"},
+    {"url": "py"},
+    {"description": "DATA"},
+    {"url": "rust", "tags": "web"},
+    {"categories": "dev", "tags": "py"},
+    {"tags": "later", "description": "changed"},
+    {"url": "e", "categories": "o"},
+])
+def test_query_matches_a_full_scan(manager, params):
+    for mode, combine in (("AND", all), ("OR", any)):
+        expected = [link.url for link in manager.links
+                    if combine(contains(link, field, term) for field, term in params.items())]
+        assert expected
+        assert [link.url for link in manager._match_links(params, mode)] == expected
+
+
+@pytest.mark.parametrize("criteria", [
+    {"url": ["rust", "git"]},
+    {"categories": ["dev", "tools"], "tags": ["python", "later"]},
+    {"description": ["and news"], "url": ["blog"]},
+])
+def test_advanced_search_matches_a_full_scan(manager, criteria):
+    expected = [link.url for link in manager.links
+                if all(any(contains(link, field, term) for term in terms) for field, terms in criteria.items())]
+    assert expected
+    found = manager._advanced_match(*(criteria.get(field, []) for field in FIELDS))
+    assert [link.url for link in found] == expected
+
+
+def test_fresh_index_equals_maintained_index(manager):
+    fresh = SearchIndex(manager.links)
+    for field, term in (("url", "python"), ("description", "changed"), ("tags", "later"), ("categories", "dev")):
+        assert {link.id for link in fresh.resolve(fresh.search(field, term))} == \
+               {link.id for link in manager._get_index().resolve(manager._get_index().search(field, term))}
+
+
+def bm25(links, words, prefix: bool = False) -> dict:
+    """Brute-force BM25 scores by link id, for term (or prefix) clauses only."""
+    docs = [(link.id, [[token for tokens in value_tokens(v.lower() for v in values) for token in tokens]
+                       for values in ([link.url], [link.description], link.categories, link.tags)])
+            for link in links]
+    scores = {}
+    for field_idx, field in enumerate(FIELDS):
+        average = sum(len(fields[field_idx]) for _, fields in docs) / len(docs) or 1.0
+        for word in words:
+            terms = {t for _, fields in docs for t in fields[field_idx] if t == word or (prefix and t.startswith(word))}
+            for link_id, fields in docs:
+                tokens = fields[field_idx]
+                best = 0.0
+                for term in terms:
+                    tf = tokens.count(term)
+                    if not tf:
+                        continue
+                    df = sum(term in other[field_idx] for _, other in docs)
+                    idf = log(1 + (len(docs) - df + 0.5) / (df + 0.5))
+                    norm = BM25_K1 * (1 - BM25_B + BM25_B * len(tokens) / average)
+                    best = max(best, idf * tf * (BM25_K1 + 1) / (tf + norm))
+                if best:
+                    scores[link_id] = scores.get(link_id, 0.0) + FIELD_WEIGHTS[field] * best
+    return scores
+
+
+@pytest.mark.parametrize("query, words, prefix", [
+    ("python", ["python"], False),
+    ("rust docs", ["rust", "docs"], False),
+    ("re*", ["re"], True),
+])
+def test_ranking_matches_brute_force_bm25(manager, query, words, prefix):
+    expected = bm25(manager.links, words, prefix)
+    ranked = manager.ranked_search(interactive=False, query=query, k=len(manager.links))
+    assert {link.id: round(score, 9) for score, link in ranked} == \
+           {link_id: round(score, 9) for link_id, score in expected.items()}
+    assert [score for score, _ in ranked] == sorted((score for score, _ in ranked), reverse=True)
+
+
+def test_top_k_keeps_the_best_and_collection_order_between_ties(db_path):
+    manager = open_manager(db_path)
+    for i in range(5):
+        manager.add_link(interactive=False, url=f"https://site{i}.example/", tags=["same"])
+    manager.add_link(interactive=False, url="https://best.example/", description="same", tags=["same"])
+    ranked = manager.ranked_search(interactive=False, query="same", k=3)
+    assert [link.url for _, link in ranked] == ["https://best.example/", "https://site0.example/",
+                                                "https://site1.example/"]
+    assert manager.ranked_search(interactive=False, query="same", k=0) == []
+    assert manager.ranked_search(interactive=False, query="   ") == []
+
+
+def test_tags_outweigh_descriptions_and_phrases_need_adjacent_words(db_path):
+    manager = open_manager(db_path)
+    manager.add_link(interactive=False, url="https://a.example/", description="machine notes on learning")
+    manager.add_link(interactive=False, url="https://b.example/", description="notes", tags=["machine learning"])
+    ranked = manager.ranked_search(interactive=False, query="learning", k=2)
+    assert [link.url for _, link in ranked] == ["https://b.example/", "https://a.example/"]
+    phrase = manager.ranked_search(interactive=False, query='"machine learning"', k=5)
+    assert [link.url for _, link in phrase] == ["https://b.example/"]
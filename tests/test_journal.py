@@ -0,0 +1,85 @@
+import json  # Used (reading the snapshot)
+import os  # Used (file checks)
+from conftest import open_manager, add_links  # Used (test helpers)
+
+
+def snapshot_links(path: str) -> list:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["links"]
+
+
+def test_saves_append_to_journal_and_replay_on_load(db_path):
+    manager = open_manager(db_path, journaled=True)
+    add_links(manager, 3, tags=["python"])
+    manager.save_to_db()
+    first = manager.links[0]
+    manager.update_link_description_by_id(first.id, "Edited")
+    manager.remove_link_by_id(manager.links[1].id)
+    manager.save_to_db()
+
+    # The snapshot was written once, when the database was created
+    assert snapshot_links(db_path) == []
+    with open(f"{db_path}.journal", encoding="utf-8") as f:
+        ops = [json.loads(line)["op"] for line in f]
+    assert ops == ["add", "add", "add", "update", "remove"]
+
+    reloaded = open_manager(db_path, journaled=True)
+    assert [link.url for link in reloaded.links] == ["https://site0.example/", "https://site2.example/"]
+    assert reloaded.get_link(first.id).description == "Edited"
+    assert reloaded.links[1].tags == ["python"]
+
+
+def test_torn_journal_line_is_dropped(db_path):
+    manager = open_manager(db_path, journaled=True)
+    add_links(manager, 2)
+    manager.save_to_db()
+    with open(f"{db_path}.journal", "a", encoding="utf-8") as f:
+        f.write('{"seq": 3, "op": "add", "link": {"url": "https://tor')
+
+    reloaded = open_manager(db_path, journaled=True)
+    assert len(reloaded.links) == 2
+    add_links(reloaded, 1, start=5)
+    reloaded.save_to_db()
+    assert len(open_manager(db_path, journaled=True).links) == 3
+
+
+def test_compaction_folds_journal_into_snapshot(db_path):
+    manager = open_manager(db_path, journaled=True, compact_threshold=200)
+    add_links(manager, 5)
+    manager.save_to_db()  # Journal now past the threshold
+    assert os.path.getsize(f"{db_path}.journal") >= 200
+
+    add_links(manager, 1, start=5)
+    manager.save_to_db()  # Rewrites the snapshot instead of appending
+    assert not os.path.exists(f"{db_path}.journal") or os.path.getsize(f"{db_path}.journal") == 0
+    assert len(snapshot_links(db_path)) == 6
+
+    # Entries already in the snapshot are not replayed again
+    add_links(manager, 1, start=6)
+    manager.save_to_db()
+    reloaded = open_manager(db_path, journaled=True)
+    assert [link.url for link in reloaded.links] == [f"https://site{i}.example/" for i in range(7)]
+
+
+def test_journaled_saves_take_backups(db_path):
+    manager = open_manager(db_path, journaled=True, backup_interval=2)
+    for i in range(5):
+        add_links(manager, 1, start=i)
+        manager.save_to_db()
+    # The first save of the session, then every second append
+    assert len(manager.list_backups()) == 3
+
+    # The newest backup is the database before the save that followed it
+    manager.restore_backup()
+    assert [link.url for link in manager.links] == [f"https://site{i}.example/" for i in range(4)]
+
+
+def test_snapshot_backup_holds_the_previous_state(db_path):
+    manager = open_manager(db_path)
+    add_links(manager, 2)
+    manager.save_to_db()
+    add_links(manager, 1, start=2)
+    manager.save_to_db()
+
+    manager.restore_backup()
+    assert [link.url for link in manager.links] == ["https://site0.example/", "https://site1.example/"]
@@ -0,0 +1,81 @@
+import json  # Used (databases without ids)
+from LinkManager import Link  # Used (links under test)
+from LinkManager.link import LinkList  # Used (id-addressed list)
+from conftest import open_manager, add_links  # Used (test helpers)
+
+
+def make(count: int) -> LinkList:
+    return LinkList([Link(f"https://site{i}.example/") for i in range(count)])
+
+
+def urls(links) -> list:
+    return [link.url for link in links]
+
+
+def test_removal_by_id_leaves_tombstones_until_positional_access():
+    links = make(5)
+    ids = [link.id for link in links]
+    assert links.remove_id(ids[1]).url == "https://site1.example/"
+    assert links.remove_id(ids[1]) is None
+    assert len(links) == 4 and links._dead == 1
+    # Lookups and iteration skip the tombstone without compacting
+    assert links.get(ids[3]).url == "https://site3.example/"
+    assert urls(links) == [f"https://site{i}.example/" for i in (0, 2, 3, 4)]
+    assert links._dead == 1
+
+    assert links[1].url == "https://site2.example/"  # Positions see the list without holes
+    assert links._dead == 0
+    assert links.get(ids[4]) is links[3]
+
+
+def test_tombstones_are_compacted_once_they_fill_half_the_slots():
+    links = make(4)
+    ids = [link.id for link in links]
+    links.remove_id(ids[0])
+    links.remove_id(ids[2])
+    assert links._dead == 2
+    links.remove_id(ids[3])
+    assert links._dead == 0 and urls(links._items) == ["https://site1.example/"]
+    links.append(Link("https://new.example/"))
+    assert links.get(links[1].id).url == "https://new.example/"
+
+
+def test_lazy_records_are_materialized_on_access():
+    links = LinkList([{"id": "a", "url": "https://a.example/"}, {"id": "b", "url": "https://b.example/"}])
+    assert isinstance(next(links.raw()), dict)
+    assert links.get("b").url == "https://b.example/"
+    assert [type(item).__name__ for item in links.raw()] == ["dict", "Link"]
+    assert [record["id"] for record in links.records()] == ["a", "b"]
+
+
+def test_manager_addresses_links_by_id(db_path):
+    manager = open_manager(db_path)
+    add_links(manager, 4)
+    first, second, third, fourth = list(manager.links)
+    assert manager.remove_link_by_id(second.id)
+    assert not manager.remove_link_by_id(second.id)
+    assert manager.get_link(second.id) is None
+
+    # Ids stay valid when other links are removed, unlike positions
+    assert manager.add_link_tag_by_id(fourth.id, "kept")
+    assert manager.update_link_description_by_id(third.id, "Third")
+    assert manager.bulk_add_category_by_ids("Dev", [first.id, fourth.id, "missing"]) == 2
+    assert not manager.add_link_tag_by_id("missing", "x")
+    manager.save_to_db()
+
+    reloaded = open_manager(db_path)
+    assert [link.id for link in reloaded.links] == [first.id, third.id, fourth.id]
+    assert reloaded.get_link(fourth.id).tags == ["kept"]
+    assert reloaded.get_link(third.id).description == "Third"
+    assert reloaded.get_link(first.id).categories == ["Dev"]
+
+
+def test_databases_without_ids_get_them(db_path):
+    with open(db_path, "w", encoding="utf-8") as f:
+        json.dump({"links": [{"url": "https://a.example/"}, {"url": "https://b.example/"}],
+                   "categories": [], "tags": []}, f)
+    manager = open_manager(db_path)
+    ids = [link.id for link in manager.links]
+    assert all(ids) and len(set(ids)) == 2
+    manager.save_to_db()
+    assert [link.id for link in open_manager(db_path).links] == ids
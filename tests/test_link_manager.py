@@ -0,0 +1,22 @@
+import os  # Used (environment of the CLI processes)
+import sys  # Used (interpreter of the CLI processes)
+import subprocess  # Used (command line invocations)
+from conftest import ROOT, open_manager  # Used (test helpers)
+
+
+def test_add_reports_added_or_merged_once(tmp_path):
+    env = {**os.environ, "HOME": str(tmp_path), "PYTHONPATH": os.path.join(ROOT, "app")}
+    env.pop("LINKMANAGER_DB", None)
+
+    def add(url: str) -> str:
+        return subprocess.run([sys.executable, "-m", "LinkManager.link_manager", "--no-daemon", "--add", url],
+                              env=env, capture_output=True, text=True, timeout=60).stdout
+
+    added = add("https://example.org/")
+    assert added.count("Link added successfully") == 1
+    merged = add("HTTPS://Example.org")
+    assert "Link already exists: https://example.org/" in merged
+    assert "Link added" not in merged
+
+    links = open_manager(str(tmp_path / "LinkManager" / "links.json")).links
+    assert [link.url for link in links] == ["https://example.org/"]
@@ -0,0 +1,75 @@
+import time  # Used (letting a background check start)
+import pytest  # Used (fixtures)
+from standin import StandInServer  # Used (local stand-in for the web)
+from conftest import open_manager  # Used (test helpers)
+
+
+@pytest.fixture
+def server():
+    with StandInServer() as server:
+        yield server
+
+
+def add(manager, server, *paths: str) -> list:
+    return [manager.add_link(interactive=False, url=server.url(path)) for path in paths]
+
+
+def check(manager, server, **options):
+    return manager.check_links(connect_to=server.address, rate=None, **options)
+
+
+def test_second_run_sends_conditional_requests(db_path, server):
+    manager = open_manager(db_path)
+    add(manager, server, "/a", "/b", "/c")
+    first = check(manager, server)
+    assert (first.checked, first.ok, first.not_modified) == (3, 3, 0)
+    assert all(link.check.etag for link in manager.links)
+    manager.save_to_db()
+
+    # The validators are saved with the links, so a new session still sends them
+    again = open_manager(db_path)
+    second = check(again, server)
+    assert (second.ok, second.not_modified) == (3, 3)
+    assert server.not_modified == 3
+    assert [link.check.status for link in again.links] == [304, 304, 304]
+
+
+def test_hosts_that_refuse_head_are_checked_with_get(db_path):
+    manager = open_manager(db_path)
+    with StandInServer(head_allowed=False) as server:
+        add(manager, server, "/a", "/b", "/c")
+        summary = check(manager, server, concurrency=1, per_host=1)
+    assert summary.ok == 3
+    # Only the first link tries HEAD; the host's other links go straight to GET
+    assert server.requests == {"HEAD": 1, "GET": 3}
+
+
+def test_broken_and_unreachable_links(db_path, server):
+    manager = open_manager(db_path)
+    page, missing, dropped = add(manager, server, "/a", "/status/404", "/drop/a")
+    summary = check(manager, server)
+    assert (summary.ok, summary.broken, summary.unreachable) == (1, 1, 1)
+    assert missing.check.status == 404
+    assert dropped.check.status == 0 and dropped.check.error
+    assert [link.id for link in manager.broken_links()] == [missing.id, dropped.id]
+
+
+def test_redirects_are_followed(db_path, server):
+    manager = open_manager(db_path)
+    link, = add(manager, server, "/redirect/2/target")
+    summary = check(manager, server)
+    assert summary.ok == 1
+    assert link.check.status == 200 and link.check.etag
+    assert server.requests["HEAD"] == 3
+
+
+def test_background_check_can_be_cancelled(db_path, server):
+    manager = open_manager(db_path)
+    links = add(manager, server, *(f"/delay/50/page{i}" for i in range(40)))
+    background = manager.start_link_check(connect_to=server.address, rate=None, per_host=1)
+    time.sleep(0.2)
+    applied = background.cancel(10)
+    assert background.done and background.error is None
+    assert 0 < applied < len(links)
+    assert background.summary.checked == applied
+    assert sum(link.check is not None for link in links) == applied
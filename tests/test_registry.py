@@ -0,0 +1,39 @@
+import pytest  # Used (expected errors)
+from conftest import open_manager  # Used (test helpers)
+
+
+def test_registry_counts_names_in_use(db_path):
+    manager = open_manager(db_path)
+    first = manager.add_link(interactive=False, url="https://a.example/", categories=["Dev"], tags=["python"])
+    manager.add_link(interactive=False, url="https://b.example/", categories=["Dev"], tags=["rust"])
+    assert sorted(manager.categories) == ["Dev"]
+    assert manager.tags.count("python") == 1
+
+    manager.remove_link_by_id(first.id)
+    assert "python" not in manager.tags
+    assert manager.categories.items() == [("Dev", 1)]
+
+
+def test_registry_supports_list_style_code(db_path):
+    manager = open_manager(db_path)
+    manager.add_link(interactive=False, url="https://a.example/", categories=["Dev"])
+
+    # As with the old lists: "if name not in categories: categories.append(name)"
+    if "Reading" not in manager.categories:
+        manager.categories.append("Reading")
+    manager.categories.extend(["Dev", "Music"])
+    assert list(manager.categories) == ["Dev", "Reading", "Music"]
+    assert manager.categories[1] == "Reading"
+    assert manager.categories.index("Music") == 2
+    assert manager.categories.items() == [("Dev", 1), ("Music", 0), ("Reading", 0)]
+
+    manager.categories.remove("Music")
+    assert "Music" not in manager.categories
+    with pytest.raises(ValueError):
+        manager.categories.remove("Dev")  # Still used by a link
+    with pytest.raises(ValueError):
+        manager.categories.remove("Unknown")
+
+    manager.tags = ["later"]
+    assert list(manager.tags) == ["later"]
+    assert list(manager.categories) == ["Dev", "Reading"]
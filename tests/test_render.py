@@ -0,0 +1,79 @@
+import io  # Used (output streams)
+import os  # Used (environment)
+import sys  # Used (interpreter path)
+import subprocess  # Used (piped output)
+from LinkManager.render import Renderer, window  # Used (tested renderer)
+from conftest import ROOT  # Used (import path of the child process)
+
+
+class Terminal(io.StringIO):
+    """A stream that claims to be a terminal and records its writes."""
+
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def isatty(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        self.writes += 1
+        return super().write(text)
+
+
+class ClosedPipe(io.StringIO):
+    def write(self, text: str) -> int:
+        raise BrokenPipeError
+
+
+def entry(index: int, item: str) -> str:
+    return f"[{index}] {item}\n"
+
+
+def test_window():
+    assert list(window(range(10), 2, 3)) == [2, 3, 4]
+    assert list(window(range(10), 8)) == [8, 9]
+    assert list(window(range(10), -5, -1)) == []
+
+
+def test_pages_are_written_in_single_calls():
+    stream = Terminal()
+    written = Renderer(stream, pager=False, page_size=2).render("Links:\n", ["a", "b", "c", "d", "e"], entry, start=1)
+    assert written == 5
+    assert stream.writes == 3  # [header, a], [b, c], [d, e]
+    assert stream.getvalue() == "Links:\n[1] a\n[2] b\n[3] c\n[4] d\n[5] e\n"
+
+
+def test_colors_only_on_a_terminal(monkeypatch):
+    monkeypatch.delenv("NO_COLOR", raising=False)
+    piped = Renderer(io.StringIO())
+    assert not piped.color and not piped.pager
+    assert piped.colored("text", "red") == "text"
+    assert Renderer(Terminal(), pager=False).color
+    monkeypatch.setenv("NO_COLOR", "1")
+    assert not Renderer(Terminal(), pager=False).color
+
+
+def test_output_goes_through_the_pager(monkeypatch, capfd):
+    monkeypatch.setenv("PAGER", "cat")
+    assert Renderer(Terminal(), pager=True).render("", ["a", "b"], entry) == 2
+    assert capfd.readouterr().out == "[0] a\n[1] b\n"
+    # Without a usable pager the stream is written to directly
+    monkeypatch.setenv("PAGER", "no-such-pager-command")
+    stream = Terminal()
+    Renderer(stream, pager=True).render("", ["a"], entry)
+    assert stream.getvalue() == "[0] a\n"
+
+
+def test_closed_pipe_ends_output_quietly():
+    assert Renderer(ClosedPipe(), pager=False, page_size=1).render("", iter(["a", "b"]), entry) == 1
+    # A reader that exits early (like head) neither fails the command nor prints a traceback
+    script = ("from LinkManager.render import Renderer\n"
+              "Renderer().render('', range(10 ** 6), lambda index, item: f'{item}\\n')\n"
+              "print('done')\n")
+    process = subprocess.Popen([sys.executable, "-c", script], stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                               env={**os.environ, "PYTHONPATH": os.path.join(ROOT, "app")})
+    assert process.stdout.readline() == b"0\n"
+    process.stdout.close()
+    assert process.wait(timeout=60) == 0
+    assert process.stderr.read() == b""
@@ -0,0 +1,102 @@
+import os  # Used (paths)
+import pytest  # Used (parametrized backends)
+from LinkManager import Link, LinkManager, SQLiteLinkManager, migrate_json_to_sqlite  # Used (both backends)
+from conftest import open_manager  # Used (test helpers)
+
+LINKS = [
+    ("https://docs.python.org/3/", "Python docs", ["Dev"], ["python", "docs"]),
+    ("https://github.com/", "Code hosting", ["Dev", "Tools"], ["git"]),
+    ("https://news.ycombinator.com/", "Hacker News", ["News"], ["tech"]),
+    ("https://example.com/recipes", "", ["Cooking"], []),
+]
+
+
+def content(manager: LinkManager) -> list:
+    return [(link.url, link.description, link.categories, link.tags) for link in manager.links]
+
+
+def urls(links) -> list:
+    return sorted(link.url for link in links)
+
+
+def exercise(manager: LinkManager) -> LinkManager:
+    """The same edits on either backend."""
+    for url, description, categories, tags in LINKS:
+        manager.add_link(interactive=False, url=url, description=description, categories=categories, tags=tags)
+    # A duplicate URL merges into the existing link
+    manager.add_link(interactive=False, url="HTTPS://GitHub.com", tags=["code"])
+    python, _, news, recipes = list(manager.links)
+    manager.add_link_tag_by_id(python.id, "reference")
+    manager.remove_link_category_by_id(news.id, "News")
+    manager.update_link_description_by_id(recipes.id, "Recipes")
+    manager.remove_link_by_id(news.id)
+    manager.bulk_update({"categories": ["Dev"]}, add_tags=["work"])
+    manager.save_to_db()
+    return manager
+
+
+@pytest.fixture
+def managers(tmp_path):
+    os.makedirs(tmp_path / "json")
+    os.makedirs(tmp_path / "sqlite")
+    json_manager = open_manager(str(tmp_path / "json" / "links.json"))
+    sqlite_manager = SQLiteLinkManager(str(tmp_path / "sqlite" / "links.db"))
+    sqlite_manager.load_from_db()
+    yield exercise(json_manager), exercise(sqlite_manager)
+    sqlite_manager.close()
+
+
+def test_same_links_after_the_same_edits(managers):
+    json_manager, sqlite_manager = managers
+    assert content(sqlite_manager) == content(json_manager)
+    assert sorted(sqlite_manager.categories) == sorted(json_manager.categories)
+    assert sorted(sqlite_manager.tags) == sorted(json_manager.tags)
+
+
+@pytest.mark.parametrize("params", [
+    {"url": "github"},
+    {"description": "docs"},
+    {"tags": "python"},
+    {"categories": "dev", "tags": "work"},
+])
+def test_same_query_results(managers, params):
+    json_manager, sqlite_manager = managers
+    expected = urls(json_manager.query(interactive=False, search_params=params))
+    assert expected
+    assert urls(sqlite_manager.query(interactive=False, search_params=params)) == expected
+
+
+def test_or_query_and_advanced_search(managers):
+    params = {"url": "recipes", "tags": "git"}
+    for manager in managers:
+        assert urls(manager._match_links(params, "OR")) == ["https://example.com/recipes", "https://github.com/"]
+        assert urls(manager._advanced_match([], [], ["Dev"], ["git"])) == ["https://github.com/"]
+
+
+def test_reload_and_migration(managers, tmp_path):
+    json_manager, sqlite_manager = managers
+    reopened = SQLiteLinkManager(sqlite_manager.db)
+    reopened.load_from_db()
+    try:
+        assert content(reopened) == content(json_manager)
+    finally:
+        reopened.close()
+
+    migrated_path = str(tmp_path / "json" / "migrated.db")
+    migrate_json_to_sqlite(json_manager.db, migrated_path)
+    migrated = SQLiteLinkManager(migrated_path)
+    migrated.load_from_db()
+    try:
+        assert content(migrated) == content(json_manager)
+        assert [link.id for link in migrated.links] == [link.id for link in json_manager.links]
+    finally:
+        migrated.close()
+
+
+def test_links_can_only_be_appended(managers):
+    _, sqlite_manager = managers
+    before = [link.url for link in sqlite_manager.links]
+    with pytest.raises(ValueError):
+        sqlite_manager.links.insert(0, Link("https://first.example/"))
+    sqlite_manager.links.append(Link("https://last.example/"))
+    assert [link.url for link in sqlite_manager.links] == before + ["https://last.example/"]
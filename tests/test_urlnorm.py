@@ -0,0 +1,64 @@
+import json  # Used (writing a database with duplicates by hand)
+import pytest  # Used (parametrized URLs)
+from LinkManager.urlnorm import canonical_url, UrlIndex  # Used (normalization under test)
+from conftest import open_manager  # Used (test helpers)
+
+
+@pytest.mark.parametrize("url, expected", [
+    ("HTTPS://Example.COM/", "https://example.com"),
+    ("example.com/path/", "https://example.com/path"),
+    ("https://example.com:443/a", "https://example.com/a"),
+    ("http://example.com:8080/a", "http://example.com:8080/a"),
+    ("https://example.com/?b=2&utm_source=x&a=1&fbclid=y", "https://example.com?a=1&b=2"),
+    ("https://user@Example.com./a#Top", "https://user@example.com/a#Top"),
+    ("https://example.com/Path", "https://example.com/Path"),
+])
+def test_canonical_url(url, expected):
+    assert canonical_url(url) == expected
+
+
+def test_url_index():
+    index = UrlIndex([("a", "https://example.com/"), ("b", "https://EXAMPLE.com"), ("c", "https://other.example/")])
+    assert len(index) == 3
+    assert index.find("example.com/?utm_medium=mail") == "a"
+    assert index.duplicates() == [["a", "b"]]
+    index.replace("https://other.example/", "https://moved.example/", "c")
+    assert "https://other.example/" not in index and index.find("moved.example") == "c"
+    index.discard("https://example.com/", "a")
+    assert index.find("https://example.com") == "b" and index.duplicates() == []
+
+
+def test_duplicates_are_merged_on_add(db_path):
+    manager = open_manager(db_path)
+    first = manager.add_link(interactive=False, url="https://docs.python.org/3/", tags=["python"])
+    again = manager.add_link(interactive=False, url="HTTPS://docs.python.org:443/3?utm_source=feed",
+                             categories=["Dev"], tags=["docs"])
+    assert again is first
+    assert len(manager.links) == 1
+    assert first.tags == ["python", "docs"] and first.categories == ["Dev"]
+
+    # The index follows URL edits and removals
+    manager.update_link_url_by_id(first.id, "https://docs.python.org/3.12/")
+    assert manager.add_link(interactive=False, url="https://docs.python.org/3/") is not first
+    manager.remove_link_by_id(first.id)
+    assert manager._find_duplicate("https://docs.python.org/3.12") is None
+
+
+def test_dedupe_merges_existing_duplicates(db_path):
+    records = [
+        {"id": "a", "url": "https://example.com/", "description": "First", "categories": [], "tags": ["one"]},
+        {"id": "b", "url": "https://other.example/", "description": "", "categories": [], "tags": []},
+        {"id": "c", "url": "http://EXAMPLE.com:80", "description": "", "categories": ["Dev"], "tags": ["two"]},
+    ]
+    with open(db_path, "w", encoding="utf-8") as f:
+        json.dump({"links": records, "categories": ["Dev"], "tags": ["one", "two"]}, f)
+    manager = open_manager(db_path)
+    assert manager.dedupe_links() == 0  # Different schemes are different URLs
+
+    records[2]["url"] = "https://EXAMPLE.com:443/?utm_campaign=x"
+    with open(db_path, "w", encoding="utf-8") as f:
+        json.dump({"links": records, "categories": ["Dev"], "tags": ["one", "two"]}, f)
+    manager = open_manager(db_path)
+    assert manager.dedupe_links() == 1
+    assert [link.id for link in manager.links] == ["a", "b"]
+    assert manager.get_link("a").tags == ["one", "two"] and manager.get_link("a").categories == ["Dev"]